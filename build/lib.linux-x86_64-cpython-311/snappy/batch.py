@@ -0,0 +1,509 @@
+"""
+Computing invariants of many manifolds with a pool of worker processes.
+
+Manifolds are not sent to the workers as pickled Manifolds.  Rows of a
+ManifoldTable are sent as they are stored in the database and are
+turned into Manifolds by the table in the worker, and any other
+manifolds are sent as decorated isomorphism signatures.
+"""
+import cmath
+import collections
+import math
+import multiprocessing
+import pickle
+
+from . import database
+from .sage_helper import _within_sage, SageNotAvailable
+
+BatchRecord = collections.namedtuple('BatchRecord',
+                                     ['index', 'name', 'values'])
+BatchRecord.__doc__ = """
+The result of computing invariants of one manifold.  The index is the
+position of the manifold in the input and values is a dictionary
+whose keys are the requested invariants.  If computing an invariant
+raised an exception, the value is the exception.
+"""
+
+
+def _sources(manifolds):
+    """
+    Yields pairs (index, source) where source is a picklable description
+    of the manifold from which _manifold rebuilds it in a worker.
+    For ManifoldTables registered in snappy.database, the raw rows are
+    used so that the parent process never builds a Manifold.
+    """
+    if isinstance(manifolds, database.ManifoldTable):
+        table_name = manifolds.__class__.__name__
+        if table_name in database.__all_tables__:
+            for index, row in enumerate(manifolds._rows()):
+                yield index, ('table', table_name, row)
+            return
+    for index, M in enumerate(manifolds):
+        yield index, ('isosig', M.name(), M.triangulation_isosig(decorated=True))
+
+
+def _manifold(source):
+    import snappy
+    kind, name, data = source
+    if kind == 'table':
+        return database.__all_tables__[name]._manifold_factory(data)
+    M = snappy.Manifold(data)
+    M.set_name(name)
+    return M
+
+
+def _invariant(M, invariant):
+    """
+    An invariant is the name of a method or a tuple (name, arg1, ...).
+    Values which cannot be pickled are replaced by their string form.
+    """
+    if isinstance(invariant, str):
+        method, args = invariant, ()
+    else:
+        method, args = invariant[0], invariant[1:]
+    try:
+        value = getattr(M, method)(*args)
+    except Exception as e:
+        return e
+    try:
+        pickle.dumps(value)
+    except Exception:
+        value = str(value)
+    return value
+
+
+def _compute(task):
+    (index, source), invariants = task
+    M = _manifold(source)
+    values = {invariant: _invariant(M, invariant) for invariant in invariants}
+    return BatchRecord(index, M.name(), values)
+
+
+def _load_results(results_file):
+    """
+    Read the records saved by a previous run.  A record which was only
+    partly written when that run was interrupted is ignored.
+    """
+    done = {}
+    try:
+        with open(results_file, 'rb') as file:
+            while True:
+                try:
+                    record = pickle.load(file)
+                except (EOFError, pickle.UnpicklingError):
+                    break
+                done[record.index] = record
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def map(manifolds, invariants, processes=None, chunksize=16,
+        results_file=None):
+    """
+    Computes the given invariants for each manifold in a census,
+    ManifoldTable or other iterable of manifolds using a pool of
+    worker processes, and yields a BatchRecord for each manifold in
+    the order of the input.
+
+    >>> from snappy import OrientableCuspedCensus
+    >>> for r in map(OrientableCuspedCensus[:3], ['homology', 'num_cusps'],
+    ...              processes=2):
+    ...     print(r.index, r.name, r.values['homology'], r.values['num_cusps'])
+    0 m003 Z/5 + Z 1
+    1 m004 Z 1
+    2 m006 Z/5 + Z 1
+
+    An invariant can also be a tuple consisting of a method name and
+    its arguments:
+
+    >>> from snappy import Manifold
+    >>> L = [Manifold('m004'), Manifold('m125')]
+    >>> records = list(map(L, [('covers', 2), 'symmetry_group'], processes=1))
+    >>> [len(r.values[('covers', 2)]) for r in records]
+    [1, 3]
+
+    Values which cannot be pickled, like symmetry groups, are returned
+    as strings.  If computing an invariant raises an exception, the
+    exception is returned as the value.
+
+    >>> records[0].values['symmetry_group']
+    'D4'
+
+    If results_file is given, each record is appended to that file as
+    soon as it has been computed.  Calling map again with the same
+    arguments and results_file will only compute the records missing
+    from the file, so an interrupted computation can be resumed.
+
+    With processes=1, everything is computed in the current process.
+    """
+    invariants = [invariants] if isinstance(invariants, str) else list(invariants)
+    done = _load_results(results_file) if results_file else {}
+    tasks = ((item, invariants) for item in _sources(manifolds)
+             if item[0] not in done)
+    output = open(results_file, 'ab') if results_file else None
+    pool = multiprocessing.Pool(processes) if processes != 1 else None
+    try:
+        if pool is None:
+            records = (_compute(task) for task in tasks)
+        else:
+            records = pool.imap(_compute, tasks, chunksize)
+        finished = sorted(done)
+        for record in records:
+            while finished and finished[0] < record.index:
+                yield done[finished.pop(0)]
+            if output:
+                pickle.dump(record, output)
+                output.flush()
+            yield record
+        for index in finished:
+            yield done[index]
+    finally:
+        if pool is not None:
+            pool.terminate()
+        if output:
+            output.close()
+
+
+class IsometryClass(collections.namedtuple('IsometryClass',
+                                           ['signature', 'members'])):
+    """
+    A class of isometric manifolds found by classify_up_to_isometry.
+    The members are pairs (index, name) in the order of the input and
+    the signature is their isometry signature, or None if it could
+    not be computed for any of them.
+    """
+    __slots__ = ()
+
+    @property
+    def representative(self):
+        return self.members[0]
+
+
+IsometryClassification = collections.namedtuple(
+    'IsometryClassification', ['classes', 'unresolved'])
+IsometryClassification.__doc__ = """
+The result of classify_up_to_isometry.  The classes are IsometryClasses
+and each unresolved group is a list of pairs (index, name) of manifolds
+which could not be placed in any class.
+"""
+
+
+def _volume_groups(volumes, tolerance=1e-5):
+    """
+    Split the sorted pairs (volume, item) into runs of nearly equal
+    volumes, returning lists of items.
+    """
+    groups, last = [], None
+    for volume, item in volumes:
+        if last is None or volume - last > tolerance * max(1, volume):
+            groups.append([])
+        groups[-1].append(item)
+        last = volume
+    return groups
+
+
+def _classify_group(task):
+    """
+    Sorts the pending manifolds into the given classes, or new ones,
+    by pairwise comparison with one representative of each class.
+    A manifold for which is_isometric_to fails against some class,
+    and which matches no class, is unresolved.
+    """
+    representatives, pending = task
+    representatives = [(key, _manifold(source))
+                       for key, source in representatives]
+    assignment, unresolved = {}, []
+    for index, source in pending:
+        M = _manifold(source)
+        undecided = False
+        for key, R in representatives:
+            try:
+                if M.is_isometric_to(R):
+                    assignment[index] = key
+                    break
+            except (RuntimeError, ValueError):
+                undecided = True
+        else:
+            if undecided:
+                unresolved.append(index)
+            else:
+                assignment[index] = ('new', index)
+                representatives.append((('new', index), M))
+    return assignment, unresolved
+
+
+def classify_up_to_isometry(manifolds, processes=None, verified=False,
+                            chunksize=16):
+    """
+    Partitions a census, ManifoldTable or other iterable of manifolds
+    into isometry classes using a pool of worker processes.
+
+    First the isometry signature, volume and homology of each manifold
+    are computed in parallel and manifolds with the same signature are
+    put in the same class.  The manifolds whose signature could not be
+    computed, e.g. closed manifolds, are grouped by homology and volume
+    and each group is compared pairwise with is_isometric_to, against
+    the representatives of the classes with the same invariants, in a
+    worker process.  Manifolds which could not be placed are returned
+    as unresolved groups.
+
+    >>> from snappy import Manifold, OrientableClosedCensus
+    >>> L = [Manifold('m004'), Manifold('m003'), Manifold('4_1'),
+    ...      Manifold('m003(-3,1)'), OrientableClosedCensus[0],
+    ...      Manifold('m003(-2,3)'), OrientableClosedCensus[1]]
+    >>> result = classify_up_to_isometry(L, processes=2)
+    >>> [[index for index, name in c.members] for c in result.classes]
+    [[0, 2], [1], [3, 4], [5, 6]]
+    >>> result.classes[0]
+    IsometryClass(signature='cPcbbbiht', members=[(0, 'm004'), (2, '4_1')])
+    >>> result.classes[0].representative
+    (0, 'm004')
+    >>> result.unresolved
+    []
+
+    When verified is True, the signatures of the first step are
+    computed with isometry_signature(verified=True), that is, from the
+    canonical retriangulation certified by
+    verify.verified_canonical_retriangulation with its default
+    interval and exact precisions.  A manifold whose signature could
+    not be certified is treated like one without signature.  The
+    comparisons with is_isometric_to in the second step are not
+    verified either way.  Since verified_canonical_retriangulation
+    requires Sage, classify_up_to_isometry raises SageNotAvailable
+    outside of Sage when verified is True, before computing anything.
+
+    With processes=1, everything is computed in the current process.
+    """
+    if verified and not _within_sage:
+        raise SageNotAvailable('Sorry, classify_up_to_isometry with '
+                               'verified=True requires using SnapPy '
+                               'inside Sage.')
+    sources = list(_sources(manifolds))
+    invariants = [('isometry_signature', False, verified), 'volume', 'homology']
+    pool = multiprocessing.Pool(processes) if processes != 1 else None
+    try:
+        tasks = ((item, invariants) for item in sources)
+        if pool is None:
+            records = [_compute(task) for task in tasks]
+        else:
+            records = list(pool.imap(_compute, tasks, chunksize))
+
+        def invariant(record, name):
+            value = record.values[name]
+            return None if isinstance(value, Exception) else value
+
+        # Classes of manifolds with the same isometry signature.
+        classes, by_signature = [], {}
+        failures = []
+        for record in records:
+            signature = invariant(record, invariants[0])
+            if signature is None:
+                failures.append(record)
+            elif signature in by_signature:
+                classes[by_signature[signature]][1].append(record)
+            else:
+                by_signature[signature] = len(classes)
+                classes.append((signature, [record]))
+
+        # Group the other manifolds, together with the representatives
+        # of classes which may contain them, by homology and volume.
+        def group_key(record):
+            return str(invariant(record, 'homology'))
+
+        keys = {group_key(record) for record in failures}
+        volumes = collections.defaultdict(list)
+        for key, members in enumerate(classes):
+            representative = members[1][0]
+            if group_key(representative) in keys:
+                volumes[group_key(representative)].append(
+                    (float(invariant(representative, 'volume')), key))
+        for record in failures:
+            volume = invariant(record, 'volume')
+            volume = float(volume) if volume is not None else float('inf')
+            volumes[group_key(record)].append((volume, record))
+        group_tasks = []
+        for key in sorted(volumes):
+            for group in _volume_groups(sorted(volumes[key],
+                                               key=lambda x: x[0])):
+                pending = [record for record in group
+                           if not isinstance(record, int)]
+                if not pending:
+                    continue
+                pending.sort(key=lambda record: record.index)
+                representatives = [
+                    (item, sources[classes[item][1][0].index][1])
+                    for item in group if isinstance(item, int)]
+                group_tasks.append((representatives,
+                                    [(record.index, sources[record.index][1])
+                                     for record in pending]))
+        if pool is None:
+            group_results = [_classify_group(task) for task in group_tasks]
+        else:
+            group_results = pool.map(_classify_group, group_tasks)
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    by_index = {record.index: record for record in records}
+    new_classes, unresolved = {}, []
+    for assignment, undecided in group_results:
+        for index, key in sorted(assignment.items()):
+            if isinstance(key, int):
+                classes[key][1].append(by_index[index])
+            else:
+                new_classes.setdefault(key, []).append(by_index[index])
+        if undecided:
+            unresolved.append([(index, by_index[index].name)
+                               for index in undecided])
+    classes += [(None, members) for members in new_classes.values()]
+    classes = [IsometryClass(signature,
+                             sorted((record.index, record.name)
+                                    for record in members))
+               for signature, members in classes]
+    classes.sort(key=lambda c: c.members[0][0])
+    return IsometryClassification(classes, unresolved)
+
+
+FillingRecord = collections.namedtuple('FillingRecord', ['slope', 'values'])
+FillingRecord.__doc__ = """
+The result of dehn_filling_sweep for one slope.  The values are a
+dictionary whose keys are the requested invariants.
+"""
+
+_geometric_solutions = ('all tetrahedra positively oriented',
+                        'contains negatively oriented tetrahedra')
+
+
+def _slope_path(slopes, shape):
+    """
+    Orders the slopes for warm starts.  A slope (p, q) corresponds to
+    the point 1/(p + q*shape), up to sign, which is near 0 when the
+    slope is long and hence the filled structure is close to the
+    complete one.  The points are split by distance from 0 into about
+    sqrt(n) rings, starting with the one nearest 0, and each ring is
+    traversed by angle, alternating the direction, so that consecutive
+    slopes are close.  Returns a list of indices into slopes.
+    """
+    points = []
+    for i, (p, q) in enumerate(slopes):
+        z = complex(p) + complex(q) * shape
+        if z == 0:
+            points.append((float('inf'), 0.0, i))
+            continue
+        z = 1 / z
+        if z.real < 0 or (z.real == 0 and z.imag < 0):
+            z = -z
+        points.append((abs(z), cmath.phase(z), i))
+    points.sort()
+    size = max(1, int(math.sqrt(len(points))))
+    path = []
+    for ring, start in enumerate(range(0, len(points), size)):
+        ring_points = sorted(points[start:start + size],
+                             key=lambda point: point[1],
+                             reverse=bool(ring % 2))
+        path += [i for _, _, i in ring_points]
+    return path
+
+
+def _filling_values(M, which_cusp, invariants):
+    values = {}
+    for invariant in invariants:
+        if invariant == 'solution_type':
+            values[invariant] = M.solution_type()
+        elif invariant == 'core_length':
+            value = M.cusp_info(which_cusp).get('core_length')
+            values[invariant] = None if value is None else complex(value)
+        elif invariant == 'volume':
+            values[invariant] = float(M.volume())
+        else:
+            values[invariant] = _invariant(M, invariant)
+    return values
+
+
+def _sweep(task):
+    """
+    Fills the cusp with the slopes in the given order, starting the
+    solver each time from the shapes of the previous filling.  When
+    that fails, the filling is solved again from the complete structure.
+    """
+    M, which_cusp, slopes, invariants = task
+    results = []
+    for index, slope in slopes:
+        M.dehn_fill(slope, which_cusp)
+        if M.solution_type() not in _geometric_solutions:
+            M.init_hyperbolic_structure(force_recompute=True)
+            M._cache.clear(message='dehn_filling_sweep')
+        results.append((index, FillingRecord(
+            slope, _filling_values(M, which_cusp, invariants))))
+    return results
+
+
+def dehn_filling_sweep(manifold, slopes, which_cusp=0,
+                       invariants=('volume', 'solution_type', 'core_length'),
+                       processes=1):
+    """
+    Computes invariants of the Dehn fillings of one cusp of the
+    manifold along each of the given slopes, returning a FillingRecord
+    for each slope in the order of the input.  The other cusps keep
+    their current Dehn filling coefficients and the manifold itself is
+    not changed.
+
+    >>> from snappy import Manifold
+    >>> M = Manifold('m004')
+    >>> table = M.dehn_filling_sweep([(5, 1), (7, 2), (6, 1), (-5, 1)])
+    >>> for slope, values in table:
+    ...     print(slope, '%.6f' % values['volume'], values['solution_type'])
+    (5, 1) 0.981369 all tetrahedra positively oriented
+    (7, 2) 1.649610 all tetrahedra positively oriented
+    (6, 1) 1.284485 all tetrahedra positively oriented
+    (-5, 1) 0.981369 all tetrahedra positively oriented
+    >>> '%.6f' % table[2].values['core_length'].real
+    '0.480312'
+
+    Besides 'volume' (a float), 'solution_type' and 'core_length' (the
+    complex length of the core geodesic of the filled cusp, or None),
+    the invariants can be names of methods of the filled manifold or
+    tuples (name, arg1, ...) as for snappy.batch.map:
+
+    >>> M.dehn_filling_sweep([(5, 1)], invariants=['homology'])
+    [FillingRecord(slope=(5, 1), values={'homology': Z/5})]
+
+    The slopes are visited along a path through Dehn surgery space,
+    starting near the complete structure, so that the shapes for each
+    filling are a good starting point for the next one.  Whenever the
+    solver fails to find a hyperbolic structure this way, the filling
+    is solved again starting from the complete structure.  With
+    processes greater than 1 (or None, meaning one per CPU), the path
+    is split into that many pieces which are swept in parallel.
+    """
+    slopes = [tuple(slope) for slope in slopes]
+    if not slopes:
+        return []
+    N = manifold.copy()
+    N.dehn_fill((0, 0), which_cusp)
+    try:
+        shape = complex(N.cusp_info(which_cusp)['shape'])
+    except (KeyError, TypeError, ValueError):
+        shape = 1j
+    if shape.imag == 0:
+        shape = 1j
+    path = [(i, slopes[i]) for i in _slope_path(slopes, shape)]
+    invariants = list(invariants)
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    pieces = max(1, min(processes, len(path)))
+    size = -(-len(path) // pieces)
+    tasks = [(N if start == 0 else N.copy(), which_cusp,
+              path[start:start + size], invariants)
+             for start in range(0, len(path), size)]
+    if len(tasks) == 1:
+        results = [_sweep(tasks[0])]
+    else:
+        with multiprocessing.Pool(len(tasks)) as pool:
+            results = pool.map(_sweep, tasks)
+    table = [None] * len(slopes)
+    for result in results:
+        for index, record in result:
+            table[index] = record
+    return table
@@ -0,0 +1,435 @@
+import collections
+import functools
+import os
+import pickle
+import sqlite3
+import sys
+import time
+import weakref
+
+from .version import version as snappy_version
+
+
+def _new_counters():
+    return {'hits': 0, 'misses': 0, 'compute_time': 0.0, 'evictions': 0}
+
+
+def _size_of(obj, depth=3):
+    """
+    Rough estimate of the memory used by a cached result, following
+    the items of lists, tuples, sets and dictionaries a few levels
+    deep.  Memory owned by the SnapPea kernel is not counted.
+    """
+    size = sys.getsizeof(obj)
+    if depth > 0:
+        if isinstance(obj, dict):
+            size += sum(_size_of(k, depth - 1) + _size_of(v, depth - 1)
+                        for k, v in obj.items())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            size += sum(_size_of(x, depth - 1) for x in obj)
+    return size
+
+
+class SnapPyCache(dict):
+    """
+    Implementation of a simple cache used by the Manifold and Triangulation
+    to save the results of methods which require a significant amount of
+    computation.
+
+    This cache uses the tuple (method.__name, args, kwargs) as its key.
+
+    The results stored with save are bounded by max_bytes per cache and
+    by global_max_bytes for all caches together, both of which default
+    to None, meaning no bound.  When a bound is exceeded, the least
+    recently used results are evicted.  The sizes are estimates, see
+    _size_of.
+
+    >>> cache = SnapPyCache()
+    >>> cache.max_bytes = 1000
+    >>> cache.lookup('homology')
+    Traceback (most recent call last):
+    ...
+    KeyError: ('homology', (), ())
+    >>> cache.save('Z/2 + Z', 'homology')
+    'Z/2 + Z'
+    >>> cache.lookup('homology')
+    'Z/2 + Z'
+    >>> for n in range(10):
+    ...     _ = cache.save(list(range(n, n + 10)), 'covers', n)
+    >>> cache.num_bytes() <= 1000
+    True
+    >>> cache.lookup('covers', 0)
+    Traceback (most recent call last):
+    ...
+    KeyError: ('covers', (0,), ())
+    >>> stats = cache.stats()
+    >>> stats['homology']['hits'], stats['homology']['misses']
+    (1, 1)
+    >>> stats['covers']['entries'] < 10 < stats['covers']['evictions'] + 10
+    True
+    """
+    debug = False
+    max_bytes = None
+    global_max_bytes = None
+    _clear = dict.clear
+
+    # Every result stored with save, in order of last use, as
+    # (id of cache, key) -> (weakref to cache, size).
+    _recent = collections.OrderedDict()
+    _global_bytes = 0
+    # Counters for all caches together, see global_stats.
+    _global_counters = collections.defaultdict(_new_counters)
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        # The sizes of the results stored with save, in order of last use.
+        self._sizes = {}
+        self._counters = collections.defaultdict(_new_counters)
+        self._missed = {}
+        self._ref = weakref.ref(self)
+        weakref.finalize(self, SnapPyCache._forget, id(self), self._sizes)
+
+    @staticmethod
+    def _forget(cache_id, sizes):
+        for key, size in sizes.items():
+            SnapPyCache._recent.pop((cache_id, key), None)
+            SnapPyCache._global_bytes -= size
+        sizes.clear()
+
+    def _count(self, method_name, counter, amount=1):
+        self._counters[method_name][counter] += amount
+        SnapPyCache._global_counters[method_name][counter] += amount
+
+    def _touch(self, key):
+        self._sizes[key] = self._sizes.pop(key)
+        SnapPyCache._recent.move_to_end((id(self), key))
+
+    def _discard(self, key, evicted=False):
+        dict.pop(self, key, None)
+        self._missed.pop(key, None)
+        size = self._sizes.pop(key, 0)
+        SnapPyCache._recent.pop((id(self), key), None)
+        SnapPyCache._global_bytes -= size
+        if evicted:
+            self._count(key[0], 'evictions')
+
+    def _evict(self, keep):
+        if self.max_bytes is not None:
+            size = self.num_bytes()
+            for key in list(self._sizes):
+                if size <= self.max_bytes:
+                    break
+                if key != keep:
+                    size -= self._sizes[key]
+                    self._discard(key, evicted=True)
+        if self.global_max_bytes is not None:
+            recent = SnapPyCache._recent
+            for cache_id, key in list(recent):
+                if SnapPyCache._global_bytes <= self.global_max_bytes:
+                    break
+                cache = recent[cache_id, key][0]()
+                if cache is not None and (cache, key) != (self, keep):
+                    cache._discard(key, evicted=True)
+
+    def save(self, answer, method_name, *args, **kwargs):
+        key = (method_name, args, tuple(kwargs.items()))
+        start = self._missed.pop(key, None)
+        self._discard(key)
+        if start is not None:
+            self._count(method_name, 'compute_time',
+                        time.perf_counter() - start)
+        self[key] = answer
+        size = _size_of(answer)
+        self._sizes[key] = size
+        SnapPyCache._global_bytes += size
+        SnapPyCache._recent[id(self), key] = (self._ref, size)
+        self._evict(keep=key)
+        return answer
+
+    def lookup(self, method_name, *args, **kwargs):
+        key = (method_name, args, tuple(kwargs.items()))
+        try:
+            answer = self[key]
+        except KeyError:
+            self._count(method_name, 'misses')
+            self._missed[key] = time.perf_counter()
+            raise
+        self._count(method_name, 'hits')
+        if key in self._sizes:
+            self._touch(key)
+        return answer
+
+    def discard(self, method_name, *args, **kwargs):
+        """
+        Remove the result for the given method and arguments, if any.
+        """
+        self._discard((method_name, args, tuple(kwargs.items())))
+
+    def clear(self, key=None, message=''):
+        if self.debug:
+            print('_clear_cache: %s' % message)
+        if key is None:
+            for k in list(self._sizes):
+                self._discard(k)
+            self._missed.clear()
+            self._clear()
+        else:
+            self.pop(key)
+            self._discard(key)
+
+    def num_bytes(self):
+        """
+        The estimated size of the results stored with save.
+        """
+        return sum(self._sizes.values())
+
+    def stats(self):
+        """
+        Returns a dictionary with an entry for each method which used
+        this cache, giving the number of hits and misses, the time
+        spent computing the results after a miss, and the number and
+        estimated size of the stored and evicted results.
+        """
+        return _stats(self._counters, self._sizes.items())
+
+    @staticmethod
+    def global_stats():
+        """
+        Like stats, but with the counters of all caches, including
+        those of Manifolds which no longer exist.  The entries and
+        bytes are those of the live caches.
+        """
+        return _stats(SnapPyCache._global_counters,
+                      ((key, size) for (_, key), (_, size)
+                       in SnapPyCache._recent.items()))
+
+
+def _stats(counters, sizes):
+    ans = {name: dict(c, entries=0, bytes=0) for name, c in counters.items()}
+    for key, size in sizes:
+        entry = ans.setdefault(key[0], dict(_new_counters(), entries=0, bytes=0))
+        entry['entries'] += 1
+        entry['bytes'] += size
+    return ans
+
+
+class PersistentCache():
+    """
+    An on-disk cache, stored in an sqlite file, for the results of
+    expensive computations which should survive the Manifold that
+    computed them, e.g., across processes and sessions.
+
+    The results are keyed by tuples (class name, decorated isosig,
+    method name, args, kwargs) where the class name of the manifold
+    determines the precision.  Only results which can be pickled are
+    stored.  When the total size of the stored results exceeds
+    max_bytes, the least recently used results are evicted, where the
+    time of use is only tracked up to touch_interval seconds.  Results
+    stored by a different version of SnapPy are discarded when the
+    file is opened.
+
+    >>> import tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'cache.sqlite')
+    >>> cache = PersistentCache(path, max_bytes=200)
+    >>> key = ('Manifold', 'cPcbbbiht_BaCB', 'volume', (), ())
+    >>> cache.save(key, 2.0298832128193)
+    >>> cache.lookup(key)
+    2.0298832128193
+    >>> cache.lookup(('Manifold', 'cPcbbbiht_BaCB', 'homology', (), ()))
+    Traceback (most recent call last):
+    ...
+    KeyError: ('Manifold', 'cPcbbbiht_BaCB', 'homology', (), ())
+    >>> for n in range(10):
+    ...     cache.save(('Manifold', 'cPcbbbiht_BaCB', 'covers', (n,), ()), 'x' * 30)
+    >>> cache.stats()['bytes'] <= 200
+    True
+    >>> cache.lookup(('Manifold', 'cPcbbbiht_BaCB', 'covers', (9,), ()))
+    'xxxxxxxxxxxxxxxxxxxxxxxxxxxxxx'
+    >>> cache.lookup(('Manifold', 'cPcbbbiht_BaCB', 'covers', (0,), ()))
+    Traceback (most recent call last):
+    ...
+    KeyError: ('Manifold', 'cPcbbbiht_BaCB', 'covers', (0,), ())
+    >>> stats = cache.stats()
+    >>> stats['hits'], stats['misses']
+    (2, 2)
+
+    Several processes may share the file:
+
+    >>> other = PersistentCache(path, max_bytes=200)
+    >>> other.invalidate()
+    >>> for n in range(10):
+    ...     cache.save(('Manifold', 'cPcbbbiht_BaCB', 'covers', (n,), ()), 'x' * 30)
+    >>> other.stats()['bytes'] <= 200, cache.stats()['entries'] > 0
+    (True, True)
+    >>> other.close()
+    >>> cache.invalidate('covers')
+    >>> cache.stats()['entries']
+    0
+    """
+    def __init__(self, path, max_bytes=2**30, version=snappy_version):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = self.misses = 0
+        self._connection = sqlite3.connect(path, timeout=60,
+                                           check_same_thread=False)
+        self._connection.executescript("""
+            create table if not exists results (
+                key text primary key, method text, value blob, size int,
+                last_used real);
+            create index if not exists results_by_last_used
+                on results (last_used);
+            create table if not exists metadata (
+                name text primary key, value text);""")
+        row = self._connection.execute(
+            "select value from metadata where name='version'").fetchone()
+        if row is None or row[0] != version:
+            self.invalidate()
+            with self._connection:
+                self._connection.execute(
+                    "replace into metadata values ('version', ?)", (version,))
+
+    # A hit only records when the result was last used if this is more
+    # than touch_interval seconds ago, so that lookups from several
+    # processes sharing the file rarely need sqlite's write lock.
+    touch_interval = 3600
+
+    def lookup(self, key):
+        row = self._connection.execute(
+            'select value, last_used from results where key=?',
+            (repr(key),)).fetchone()
+        if row is None:
+            self.misses += 1
+            raise KeyError(key)
+        self.hits += 1
+        now = time.time()
+        if now - row[1] > self.touch_interval:
+            with self._connection:
+                self._connection.execute(
+                    'update results set last_used=? where key=?',
+                    (now, repr(key)))
+        return pickle.loads(row[0])
+
+    def save(self, key, answer):
+        try:
+            value = pickle.dumps(answer)
+        except Exception:
+            return
+        if len(value) > self.max_bytes:
+            return
+        # Other processes may share the file, so the total size is
+        # computed inside the transaction which evicts.
+        with self._connection:
+            self._connection.execute(
+                'replace into results values (?, ?, ?, ?, ?)',
+                (repr(key), key[2], value, len(value), time.time()))
+            total = self._total_size()
+            while total > self.max_bytes:
+                row = self._connection.execute(
+                    'select key, size from results '
+                    'order by last_used, rowid limit 1').fetchone()
+                if row is None:
+                    break
+                self._connection.execute(
+                    'delete from results where key=?', (row[0],))
+                total -= row[1]
+
+    def _total_size(self):
+        return self._connection.execute(
+            'select coalesce(sum(size), 0) from results').fetchone()[0]
+
+    def invalidate(self, method_name=None):
+        """
+        Remove all results, or only those of the given method.
+        """
+        with self._connection:
+            if method_name is None:
+                self._connection.execute('delete from results')
+            else:
+                self._connection.execute(
+                    'delete from results where method=?', (method_name,))
+
+    def stats(self):
+        entries = self._connection.execute(
+            'select count(*) from results').fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses,
+                'entries': entries, 'bytes': self._total_size()}
+
+    def close(self):
+        self._connection.close()
+
+
+persistent_cache = None
+
+
+def enable_persistent_cache(path=None, max_bytes=2**30):
+    """
+    Start storing the results of the methods wrapped with persistent
+    in the sqlite file at the given path, which defaults to
+    ~/.snappy_cache.sqlite, and return the PersistentCache.
+    """
+    global persistent_cache
+    if path is None:
+        path = os.path.join(os.path.expanduser('~'), '.snappy_cache.sqlite')
+    disable_persistent_cache()
+    persistent_cache = PersistentCache(path, max_bytes)
+    return persistent_cache
+
+
+def disable_persistent_cache():
+    global persistent_cache
+    if persistent_cache is not None:
+        persistent_cache.close()
+        persistent_cache = None
+
+
+def persistent(method, method_name=None, depends_on_triangulation=None):
+    """
+    Wrap a method of a Manifold, or a function whose first argument is
+    a Manifold, so that its results are also looked up in and saved to
+    the persistent cache when one has been enabled.
+
+    Since the results are keyed by the isomorphism signature, this
+    should only be used for results that do not depend on the
+    numbering of the tetrahedra or cusps of the triangulation.  If
+    this only holds for some arguments, depends_on_triangulation is a
+    function which is called with the arguments of the method (except
+    for the manifold) and returns True when the result must not be
+    cached.  For example, the words of the length spectrum depend on
+    the triangulation:
+
+    >>> import tempfile
+    >>> from snappy import Manifold
+    >>> cache = enable_persistent_cache(
+    ...     os.path.join(tempfile.mkdtemp(), 'cache.sqlite'))
+    >>> M = Manifold('s776')
+    >>> N = Manifold(M.triangulation_isosig())
+    >>> N.length_spectrum(1.5, include_words=True)[0]['word']
+    'DeAbFe'
+    >>> M.length_spectrum(1.5, include_words=True)[0]['word']
+    'C'
+    >>> disable_persistent_cache()
+    """
+    if method_name is None:
+        method_name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(manifold, *args, **kwargs):
+        cache = persistent_cache
+        if cache is None or (depends_on_triangulation is not None and
+                             depends_on_triangulation(*args, **kwargs)):
+            return method(manifold, *args, **kwargs)
+        try:
+            key = (manifold.__class__.__name__,
+                   manifold.triangulation_isosig(decorated=True),
+                   method_name, args, tuple(sorted(kwargs.items())))
+        except (ValueError, RuntimeError):
+            return method(manifold, *args, **kwargs)
+        try:
+            return cache.lookup(key)
+        except KeyError:
+            pass
+        answer = method(manifold, *args, **kwargs)
+        cache.save(key, answer)
+        return answer
+
+    return wrapper
@@ -0,0 +1,4 @@
+"""
+Picking cusp neighborhoods and exceptional slopes.
+
+"""
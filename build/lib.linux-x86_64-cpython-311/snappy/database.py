@@ -0,0 +1,987 @@
+"""
+This module uses the Manifold class from the SnapPy extension
+module. After the Manifold class has been defined, the "__init__.py"
+module for "snappy" itself sets::
+
+  database.Manifold = Manifold
+
+This file simply defines the ManifoldTable class.  The ManifoldTables
+that come with actual data are defined in external packages, such as
+the required "snappy_manifolds".  Such a package must provide a
+"get_tables" function that accepts the below "ManifoldTable" as input
+and returns a list of subclasses of "ManifoldTable".
+"""
+from .db_utilities import (decode_torsion, decode_matrices, db_hash,
+                           basic_db_hash, cyclic_db_hash)
+from .cache import persistent
+from .sage_helper import _within_sage
+from spherogram.codecs import DTcodec
+import os
+import sys
+import sqlite3
+import re
+import hashlib
+import random
+import importlib
+import collections
+import threading
+import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if _within_sage:
+    import sage.all
+
+    def is_int(slice):
+        return isinstance(slice, (sage.all.Integer, int))
+
+    def is_int_or_none(slice):
+        return isinstance(slice, (sage.all.Integer, int, type(None)))
+
+    def is_float_or_none(slice):
+        return isinstance(slice, (float, sage.all.RealDoubleElement,
+                                  sage.rings.real_mpfr.RealNumber, type(None)))
+else:
+    def is_int(slice):
+        return isinstance(slice, int)
+
+    def is_int_or_none(slice):
+        return isinstance(slice, (int, type(None)))
+
+    def is_float_or_none(slice):
+        return isinstance(slice, (float, type(None)))
+
+split_filling_info = re.compile(r'(.*?)((?:\([0-9 .+-]+,[0-9 .+-]+\))*$)')
+filling_info = re.compile(r'\(([0-9 .+-]+),([0-9 .+-]+)\)')
+
+
+def _filling_coefficient(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parse_fillings(text):
+    """
+    Parse the filling suffix of a triangulation stored in a table.
+
+    >>> parse_fillings('(1,2)(0,0)(-1.5,3)')
+    [(1, 2), (0, 0), (-1.5, 3)]
+    >>> parse_fillings('')
+    []
+    """
+    return [(_filling_coefficient(m), _filling_coefficient(l))
+            for m, l in filling_info.findall(text)]
+
+
+def connect_to_db(db_path):
+    """
+    Open the given sqlite database, ideally in read-only mode.
+
+    The connection may be shared by several threads, e.g. when
+    Manifolds are created in a thread pool.  Queries that run while
+    other threads may be active should use a fresh cursor.
+    """
+    if sys.version_info >= (3,4):
+        uri = 'file:' + db_path + '?mode=ro'
+        return sqlite3.connect(uri, uri=True, check_same_thread=False)
+    elif sys.platform.startswith('win'):
+        try:
+            import apsw
+            return apsw.Connection(db_path, flags=apsw.SQLITE_OPEN_READONLY)
+        except ImportError:
+            return sqlite3.connect(db_path)
+    else:
+        return sqlite3.connect(db_path)
+
+
+def _user_cache_directory():
+    """
+    The directory for the files SnapPy derives from its data, e.g.
+    ~/.cache/snappy on Linux.
+    """
+    if sys.platform.startswith('win'):
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    elif sys.platform == 'darwin':
+        base = os.path.join(os.path.expanduser('~'), 'Library', 'Caches')
+    else:
+        base = (os.environ.get('XDG_CACHE_HOME') or
+                os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base, 'snappy')
+
+
+def invariants_path(db_path):
+    """
+    The side file holding the indexed copies of the invariants of the
+    tables of the given database, see ManifoldTable._invariants_table.
+    It is in the user's cache directory, see _user_cache_directory,
+    and never next to the database, which is usually part of an
+    installed package.
+    """
+    db_path = os.path.abspath(db_path)
+    name = os.path.basename(db_path)
+    digest = hashlib.sha1(db_path.encode()).hexdigest()[:16]
+    return os.path.join(_user_cache_directory(),
+                        '%s-%s.invariants' % (name, digest))
+
+
+def _invariants_version(connection, table):
+    try:
+        row = connection.execute(
+            'select version from main.snappy_invariants where name=?',
+            (table,)).fetchone()
+    except sqlite3.Error:
+        return None
+    return None if row is None else row[0]
+
+
+def build_invariants_file(db_path, table, columns):
+    """
+    Make sure that the side file of the database has an indexed copy
+    of the given columns of the table, which is up to date with the
+    database, and return its path.  The version is first checked with
+    a read-only connection; only if the copy is missing or outdated is
+    the side file locked for writing.  This is done once for all
+    connections and processes; sqlite's locking serializes the
+    processes which find the copy missing at the same time.  Raises
+    OSError or sqlite3.Error if the side file cannot be written.
+    """
+    path = invariants_path(db_path)
+    stat = os.stat(db_path)
+    version = '%d:%d' % (stat.st_size, stat.st_mtime_ns)
+    if os.path.exists(path):
+        connection = sqlite3.connect('file:%s?mode=ro' % path, uri=True)
+        try:
+            if _invariants_version(connection, table) == version:
+                return path
+        finally:
+            connection.close()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    connection = sqlite3.connect('file:' + path, uri=True, timeout=600,
+                                 isolation_level=None)
+    try:
+        connection.execute('attach database ? as source',
+                           ('file:%s?mode=ro' % db_path,))
+        connection.execute('begin immediate')
+        connection.execute('create table if not exists main.snappy_invariants '
+                           '(name text primary key, version text)')
+        # Another process may have built it while we waited for the lock.
+        if _invariants_version(connection, table) != version:
+            for statement in [
+                    'drop table if exists main.%(table)s',
+                    'create table main.%(table)s as '
+                    'select %(columns)s from source.%(table)s',
+                    'create index main.%(table)s_by_invariants '
+                    'on %(table)s (cusps, betti, volume)',
+                    'create index main.%(table)s_by_hash on %(table)s (hash)']:
+                connection.execute(statement % {
+                    'table': table, 'columns': ', '.join(columns)})
+            connection.execute(
+                'replace into main.snappy_invariants values (?, ?)',
+                (table, version))
+        connection.execute('commit')
+    finally:
+        connection.close()
+    return path
+
+
+def _column_array(values, sql_type):
+    """
+    The NumPy array of the values of a column of the given SQL type.
+    NULLs become NaN in real columns.  An integer column with NULLs is
+    returned as a masked array, with the NULLs masked.
+    """
+    if sql_type == 'real':
+        return numpy.array(values, dtype=float)
+    if sql_type in ('integer', 'int'):
+        if None in values:
+            return numpy.ma.masked_array(
+                [0 if v is None else v for v in values],
+                mask=[v is None for v in values], dtype=int)
+        return numpy.array(values, dtype=int)
+    return numpy.array(values)
+
+
+persistent_db_hash = persistent(db_hash)
+
+
+def mfld_hash(manifold):
+    """
+    We cache the hash to speed up searching for one manifold in
+    multiple tables.
+    """
+    if 'db_hash' not in manifold._cache:
+        manifold._cache['db_hash'] = persistent_db_hash(manifold)
+    return manifold._cache['db_hash']
+
+
+def mfld_basic_hash(manifold):
+    """
+    The first tier of the staged hash, see ManifoldTable.siblings.
+    """
+    if 'db_basic_hash' not in manifold._cache:
+        manifold._cache['db_basic_hash'] = basic_db_hash(manifold)
+    return manifold._cache['db_basic_hash']
+
+
+def mfld_cyclic_hash(manifold):
+    """
+    The second tier of the staged hash, see ManifoldTable.siblings.
+    """
+    if 'db_cyclic_hash' not in manifold._cache:
+        manifold._cache['db_cyclic_hash'] = cyclic_db_hash(manifold)
+    return manifold._cache['db_cyclic_hash']
+
+
+class ManifoldTable():
+    """
+    Iterator for cusped manifolds in an sqlite3 table of manifolds.
+
+    Initialize with the table name.  The table schema is required to
+    include a text field called 'name' and a text field called
+    'triangulation'.  The text holds the result of
+    M.triangulation_isosig(), M.triangulation_isosig(decorated = True), or
+    M._to_string().
+
+    Both mapping from the manifold name, and lookup by index are
+    supported.  Slicing can be done either by numerical index or by
+    volume.
+
+    The __contains__ method is supported, so M in T returns True if M
+    is isometric to a manifold in the table T.  The method
+    T.identify(M) will return the matching manifold from the table.
+
+    If the table is created with lazy=True, e.g. T = T(lazy=True), the
+    manifolds it produces only compute their hyperbolic structure
+    when a method which needs it is first called.  This makes scans
+    which only look at combinatorial invariants much faster.
+
+    >>> from snappy import OrientableClosedCensus
+    >>> M = OrientableClosedCensus(lazy=True)[0]
+    >>> M.structure_is_deferred(), M.homology()
+    (True, Z/5 + Z/5)
+    >>> M.volume() # doctest: +NUMERIC6
+    0.94270736
+    """
+    # basic select clause.  Can be overridden, e.g. to add additional columns
+    _select = 'select name, triangulation from %s '
+
+    # The columns and functions of the cheaper tiers of the staged hash,
+    # which are used when the table has these columns.
+    _hash_tiers = (('basic_hash', mfld_basic_hash),
+                   ('cyclic_hash', mfld_cyclic_hash))
+
+    def __init__(self, table='', db_path=None,
+                 mfld_hash=mfld_hash, lazy=False, **filter_args):
+        self._table = table
+        self._db_path = db_path
+        self.mfld_hash = mfld_hash
+        self._lazy = lazy
+        self._invariants = None
+        self._invariants_lock = threading.Lock()
+        self._connection = connect_to_db(db_path)
+        self._cursor = self._connection.cursor()
+        self._set_schema()
+        self._check_schema()
+        self._configure(**filter_args)
+        self._get_length()
+        self._get_max_volume()
+        self._select = self._select % table
+
+    def _set_schema(self):
+        cursor, table = self._cursor, self._table
+        rows = cursor.execute("pragma table_info('%s')" % table).fetchall()
+        self.schema = {row[1]: row[2].lower() for row in rows}
+
+    def _check_schema(self):
+        assert (self.schema['name'] == 'text' and
+                self.schema['triangulation'] == 'text'
+                ), 'Not a valid Manifold table.'
+
+    @property
+    def filter(self):
+        return self._filter
+
+    # The aggregates computed by _get_aggregates, keyed by (db_path,
+    # table, filter).  The databases are read-only, so these never go
+    # stale; slicing a table repeatedly with the same bounds only
+    # queries them once.
+    _aggregates = collections.OrderedDict()
+    _max_aggregates = 1000
+
+    def _get_aggregates(self):
+        """
+        Return the number of rows selected by the filter, their
+        smallest and largest ids and the largest volume.
+        """
+        key = (self._db_path, self._table, self._filter)
+        aggregates = ManifoldTable._aggregates.get(key)
+        if aggregates is None:
+            where_clause = 'where ' + self._filter if self._filter else ''
+            query = ('select count(*), min(id), max(id), max(volume) '
+                     'from %s %s' % (self._table, where_clause))
+            aggregates = tuple(self._connection.execute(query).fetchone())
+            ManifoldTable._aggregates[key] = aggregates
+            while len(ManifoldTable._aggregates) > self._max_aggregates:
+                ManifoldTable._aggregates.popitem(last=False)
+        return aggregates
+
+    def _get_length(self):
+        self._length, self._min_id, self._max_id, _ = self._get_aggregates()
+        self._ids_contiguous = (self._length > 0 and
+                                self._length == self._max_id - self._min_id + 1)
+
+    def _get_max_volume(self):
+        self._max_volume = self._get_aggregates()[3]
+
+    def _configure(self, **kwargs):
+        """
+        Set up the filter.
+        """
+        conditions = []
+
+        if 'filter' in kwargs:
+            conditions.append(kwargs['filter'])
+        if 'betti' in kwargs:
+            conditions.append('betti=%d ' % kwargs['betti'])
+        if 'num_cusps' in kwargs:
+            conditions.append('cusps=%d ' % kwargs['num_cusps'])
+        if 'cusps' in kwargs:
+            conditions.append('cusps=%d ' % kwargs['cusps'])
+        if 'num_tets' in kwargs:
+            conditions.append('tets=%d ' % kwargs['num_tets'])
+        if 'tets' in kwargs:
+            conditions.append('tets=%d ' % kwargs['tets'])
+        self._filter = ' and '.join(conditions)
+
+    def __repr__(self):
+        class_name = self.__class__.__name__
+        if self._filter == '':
+            return '%s without filters' % class_name
+        else:
+            return '%s with filter: %s' % (class_name, self._filter)
+
+    def __call__(self, **kwargs):
+        return self.__class__(**kwargs)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        for row in self._rows():
+            yield self._manifold_factory(row)
+
+    # Number of rows fetched from the database at a time.
+    _batch_size = 1000
+
+    def _rows(self, batch_size=None):
+        """
+        Iterate through the raw rows selected by this table, without
+        building any Manifolds.
+        """
+        query = self._select
+        if self._filter:
+            query += ' where %s order by id' % self._filter
+        cursor = self._connection.execute(query)
+        batch_size = batch_size or self._batch_size
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+
+    def _batches(self, batch_size):
+        batch = []
+        for row in self._rows(batch_size):
+            batch.append(row)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _manifold_batch(self, rows):
+        return [self._manifold_factory(row) for row in rows]
+
+    def stream(self, batch_size=None, threads=0):
+        """
+        Iterate through the manifolds in the table, like iter(T).  The
+        rows are fetched from the database batch_size at a time.  If
+        threads is positive, the manifolds are built by that many
+        background threads, at most two batches per thread ahead of
+        the consumer.  Since the SnapPea kernel releases the GIL while
+        solving the gluing equations, this overlaps the solver with
+        the work done on the manifolds already returned.
+
+        >>> from snappy import OrientableCuspedCensus
+        >>> [M.name() for M in OrientableCuspedCensus[:5].stream(batch_size=2, threads=2)]
+        ['m003', 'm004', 'm006', 'm007', 'm009']
+
+        A generator that is abandoned, or closed, cancels the batches
+        that have not been started yet rather than waiting for them.
+
+        >>> manifolds = OrientableCuspedCensus.stream(threads=2)
+        >>> next(manifolds)
+        m003(0,0)
+        >>> manifolds.close()
+        """
+        batch_size = batch_size or self._batch_size
+        batches = self._batches(batch_size)
+        if threads <= 0:
+            for rows in batches:
+                yield from self._manifold_batch(rows)
+            return
+        from concurrent.futures import ThreadPoolExecutor
+        pending = collections.deque()
+        executor = ThreadPoolExecutor(threads)
+        try:
+            for rows in batches:
+                pending.append(executor.submit(self._manifold_batch, rows))
+                if len(pending) >= 2 * threads:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            # If the consumer abandons the generator, don't wait for the
+            # batches it will never see.
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def __contains__(self, mfld):
+        try:
+            M = self.identify(mfld)
+            # duck test
+            return M.num_tetrahedra() > 0
+        except:
+            return False
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if index.step:
+                raise IndexError('Slices with steps are not supported.')
+            start, stop = index.start, index.stop
+            if is_float_or_none(start) and is_float_or_none(stop):
+                # Slice by volume.
+                conditions = []
+                if self._filter:
+                    conditions.append(self._filter)
+                if start:
+                    conditions.append('volume >= %f' % start)
+                if stop:
+                    conditions.append('volume < %f' % stop)
+                filter = ' and '.join(conditions)
+                return self.__class__(filter=filter, lazy=self._lazy)
+            elif (is_int_or_none(start) and is_int_or_none(stop)):
+                if start is None:
+                    start = 0
+                elif start < 0:
+                    start = int(self._length + start)
+                if stop is None:
+                    stop = self._length
+                elif stop < 0:
+                    stop = int(self._length + stop)
+                conditions = []
+                start_id, stop_id = self._id_at(start), self._id_at(stop)
+                if start_id is not None:
+                    conditions.append('id >= %d' % start_id)
+                if stop_id is not None:
+                    conditions.append('id < %d' % stop_id)
+                if self._filter:
+                    conditions.append(self._filter)
+                return self.__class__(filter=' and '.join(conditions),
+                                      lazy=self._lazy)
+            else:
+                raise IndexError(
+                    'Use two ints or two floats for start and stop.')
+        elif is_int(index):
+            if index < 0:
+                index = self._length + index
+            id = self._id_at(index)
+            matches = self.find('id=%d' % id) if id is not None else []
+            if len(matches) != 1:
+                raise IndexError('Manifold index is out of bounds')
+        elif isinstance(index, str):
+            matches = self.find("name='%s'" % index)
+            if len(matches) != 1:
+                raise KeyError('The manifold %s was not found.' % index)
+        else:
+            raise IndexError('%s is not a valid index type for manifolds.' %
+                             type(index))
+        return matches[0]
+
+    # The sorted ids selected by the filters whose ids are not
+    # contiguous, keyed like _aggregates, so that T[i] is a lookup.
+    _ids = collections.OrderedDict()
+    _max_ids = 20
+
+    def _id_at(self, index):
+        """
+        The id of the manifold at the given position in this table,
+        or None if there is no such manifold.  When the selected ids
+        are contiguous this is simple arithmetic, otherwise the ids
+        are read once and looked up.
+
+        >>> from snappy import OrientableCuspedCensus
+        >>> T = OrientableCuspedCensus(num_cusps=2)
+        >>> T[1000], T[-1]
+        (o9_17281(0,0)(0,0), o10_150726(0,0)(0,0))
+        """
+        if not 0 <= index < self._length:
+            return None
+        if self._ids_contiguous:
+            return self._min_id + index
+        key = (self._db_path, self._table, self._filter)
+        ids = ManifoldTable._ids.get(key)
+        if ids is None:
+            query = 'select id from %s ' % self._table
+            if self._filter:
+                query += 'where %s ' % self._filter
+            query += 'order by id'
+            ids = array.array('q', (row[0] for row in
+                                    self._connection.execute(query)))
+            ManifoldTable._ids[key] = ids
+            while len(ManifoldTable._ids) > self._max_ids:
+                ManifoldTable._ids.popitem(last=False)
+        return ids[index]
+
+    def _manifold_factory(self, row, M=None):
+        """
+        Factory for "select name, triangulation" queries.
+        Returns a Manifold.
+        """
+
+        if M is None:
+            M = Manifold('empty')
+
+        # Get fillings, if any
+        m = split_filling_info.match(row[1])
+        isosig = m.group(1)
+        # The hyperbolic structure of a Manifold is only computed once
+        # the fillings, including any set by _finalize, are known.
+        is_manifold = hasattr(M, 'init_hyperbolic_structure')
+        if is_manifold:
+            M._from_isosig(isosig, initialize_structure='lazy')
+        else:
+            M._from_isosig(isosig)
+
+        fillings = parse_fillings(m.group(2))
+
+        if fillings:
+            M.dehn_fill(fillings)
+
+        self._finalize(M, row)
+        if is_manifold and not self._lazy:
+            M.init_hyperbolic_structure()
+        return M
+
+    def _finalize(self, M, row):
+        """
+        Give the manifold a name.  Override this method for custom
+        manifold production.
+        """
+        M.set_name(row[0])
+
+    def _one_manifold(self, name, M):
+        """
+        Inflates the given empty Manifold with the table manifold
+        with the specified name.
+        """
+        if hasattr(self, '_regex'):
+            if self._regex.match(name) is None:
+                raise KeyError('The manifold %s was not found.' % name)
+        cursor = self._connection.execute(
+            self._select + "where name='" + name + "'")
+        rows = cursor.fetchall()
+        if len(rows) != 1:
+            raise KeyError('The manifold %s was not found.' % name)
+        return self._manifold_factory(rows[0], M)
+
+    def keys(self):
+        """
+        Return the list of column names for this manifold table.
+        """
+        return self.schema.keys()
+
+    def find(self, where=None, order_by='id', limit=None, offset=None):
+        """
+        Return a list of up to limit manifolds stored in this table,
+        satisfying the where clause, and ordered by the order_by
+        clause.  If limit is None, all matching manifolds are
+        returned.  If the offset parameter is set, the first offset
+        matches are skipped.
+        """
+        conditions = [cond for cond in [self._filter, where] if cond]
+        suffix = ' where ' if conditions else ' '
+        suffix += ' and '.join(conditions)
+        suffix += ' order by %s' % order_by
+        if limit is not None:
+            suffix += ' limit %d' % limit
+        if offset is not None:
+            suffix += ' offset %d' % offset
+        cursor = self._connection.execute(self._select + suffix)
+        return [self._manifold_factory(row) for row in cursor.fetchall()]
+
+    def columns(self, names):
+        """
+        Return a dictionary which maps each of the given column names
+        to the values of that column for the manifolds in this table,
+        in order.  All columns are fetched with a single query and no
+        Manifolds are built.  If NumPy is available the values are
+        NumPy arrays, so the table can be filtered in bulk, otherwise
+        they are lists.  See _column_array for how NULLs are handled.
+
+        >>> from snappy import OrientableCuspedCensus
+        >>> data = OrientableCuspedCensus[:5].columns(['volume', 'cusps'])
+        >>> [int(c) for c in data['cusps']]
+        [1, 1, 1, 1, 1]
+        >>> [round(float(v), 3) for v in data['volume']]
+        [2.03, 2.03, 2.569, 2.569, 2.667]
+        """
+        unknown = [name for name in names if name not in self.schema]
+        if unknown:
+            raise ValueError('The table has no column %s.' % unknown[0])
+        query = 'select %s from %s' % (', '.join(names), self._table)
+        if self._filter:
+            query += ' where %s' % self._filter
+        query += ' order by id'
+        rows = self._connection.execute(query).fetchall()
+        values = list(zip(*rows)) if rows else [()] * len(names)
+        if numpy is None:
+            return {name: list(column) for name, column in zip(names, values)}
+        return {name: _column_array(column, self.schema[name])
+                for name, column in zip(names, values)}
+
+    def _invariants_table(self):
+        """
+        Return the name of a table with the columns of this table,
+        except the triangulation, which has indexes on (cusps, betti,
+        volume) and on hash.  If the database does not come with the
+        first index, an indexed copy of the table is made once in a
+        side file, see invariants_path, which is then attached to the
+        connections of all tables of the database.
+        """
+        if self._invariants is None:
+            with self._invariants_lock:
+                if self._invariants is None:
+                    self._invariants = self._make_invariants_table()
+        return self._invariants
+
+    def _make_invariants_table(self):
+        table = self._table
+        for index in self._connection.execute(
+                "pragma index_list('%s')" % table).fetchall():
+            columns = [row[2] for row in self._connection.execute(
+                "pragma index_info('%s')" % index[1]).fetchall()]
+            if columns == ['cusps', 'betti', 'volume']:
+                return table
+        columns = [col for col in self.schema if col != 'triangulation']
+        try:
+            path = build_invariants_file(self._db_path, table, columns)
+            self._connection.execute(
+                'attach database ? as snappy_invariants',
+                ('file:%s?mode=ro' % path,))
+            return 'snappy_invariants.%s' % table
+        except (OSError, sqlite3.Error):
+            pass
+        # No writable place for the side file, so make a temporary
+        # copy for this connection.
+        temp = 'temp.%s_invariants' % table
+        with self._connection:
+            self._connection.executescript("""
+                create table if not exists %(temp)s as
+                    select %(columns)s from %(table)s;
+                create index if not exists %(temp)s_by_invariants
+                    on %(table)s_invariants (cusps, betti, volume);
+                create index if not exists %(temp)s_by_hash
+                    on %(table)s_invariants (hash);
+                """ % {'temp': temp, 'columns': ', '.join(columns),
+                       'table': table})
+        return temp
+
+    def _window(self, mfld):
+        """
+        The volume window, number of complete cusps, Betti number and
+        torsion used to find the candidates for mfld in this table.
+        """
+        vol = float(mfld.volume())
+        epsilon = vol / 1e5
+        cusps = mfld.cusp_info('is_complete').count(True)
+        H = mfld.homology()
+        torsion = [c for c in H.elementary_divisors() if c != 0]
+        return (vol - epsilon, vol + epsilon, cusps, H.betti_number(),
+                str(torsion))
+
+    def siblings(self, mfld):
+        """
+        Return the manifolds in the census which may be isometric to
+        mfld, namely all manifolds which have the same hash value.
+
+        If the table has the columns of the cheaper tiers of the hash
+        (see _hash_tiers and dev/database_tools/add_hash_tiers.py),
+        these are computed one at a time, and once at most one
+        manifold in the table matches the tiers computed so far, that
+        manifold is returned without computing the remaining tiers.
+        In that case, its full hash may differ from that of mfld, so
+        that only an isometry, or else the full hash, decides whether
+        it matches, as in identify.
+        """
+        query = ('select 1 from %s where cusps=? and betti=? and torsion=? '
+                 'and volume between ? and ?' % self._invariants_table())
+        if self._filter:
+            query += ' and %s' % self._filter
+        v_lower, v_upper, cusps, betti, torsion = self._window(mfld)
+        initial_candidate = self._connection.execute(
+            query + ' limit 1',
+            (cusps, betti, torsion, v_lower, v_upper)).fetchone()
+        if initial_candidate is None:
+            return []
+        return self._staged_siblings(mfld)
+
+    def _staged_siblings(self, mfld):
+        conditions = []
+        for column, hash_function in self._hash_tiers:
+            if column not in self.schema:
+                break
+            conditions.append("%s = '%s'" % (column, hash_function(mfld)))
+            query = 'select count(*) from %s where %s' % (
+                self._invariants_table(),
+                ' and '.join([self._filter] + conditions if self._filter
+                             else conditions))
+            if self._connection.execute(query).fetchone()[0] <= 1:
+                return self.find(' and '.join(conditions))
+        conditions.append("hash = '%s'" % self.mfld_hash(mfld))
+        return self.find(' and '.join(conditions))
+
+    def _may_match(self, mfld, extends_to_link):
+        """
+        Cheap tests which show that mfld is not in this table.
+        """
+        if hasattr(mfld, 'volume'):
+            bad_types = ['no solution found', 'not attempted']
+            if mfld.solution_type() in bad_types:
+                return False
+            if mfld.volume() > self._max_volume + 0.1:
+                return False
+
+        if extends_to_link and not (True in mfld.cusp_info('complete?')):
+            return False
+        return True
+
+    def identify(self, mfld, extends_to_link=False):
+        """
+        Look for a manifold in this table which is isometric to the
+        argument.
+
+        Return the matching manifold, if there is one which SnapPea
+        declares to be isometric.
+
+        Return False if no manifold in the table has the same hash.
+
+        Return None in all other cases (for now).
+
+        If the flag "extends_to_link" is True, requires that the isometry
+        sends meridians to meridians.   If the input manifold is closed
+        this will result in no matches being returned.
+        """
+        if not self._may_match(mfld, extends_to_link):
+            return False
+
+        sibs = self.siblings(mfld)
+        if len(sibs) == 0:
+            return False # No hash values match
+
+        return self._identify_sibling(mfld, sibs, extends_to_link)
+
+    def _identify_sibling(self, mfld, sibs, extends_to_link):
+        """
+        Return the manifold in sibs which is isometric to mfld, or
+        False or None as identify does.  If the siblings were found
+        by a partial hash, see siblings, and none is isometric to mfld,
+        the full hash tells whether the answer is False or None.
+        """
+        ans = self._isometric_sibling(mfld, sibs, extends_to_link)
+        if ans is None and self._hash_tiers[0][0] in self.schema:
+            if not self._find_by_hashes([self.mfld_hash(mfld)]):
+                return False
+        return ans
+
+    def _isometric_sibling(self, mfld, sibs, extends_to_link):
+        """
+        Return the manifold in sibs which SnapPea finds to be isometric
+        to mfld, trying up to four randomizations of mfld, or None.
+        """
+        first = mfld = mfld.copy()
+        for i in range(5):
+            if i > 0:
+                mfld = mfld.copy()
+                mfld.randomize()
+            # Check for isometry
+            for N in sibs:
+                try:
+                    if not extends_to_link:
+                        if mfld.is_isometric_to(N):
+                            return N
+                    else:
+                        isoms = mfld.is_isometric_to(N, True)
+                        if True in [i.extends_to_link() for i in isoms]:
+                            return N
+                except RuntimeError:
+                    pass
+
+        mfld = first
+        # Check for identical triangulations.
+        if (False not in mfld.cusp_info('is_complete')) and not extends_to_link:
+            for n in range(100):
+                for N in sibs:
+                    if mfld == N:
+                        return N
+                mfld.randomize()
+
+        return None
+
+    def identify_many(self, manifolds, extends_to_link=False):
+        """
+        Identify each of the given manifolds as with identify, and
+        return the list of results.  The volume windows of all the
+        manifolds are looked up together, and the hash, which is
+        expensive, is only computed for the manifolds with a candidate
+        in their window.  Unless the table has a staged hash, see
+        siblings, the hashes are then looked up together too.
+
+        >>> from snappy import Manifold, OrientableCuspedCensus
+        >>> L = [Manifold('m004'), Manifold('5_2'), Manifold('L14n1234')]
+        >>> OrientableCuspedCensus.identify_many(L)
+        [m004(0,0), m015(0,0), False]
+        """
+        manifolds = list(manifolds)
+        results = [False] * len(manifolds)
+        windows = [(i,) + self._window(mfld)
+                   for i, mfld in enumerate(manifolds)
+                   if self._may_match(mfld, extends_to_link)]
+        candidates = self._windows_with_candidates(windows)
+        if self._hash_tiers[0][0] in self.schema:
+            for i in candidates:
+                sibs = self._staged_siblings(manifolds[i])
+                if sibs:
+                    results[i] = self._identify_sibling(
+                        manifolds[i], sibs, extends_to_link)
+            return results
+        by_hash = collections.OrderedDict()
+        for i in candidates:
+            by_hash.setdefault(self.mfld_hash(manifolds[i]), []).append(i)
+        sibs_by_hash = self._find_by_hashes(list(by_hash))
+        for hash, indices in by_hash.items():
+            sibs = sibs_by_hash.get(hash, [])
+            if sibs:
+                for i in indices:
+                    results[i] = self._isometric_sibling(
+                        manifolds[i], sibs, extends_to_link)
+        return results
+
+    # Number of windows or hashes per query, to stay below the limit on
+    # the number of parameters of an sqlite statement.
+    _query_batch_size = 150
+
+    def _windows_with_candidates(self, windows):
+        """
+        Return the sorted list of the indices of those windows (index,
+        v_lower, v_upper, cusps, betti, torsion) which contain a
+        manifold in this table.
+        """
+        ans = []
+        table = self._invariants_table()
+        for n in range(0, len(windows), self._query_batch_size):
+            batch = windows[n:n + self._query_batch_size]
+            query = (
+                'with windows(k, v_lower, v_upper, cusps, betti, torsion) '
+                'as (values %s) select k from windows where exists '
+                '(select 1 from %s as T where T.cusps=windows.cusps and '
+                'T.betti=windows.betti and T.torsion=windows.torsion and '
+                'T.volume between windows.v_lower and windows.v_upper' %
+                (', '.join(['(?, ?, ?, ?, ?, ?)'] * len(batch)), table))
+            if self._filter:
+                query += ' and %s' % self._filter
+            query += ')'
+            params = [x for window in batch for x in window]
+            ans += [row[0] for row in
+                    self._connection.execute(query, params).fetchall()]
+        return sorted(ans)
+
+    def _find_by_hashes(self, hashes):
+        """
+        Return a dictionary mapping each of the given hashes to the
+        list of manifolds in this table with that hash.
+        """
+        ans = collections.defaultdict(list)
+        for n in range(0, len(hashes), self._query_batch_size):
+            batch = hashes[n:n + self._query_batch_size]
+            query = 'select id, hash from %s where hash in (%s)' % (
+                self._table, ', '.join('?' * len(batch)))
+            if self._filter:
+                query += ' and %s' % self._filter
+            ids = self._connection.execute(
+                query + ' order by id', batch).fetchall()
+            if not ids:
+                continue
+            rows = self._connection.execute(
+                self._select + 'where id in (%s) order by id' %
+                ', '.join(str(id) for id, _ in ids)).fetchall()
+            for (id, hash), row in zip(ids, rows):
+                ans[hash].append(self._manifold_factory(row))
+        return ans
+
+    def random(self):
+        if self._length == 0:
+            raise ValueError('ManifoldTable is empty')
+        if self._ids_contiguous:
+            rand_id = random.randrange(self._min_id, self._max_id + 1)
+            query = self._select + ' where id = %d limit 1' % rand_id
+            cursor = self._connection.execute(query)
+            return self._manifold_factory(cursor.fetchone())
+        return self[random.randrange(len(self))]
+
+# The below function is used to add ManifoldTables defined in external
+# packages.
+
+
+this_module = sys.modules[__name__]
+__all_tables__ = collections.OrderedDict()
+
+
+def add_tables_from_package(package_name, must_succeed=True):
+    """
+    Given a string with the name of an importable Python package that
+    implements a "get_tables" function, load all the tables provided
+    and put the results where the rest of SnapPy can find them.
+    Returns an ordered dictionary of pairs (table_name, table).
+    """
+
+    try:
+        package = importlib.import_module(package_name)
+    except ImportError:
+        if not must_succeed:
+            return {}
+        else:
+            raise ImportError('ManifoldTable package %s not found'
+                              % package_name)
+
+    new_tables = collections.OrderedDict()
+    for table in package.get_tables(ManifoldTable):
+        name = table.__class__.__name__
+        new_tables[name] = table
+        __all_tables__[name] = table
+        setattr(this_module, name, table)
+
+    # We also store the tables here so that their doctests can be
+    # checked.
+    if not hasattr(this_module, '__test__'):
+        this_module.__test__ = {}
+    for name, table in new_tables.items():
+        this_module.__test__[name] = table.__class__
+
+    return new_tables
@@ -0,0 +1,105 @@
+from hashlib import md5
+import array
+import re
+
+
+# Codecs we use.
+def encode_torsion(divisors):
+    return ''.join(chr(x) for x in divisors).encode('utf8')
+
+
+def decode_torsion(utf8):
+    return [ord(x) for x in utf8.decode('utf8')]
+
+
+def encode_matrices(matrices):
+    """
+    Convert a list of 2x2 integer matrices into a sequence of bytes.
+    """
+    # The tricky thing here is converting signed integers to bytes.
+    return bytes(array.array('b', sum(sum(matrices, []), [])).tostring())
+    # NOTE: tostring is deprecated in python3, but for now
+    # it does the same thing as tobytes.
+
+
+def decode_matrices(byteseq):
+    """
+    Convert a sequence of 4n bytes into a list of n 2x2 integer matrices.
+    """
+    m = array.array('b')
+    m.fromstring(byteseq)
+    return [ [ list(m[n:n+2]), list(m[n+2:n+4]) ]
+             for n in range(0, len(m), 4) ]
+
+
+# Some hash functions for manifolds:
+
+def old_basic_hash(mfld, digits=6):
+    return '%%%df' % digits % mfld.volume() + " " + repr(mfld.homology())
+
+
+def basic_hash(mfld, digits=6):
+    if mfld.solution_type() != 'contains degenerate tetrahedra':
+        volume = '%%%df' % digits % mfld.volume()
+    else:
+        volume = 'degenerate'
+    return volume + " " + repr(mfld.homology())
+
+
+def cover_type(mfld):
+    return re.findall("~reg~|~irr~|~cyc~", mfld.name())[-1][1:-1]
+
+
+# The hashes stored in the databases were computed from the covers
+# constructed by the SnapPea kernel, so db_hash keeps doing that rather
+# than using cover_homologies.
+def cover_hash(mfld, degrees):
+    return [ repr(sorted(
+        [(cover_type(C), C.homology())
+             for C in mfld.covers(degree, method='snappea')]
+        )) for degree in degrees ]
+
+
+# Only used for the hash tiers added by dev/database_tools/add_hash_tiers.py,
+# which are computed with this same function, so here the homology of
+# the covers is computed without constructing them.
+def cyclic_cover_hash(mfld, degrees):
+    return [ repr(sorted(
+        mfld.cover_homologies(degree, cover_type='cyclic')
+        )) for degree in degrees ]
+
+
+def old_combined_hash(mfld):
+    hash = str(" &and& ".join([old_basic_hash(mfld)] +
+                              cover_hash(mfld, (2, 3))))
+    return hash.encode('utf8')
+
+
+def combined_hash(mfld):
+    hash = str(" &and& ".join([basic_hash(mfld)] +
+                              cover_hash(mfld, (2, 3))))
+    return hash.encode('utf8')
+
+
+# This one is the hash used in the first version of the database.
+def old_db_hash(mfld):
+    return md5(old_combined_hash(mfld)).hexdigest()
+
+
+# This one is used now.
+def db_hash(mfld):
+    return md5(combined_hash(mfld)).hexdigest()
+
+
+# The first two tiers of the staged hash used by ManifoldTable.siblings
+# for tables with the columns basic_hash and cyclic_hash.  The last
+# tier is db_hash, which also computes the homology of all covers of
+# degree 2 and 3 rather than just the cyclic ones.
+def basic_db_hash(mfld):
+    return md5(basic_hash(mfld).encode('utf8')).hexdigest()
+
+
+def cyclic_db_hash(mfld):
+    hash = str(" &and& ".join([basic_hash(mfld)] +
+                              cyclic_cover_hash(mfld, (2, 3, 4))))
+    return md5(hash.encode('utf8')).hexdigest()
@@ -0,0 +1 @@
+from .computeVerifiedHyperbolicStructure import *
@@ -0,0 +1,5 @@
+trace_max_steps = 300
+
+piece_midpoint_bias = 1.818449629072142
+
+point_perturbation_direction = [0.8466, 0.3176, 0.4268]
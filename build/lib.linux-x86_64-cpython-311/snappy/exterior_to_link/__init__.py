@@ -0,0 +1,2 @@
+from .main import exterior_to_link
+from .exceptions import ExteriorToLinkError, GeneralPositionError
@@ -0,0 +1,6 @@
+class GeneralPositionError(Exception):
+    pass
+
+
+class ExteriorToLinkError(Exception):
+    pass
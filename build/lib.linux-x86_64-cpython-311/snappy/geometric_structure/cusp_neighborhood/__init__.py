@@ -0,0 +1,3 @@
+"""
+Code for cusp neighborhoods.
+"""
@@ -0,0 +1,6 @@
+graph_trace_max_steps = 300
+
+start_point_bias = 1.2498653253
+
+
+
@@ -0,0 +1,2 @@
+# Tiling H^3 or quotients of H^3
+
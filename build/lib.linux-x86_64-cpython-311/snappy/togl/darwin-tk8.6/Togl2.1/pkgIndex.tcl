@@ -0,0 +1,5 @@
+#
+# Tcl package index file
+#
+package ifneeded Togl 2.1 \
+    [list load [file join $dir libTogl2.1.dylib]]
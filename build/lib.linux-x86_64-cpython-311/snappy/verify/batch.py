@@ -0,0 +1,469 @@
+"""
+Certifying hyperbolicity, canonical retriangulations and cusp areas of
+many manifolds with a pool of worker processes.
+
+Each manifold is certified in a worker process which is killed when it
+takes longer than the given timeout. The records can be appended to a
+results file as soon as they are computed so that an interrupted run
+can be resumed. The summary of the records gives the certification
+rate and timings of each task, making regressions visible when
+comparing runs.
+"""
+import collections
+import multiprocessing
+import multiprocessing.connection
+import pickle
+import time
+
+from .. import batch
+from ..sage_helper import SageNotAvailable
+from .precision_ladder import PrecisionLadder
+from .verifyHyperbolicity import (
+    check_logarithmic_gluing_equations_and_positively_oriented_tets)
+from .verifyCanonical import (verified_canonical_retriangulation,
+                              default_interval_bits_precs,
+                              default_exact_bits_prec_and_degrees)
+
+__all__ = ['certify',
+           'summary',
+           'VerifyRecord',
+           'VerifyResult',
+           'TaskSummary',
+           'CertificationSummary']
+
+VerifyRecord = collections.namedtuple('VerifyRecord',
+                                      ['index', 'name', 'results'])
+VerifyRecord.__doc__ = """
+The result of certifying one manifold. The index is the position of the
+manifold in the input and results is a dictionary whose keys are the
+requested tasks and whose values are VerifyResults.
+"""
+
+VerifyResult = collections.namedtuple(
+    'VerifyResult', ['status', 'method', 'bits_prec', 'time', 'value', 'error'])
+VerifyResult.__doc__ = """
+The result of one task for one manifold. The status is one of
+'certified', 'failed' (the verification gave up or raised a
+RuntimeError indicating that it could not certify the result),
+'unavailable' (the task requires Sage), 'error' (any other exception,
+e.g. a value the intervals cannot represent) or 'timeout'. For
+certified results, method and bits_prec are the method and the
+precision that succeeded and value is the certified value as a string
+(or None for hyperbolicity). The time is the wall time in seconds and
+error the exception as a string.
+"""
+
+
+def _hyperbolicity(M, options):
+    bits_precs = options['interval_bits_precs']
+    ladder = PrecisionLadder(M, bits_precs[0], max(bits_precs))
+    ladder.run(
+        lambda shapes: (
+            check_logarithmic_gluing_equations_and_positively_oriented_tets(
+                M, shapes)))
+    return 'intervals', ladder.rungs[-1].bits_prec, None
+
+
+def _canonical(M, options):
+    details = {}
+    K = verified_canonical_retriangulation(
+        M,
+        interval_bits_precs=options['interval_bits_precs'],
+        exact_bits_prec_and_degrees=options['exact_bits_prec_and_degrees'],
+        details=details)
+    if K is None:
+        return None
+    return (details['method'], details['bits_prec'],
+            K.triangulation_isosig(decorated=False))
+
+
+def _cusp_areas(M, options):
+    method = options['cusp_areas_method']
+    error = None
+    for bits_prec in options['interval_bits_precs']:
+        try:
+            areas = M.cusp_areas(method=method, verified=True,
+                                 bits_prec=bits_prec)
+        except (ValueError, RuntimeError) as e:
+            error = e
+        else:
+            return method, bits_prec, str(areas)
+    if error is not None:
+        raise error
+    return None
+
+
+_task_functions = {'hyperbolicity': _hyperbolicity,
+                   'canonical': _canonical,
+                   'cusp_areas': _cusp_areas}
+
+
+def _status_of_exception(e):
+    """
+    The status of a task which raised the given exception, see
+    VerifyResult.  The verifiers raise RuntimeErrors, such as the
+    VerifyErrorBase's, when they cannot certify a result.
+    """
+    if isinstance(e, SageNotAvailable):
+        return 'unavailable'
+    if (isinstance(e, RuntimeError) and
+            not isinstance(e, (NotImplementedError, RecursionError))):
+        return 'failed'
+    return 'error'
+
+
+def _certify_task(M, task, options):
+    start = time.time()
+    status, method, bits_prec, value, error = 'failed', None, None, None, None
+    try:
+        result = _task_functions[task](M, options)
+    except Exception as e:
+        status = _status_of_exception(e)
+        error = '%s: %s' % (type(e).__name__, e)
+    else:
+        if result is not None:
+            status = 'certified'
+            method, bits_prec, value = result
+    return VerifyResult(status, method, bits_prec, time.time() - start,
+                        value, error)
+
+
+def _certify_manifold(task, send):
+    """
+    Certifies the manifold of the given task, sending the messages
+    ('name', name) and ('result', task, VerifyResult) for each task.
+    """
+    index, source, tasks, options = task
+    M = batch._manifold(source)
+    send(('name', M.name()))
+    for task in tasks:
+        send(('result', task, _certify_task(M, task, options)))
+
+
+def _certify_in_process(task):
+    index, source, tasks, options = task
+    results = {}
+
+    def send(message):
+        if message[0] == 'name':
+            results[None] = message[1]
+        else:
+            results[message[1]] = message[2]
+
+    _certify_manifold(task, send)
+    name = results.pop(None)
+    return VerifyRecord(index, name, results)
+
+
+def _work(connection):
+    # The loop of a worker process
+    while True:
+        task = connection.recv()
+        if task is None:
+            return
+        _certify_manifold(task, connection.send)
+        connection.send(('done',))
+
+
+class _Worker:
+    """
+    A worker process and the task it is working on.
+    """
+    def __init__(self):
+        self.connection, child_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_work, args=(child_connection,), daemon=True)
+        self.process.start()
+        child_connection.close()
+        self.task = None
+
+    def start(self, task):
+        self.task = task
+        self.start_time = time.time()
+        self.name = None
+        self.results = {}
+        self.connection.send(task)
+
+    def record(self, status=None, error=None):
+        """
+        The record of the current task, with the given status for the
+        tasks without result.
+        """
+        index, source, tasks, options = self.task
+        name = self.name
+        if name is None and source[0] == 'isosig':
+            name = source[1]
+        elapsed = time.time() - self.start_time
+        for task in tasks:
+            if task not in self.results:
+                self.results[task] = VerifyResult(
+                    status, None, None, elapsed, None, error)
+        self.task = None
+        return VerifyRecord(index, name, self.results)
+
+    def stop(self, kill=False):
+        if not kill and self.process.is_alive():
+            try:
+                self.connection.send(None)
+            except OSError:
+                pass
+            self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+def _certify_with_workers(tasks, processes, timeout):
+    """
+    Yields the records of the given tasks in the order of the tasks,
+    computed by the given number of worker processes.
+    """
+    tasks = iter(tasks)
+    workers = [_Worker() for i in range(processes)]
+    submitted = collections.deque()
+    finished = {}
+    exhausted = False
+    try:
+        while True:
+            for worker in workers:
+                if worker.task is None and not exhausted:
+                    task = next(tasks, None)
+                    if task is None:
+                        exhausted = True
+                    else:
+                        worker.start(task)
+                        submitted.append(task[0])
+
+            while submitted and submitted[0] in finished:
+                yield finished.pop(submitted.popleft())
+
+            busy = [worker for worker in workers if worker.task is not None]
+            if not busy:
+                return
+
+            if timeout is None:
+                wait_time = None
+            else:
+                deadline = min(worker.start_time for worker in busy) + timeout
+                wait_time = max(0, deadline - time.time())
+            ready = multiprocessing.connection.wait(
+                [worker.connection for worker in busy], wait_time)
+
+            for i, worker in enumerate(workers):
+                if worker.task is None:
+                    continue
+                index = worker.task[0]
+                if worker.connection in ready:
+                    try:
+                        message = worker.connection.recv()
+                    except EOFError:
+                        finished[index] = worker.record(
+                            'error', 'The worker process died.')
+                        worker.stop(kill=True)
+                        workers[i] = _Worker()
+                        continue
+                    if message[0] == 'name':
+                        worker.name = message[1]
+                    elif message[0] == 'result':
+                        worker.results[message[1]] = message[2]
+                    else:
+                        finished[index] = worker.record()
+                elif (timeout is not None and
+                      time.time() - worker.start_time >= timeout):
+                    finished[index] = worker.record('timeout')
+                    worker.stop(kill=True)
+                    workers[i] = _Worker()
+    finally:
+        for worker in workers:
+            worker.stop(kill=worker.task is not None)
+
+
+def certify(manifolds, tasks=('hyperbolicity',), processes=None,
+            timeout=None, results_file=None,
+            interval_bits_precs=default_interval_bits_precs,
+            exact_bits_prec_and_degrees=default_exact_bits_prec_and_degrees,
+            cusp_areas_method='maximal',
+            retry=('timeout', 'error', 'unavailable')):
+    """
+    Certifies each manifold in a census, ManifoldTable or other iterable
+    of manifolds using a pool of worker processes and yields a
+    VerifyRecord for each manifold in the order of the input.
+
+    The tasks are any of:
+
+    - ``'hyperbolicity'``: verify hyperbolicity using a
+      :py:class:`PrecisionLadder` from the first to the largest of
+      ``interval_bits_precs``.
+    - ``'canonical'``: compute the verified canonical retriangulation
+      using ``interval_bits_precs`` and ``exact_bits_prec_and_degrees``,
+      see :py:meth:`verified_canonical_retriangulation`. The value is
+      its isomorphism signature.
+    - ``'cusp_areas'``: compute verified cusp areas using the given
+      ``cusp_areas_method``, trying each of ``interval_bits_precs``.
+
+    For example::
+
+        >>> from snappy import OrientableCuspedCensus
+        >>> from snappy.verify import batch
+        >>> records = list(batch.certify(OrientableCuspedCensus[:3], processes=2)) #doctest: +FLINT
+        >>> for record in records: #doctest: +FLINT
+        ...     result = record.results['hyperbolicity']
+        ...     print(record.index, record.name, result.status, result.method, result.bits_prec)
+        0 m003 certified intervals 53
+        1 m004 certified intervals 53
+        2 m006 certified intervals 53
+
+    If timeout is given, a worker process taking longer than timeout
+    seconds for a manifold is killed and the status of the remaining
+    tasks is 'timeout'::
+
+        >>> from snappy import Manifold
+        >>> M = Manifold('m004').covers(50, cover_type='cyclic')[0]
+        >>> record, = batch.certify([M], timeout=0.001) #doctest: +FLINT
+        >>> record.results['hyperbolicity'].status #doctest: +FLINT
+        'timeout'
+
+    If results_file is given, each record is appended to that file as
+    soon as it has been computed. Calling certify again with the same
+    manifolds and results_file will only certify the manifolds missing
+    from the file, or the tasks missing from their records or whose
+    status is in retry, so an interrupted computation can be resumed,
+    e.g. with a longer timeout::
+
+        >>> import os, tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), 'results.pickle')
+        >>> M = Manifold('m004')
+        >>> record, = batch.certify([M], results_file=path, timeout=0) #doctest: +FLINT
+        >>> record.results['hyperbolicity'].status #doctest: +FLINT
+        'timeout'
+        >>> record, = batch.certify([M], results_file=path) #doctest: +FLINT
+        >>> record.results['hyperbolicity'].status #doctest: +FLINT
+        'certified'
+
+    Use :py:func:`summary` to summarize the records.
+
+    With processes=1 and no timeout, everything is computed in the
+    current process.
+    """
+    tasks = [tasks] if isinstance(tasks, str) else list(tasks)
+    for task in tasks:
+        if task not in _task_functions:
+            raise ValueError("Unknown task %r, the tasks are %s." % (
+                task, ', '.join(_task_functions)))
+    options = {'interval_bits_precs': interval_bits_precs,
+               'exact_bits_prec_and_degrees': exact_bits_prec_and_degrees,
+               'cusp_areas_method': cusp_areas_method}
+
+    previous = batch._load_results(results_file) if results_file else {}
+    remaining = {index: [task for task in tasks
+                         if task not in record.results or
+                         record.results[task].status in retry]
+                 for index, record in previous.items()}
+    done = {index: record for index, record in previous.items()
+            if not remaining[index]}
+    pending = ((index, source, remaining.get(index, tasks), options)
+               for index, source in batch._sources(manifolds)
+               if index not in done)
+    output = open(results_file, 'ab') if results_file else None
+    try:
+        if processes == 1 and timeout is None:
+            records = (_certify_in_process(task) for task in pending)
+        else:
+            records = _certify_with_workers(
+                pending, processes or multiprocessing.cpu_count(), timeout)
+        finished = sorted(done)
+        for record in records:
+            while finished and finished[0] < record.index:
+                yield done[finished.pop(0)]
+            if record.index in previous:
+                results = dict(previous[record.index].results)
+                results.update(record.results)
+                record = record._replace(results=results)
+            if output:
+                pickle.dump(record, output)
+                output.flush()
+            yield record
+        for index in finished:
+            yield done[index]
+    finally:
+        if output:
+            output.close()
+
+
+class TaskSummary(collections.namedtuple(
+        'TaskSummary',
+        ['task', 'statuses', 'methods', 'total_time', 'max_time'])):
+    """
+    The summary of one task in a CertificationSummary. The statuses and
+    methods are Counters of the statuses and of the pairs (method,
+    bits_prec) of the certified results. The times are in seconds.
+    """
+    __slots__ = ()
+
+    @property
+    def num_manifolds(self):
+        return sum(self.statuses.values())
+
+    @property
+    def rate(self):
+        """
+        The fraction of the manifolds for which the task was certified.
+        """
+        if not self.num_manifolds:
+            return 0.0
+        return self.statuses['certified'] / self.num_manifolds
+
+
+class CertificationSummary(dict):
+    """
+    The TaskSummary of each task, see summary. Printing it gives a table
+    suitable for comparing runs.
+    """
+    def __str__(self):
+        lines = ['%-14s %9s %10s %7s %7s %8s %11s %10s %9s' % (
+            'task', 'manifolds', 'certified', 'failed', 'errors',
+            'timeouts', 'unavailable', 'total time', 'max time')]
+        for task, s in self.items():
+            lines.append('%-14s %9d %9.1f%% %7d %7d %8d %11d %9.2fs %8.2fs' % (
+                task, s.num_manifolds, 100 * s.rate, s.statuses['failed'],
+                s.statuses['error'], s.statuses['timeout'],
+                s.statuses['unavailable'], s.total_time, s.max_time))
+            for (method, bits_prec), count in sorted(s.methods.items()):
+                lines.append('    %s, %d bits: %d' % (method, bits_prec, count))
+        return '\n'.join(lines)
+
+
+def summary(records):
+    """
+    Summarizes the VerifyRecords computed by certify (or loaded from a
+    results file)::
+
+        >>> from snappy import OrientableCuspedCensus
+        >>> from snappy.verify import batch
+        >>> records = batch.certify(OrientableCuspedCensus[:10], processes=2)
+        >>> s = batch.summary(records) #doctest: +FLINT
+        >>> s['hyperbolicity'].num_manifolds, s['hyperbolicity'].rate #doctest: +FLINT
+        (10, 1.0)
+        >>> s['hyperbolicity'].methods #doctest: +FLINT
+        Counter({('intervals', 53): 10})
+        >>> print(s) #doctest: +SKIP
+        task           manifolds  certified  failed  errors timeouts unavailable total time  max time
+        hyperbolicity         10     100.0%       0       0        0           0     0.05s     0.01s
+            intervals, 53 bits: 10
+    """
+    statuses = collections.defaultdict(collections.Counter)
+    methods = collections.defaultdict(collections.Counter)
+    total_times = collections.defaultdict(float)
+    max_times = collections.defaultdict(float)
+    for record in records:
+        for task, result in record.results.items():
+            statuses[task][result.status] += 1
+            if result.status == 'certified':
+                methods[task][result.method, result.bits_prec] += 1
+            total_times[task] += result.time
+            max_times[task] = max(max_times[task], result.time)
+    return CertificationSummary(
+        (task, TaskSummary(task, statuses[task], methods[task],
+                           total_times[task], max_times[task]))
+        for task in statuses)
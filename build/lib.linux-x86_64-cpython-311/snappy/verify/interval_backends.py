@@ -0,0 +1,136 @@
+"""
+Choice of the interval arithmetic used by the verified computations.
+
+The verified computations use the interval types returned by
+interval_backend(), which are either Sage's (RealIntervalField,
+ComplexIntervalField, ...) or those of flint_helper.py wrapping the arb
+and acb balls of python-flint.  Inside Sage, the default is Sage's.
+Outside of Sage, python-flint is used if it is installed, so that the
+verified shapes, hyperbolicity and volume also work in plain Python.
+
+>>> previous = interval_backend().name    #doctest: +FLINT
+>>> set_interval_backend('flint')         #doctest: +FLINT
+>>> M = Manifold('m015')                  #doctest: +FLINT
+>>> M.verify_hyperbolicity()[0]           #doctest: +FLINT
+True
+>>> vol = M.volume(verified=True)         #doctest: +FLINT
+>>> vol.parent(), abs(vol - 2.828122088330783) < 1e-12   #doctest: +FLINT
+(Real Interval Field with 53 bits of precision, True)
+
+The holonomy and the verified cusp areas, shapes and translations still
+require Sage's intervals.
+
+>>> M.verify_hyperbolicity(holonomy=True)  #doctest: +FLINT
+Traceback (most recent call last):
+   ...
+snappy.sage_helper.SageNotAvailable: Sorry, holonomy=True requires using SnapPy inside Sage.
+>>> M.cusp_areas(verified=True)            #doctest: +FLINT
+Traceback (most recent call last):
+   ...
+snappy.sage_helper.SageNotAvailable: Sorry, this verified computation requires using SnapPy inside Sage.
+>>> set_interval_backend(previous)        #doctest: +FLINT
+"""
+
+from ..sage_helper import _within_sage, SageNotAvailable
+from .. import flint_helper
+
+import functools
+
+__all__ = ['interval_backend',
+           'set_interval_backend',
+           'available_interval_backends']
+
+
+class IntervalBackend():
+    """
+    The constructors used by the verified computations.
+    """
+    def __init__(self, name, RealIntervalField, ComplexIntervalField,
+                 ComplexDoubleField, matrix, vector):
+        self.name = name
+        self.RealIntervalField = RealIntervalField
+        self.ComplexIntervalField = ComplexIntervalField
+        self.ComplexDoubleField = ComplexDoubleField
+        self.matrix = matrix
+        self.vector = vector
+
+    def __repr__(self):
+        return 'IntervalBackend(%r)' % self.name
+
+
+_backends = {}
+
+if _within_sage:
+    from sage.rings.complex_interval_field import ComplexIntervalField
+    from sage.rings.real_mpfi import RealIntervalField
+    from sage.all import ComplexDoubleField, matrix
+    from sage.modules.free_module_element import vector
+
+    _backends['sage'] = IntervalBackend(
+        'sage', RealIntervalField, ComplexIntervalField,
+        ComplexDoubleField, matrix, vector)
+
+if flint_helper._within_flint:
+    _backends['flint'] = IntervalBackend(
+        'flint',
+        flint_helper.RealIntervalField,
+        flint_helper.ComplexIntervalField,
+        flint_helper.ComplexDoubleField,
+        flint_helper.matrix,
+        flint_helper.vector)
+
+_current_backend = (_backends.get('sage') or _backends.get('flint'))
+
+
+def available_interval_backends():
+    """
+    The names of the interval backends that can be used here.
+    """
+    return list(_backends)
+
+
+def interval_backend():
+    """
+    The interval backend currently used for verified computations.
+    """
+    if _current_backend is None:
+        raise SageNotAvailable(
+            'Sorry, this feature requires using SnapPy inside Sage '
+            'or installing python-flint.')
+    return _current_backend
+
+
+def set_interval_backend(name):
+    """
+    Use the given interval backend ('sage' or 'flint') for the verified
+    computations from now on.
+    """
+    global _current_backend
+    if name not in _backends:
+        raise ValueError(
+            "The interval backend '%s' is not available here, the available "
+            "ones are %s." % (name, available_interval_backends()))
+    _current_backend = _backends[name]
+
+
+def require_sage_intervals(feature):
+    """
+    Raises SageNotAvailable unless the verified computations use Sage's
+    intervals.  Used by the verified features that have not been ported
+    to the flint backend.
+    """
+    if interval_backend().name != 'sage':
+        raise SageNotAvailable(
+            'Sorry, %s requires using SnapPy inside Sage.' % feature)
+
+
+def interval_method(function):
+    """
+    Analogous to sage_method, for functions that work with any interval
+    backend.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        interval_backend()
+        return function(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,255 @@
+"""
+Certifying the shapes of a manifold with interval arithmetic of
+increasing precision.
+
+Instead of starting from scratch for each precision, the PrecisionLadder
+computes the gluing equations used by Newton's method and the Krawczyk
+test once, polishes the shapes starting from the shapes of the previous
+precision and reuses the approximate inverse of the derivative. When a
+precision fails, the next precision is chosen from the widths of the
+intervals observed.
+"""
+
+import collections
+import math
+import time
+
+from .. import snap
+from ..math_basics import is_RealIntervalFieldElement
+from . import exceptions
+from .interval_backends import interval_method
+from .krawczyk_shapes_engine import KrawczykShapesEngine
+
+__all__ = ['PrecisionLadder', 'PrecisionRung']
+
+PrecisionRung = collections.namedtuple('PrecisionRung',
+                                       ['bits_prec', 'timings', 'error'])
+PrecisionRung.__doc__ = """
+The result of trying one precision of a PrecisionLadder. The timings
+are a dictionary of the seconds spent on computing the gluing equations
+(only for the first precision), polishing the shapes, setting up the
+KrawczykShapesEngine, doing the Krawczyk iterations and checking the
+certified shapes. The error is the exception that made this precision
+fail or None.
+"""
+
+
+def _lost_bits(bits_prec, interval):
+    """
+    The number of bits of the precision that did not make it into the
+    given real or complex interval computed with that precision, that is
+    the precision minus log2 of the ratio of the absolute value of the
+    midpoint to the width. Returns None if this cannot be determined.
+    """
+    if is_RealIntervalFieldElement(interval):
+        magnitude = abs(float(interval.center()))
+        width = float(interval.absolute_diameter())
+    else:
+        magnitude = abs(complex(interval.center()))
+        width = max(float(interval.real().absolute_diameter()),
+                    float(interval.imag().absolute_diameter()))
+    if not (math.isfinite(width) and math.isfinite(magnitude)):
+        return None
+    if width == 0:
+        return 0
+    if magnitude == 0:
+        return None
+    return bits_prec - math.log2(magnitude / width)
+
+
+def _max_lost_bits(bits_prec, intervals):
+    """
+    The maximum of _lost_bits for the given intervals or None if it
+    could not be determined for any of them.
+    """
+    lost_bits = [ _lost_bits(bits_prec, interval) for interval in intervals ]
+    lost_bits = [ lost for lost in lost_bits if lost is not None ]
+    if not lost_bits:
+        return None
+    return int(math.ceil(max(lost_bits)))
+
+
+def _intervals_of_failure(error, engine):
+    """
+    The intervals whose widths indicate how much the precision needs to
+    be increased after the given exception.
+    """
+    if isinstance(error,
+                  exceptions.ShapePositiveImaginaryPartNumericalVerifyError):
+        return [ error.value.imag() ]
+    if isinstance(error, exceptions.NumericalVerifyError):
+        value = getattr(error, 'value', None)
+        return [] if value is None else [ value ]
+    if engine is None or engine.expanded_shapes is None:
+        return []
+    return list(engine.expanded_shapes)
+
+
+class PrecisionLadder:
+    """
+    Runs a check on certified shape intervals of an orientable or
+    non-orientable manifold, trying precisions from min_bits_prec up to
+    max_bits_prec until the check succeeds::
+
+        sage: from snappy import Manifold
+        sage: M = Manifold("m019")
+        sage: ladder = PrecisionLadder(M, 53, 212)
+        sage: shapes = ladder.run(lambda shapes: shapes)
+        sage: shapes[2] # doctest: +NUMERIC12
+        0.460021175573718? + 0.632624193605256?*I
+        sage: [ (rung.bits_prec, rung.error) for rung in ladder.rungs ]
+        [(53, None)]
+
+    The check is a function taking the list of certified shape intervals.
+    Its result is returned. If it raises a RuntimeError (such as a
+    NumericalVerifyError) or the shapes could not be certified, the next
+    precision is tried. The exception is re-raised if max_bits_prec was
+    tried or if the check failed even though the intervals involved were
+    accurate to more than half of the bits, so that a higher precision
+    would not help::
+
+        sage: from snappy.verify import check_logarithmic_gluing_equations_and_positively_oriented_tets as check
+        sage: M = Manifold("t02774")
+        sage: ladder = PrecisionLadder(M, 53, 1000)
+        sage: ladder.run(lambda shapes: check(M, shapes)) # doctest: +IGNORE_EXCEPTION_DETAIL
+        Traceback (most recent call last):
+        ...
+        ShapePositiveImaginaryPartNumericalVerifyError: Numerical verification that shape has positive imaginary part has failed: Im(0.4800996900657? - 0.0019533695046?*I) > 0
+        sage: len(ladder.rungs)
+        1
+
+    The next precision is chosen from the widths of the intervals of the
+    failure: if an interval computed with p bits has a relative width of
+    2^-k, then p - k bits were lost. The next precision is p plus the
+    lost bits, so that the interval would be accurate to p bits if the
+    same number of bits was lost again, but at least twice p.
+
+    Here the shapes of the 50-fold cyclic cover of m004 cannot be
+    certified with 53 bits::
+
+        sage: M = Manifold("m004").covers(50, cover_type='cyclic')[0]
+        sage: ladder = PrecisionLadder(M, 53, 1000)
+        sage: shapes = ladder.run(lambda shapes: shapes)
+        sage: len(shapes)
+        100
+        sage: [ (rung.bits_prec, type(rung.error).__name__) for rung in ladder.rungs ]
+        [(53, 'RuntimeError'), (106, 'NoneType')]
+
+    Set verbose to True to print the timings of each precision.
+    """
+
+    @interval_method
+    def __init__(self, manifold, min_bits_prec=53, max_bits_prec=212,
+                 verbose=False):
+        # The extensions in snap and verify need an orientable manifold.
+        # Thus work in the orientation cover and use every other shape
+        # as Manifold.tetrahedra_shapes does.
+        self.manifold = manifold
+        if manifold.is_orientable():
+            self._orientable_manifold = manifold
+        else:
+            self._orientable_manifold = manifold.orientation_cover()
+        self.min_bits_prec = min_bits_prec
+        self.max_bits_prec = max(min_bits_prec, max_bits_prec)
+        self.verbose = verbose
+        self.rungs = []
+        self._equations = None
+        self._engine = None
+
+    def next_bits_prec(self, bits_prec, intervals):
+        """
+        The precision to try after the given precision failed with the
+        given intervals, see the class description.
+        """
+        lost = _max_lost_bits(bits_prec, intervals)
+        if lost is None:
+            lost = bits_prec
+        return min(bits_prec + max(lost, bits_prec), self.max_bits_prec)
+
+    def certified_shapes(self, bits_prec, timings=None):
+        """
+        Returns shape intervals with the given precision that are
+        certified to contain a solution to the rectangular gluing
+        equations or raises a RuntimeError.
+
+        The timings of the steps are stored in the given dictionary.
+        """
+        if timings is None:
+            timings = {}
+        M = self._orientable_manifold
+
+        if self._equations is None:
+            start = time.time()
+            self._equations = snap.shapes.enough_gluing_equations(M)
+            timings['equations'] = time.time() - start
+
+        start = time.time()
+        shapes = snap.polished_tetrahedra_shapes(
+            M, bits_prec=bits_prec, ignore_solution_type=True,
+            equations=self._equations)
+        timings['shapes'] = time.time() - start
+
+        start = time.time()
+        if self._engine is None:
+            self._engine = KrawczykShapesEngine(
+                M, shapes, bits_prec=bits_prec, equations=self._equations)
+        else:
+            self._engine = self._engine.with_initial_shapes(
+                shapes, bits_prec=bits_prec)
+        timings['engine'] = time.time() - start
+
+        start = time.time()
+        certified = self._engine.expand_until_certified()
+        timings['krawczyk'] = time.time() - start
+        if not certified:
+            raise RuntimeError('Could not certify shape intervals, either '
+                               'there are degenerate shapes or the '
+                               'precision must be increased.')
+
+        shapes = list(self._engine.certified_shapes)
+        if M is self.manifold:
+            return shapes
+        return shapes[::2]
+
+    def run(self, check):
+        """
+        Tries increasing precisions until the check succeeds and returns
+        its result, see the class description.
+        """
+        bits_prec = self.min_bits_prec
+        while True:
+            timings = {}
+            try:
+                shapes = self.certified_shapes(bits_prec, timings)
+                start = time.time()
+                try:
+                    result = check(shapes)
+                finally:
+                    timings['check'] = time.time() - start
+            except RuntimeError as e:
+                self._add_rung(bits_prec, timings, e)
+                if bits_prec >= self.max_bits_prec:
+                    raise
+                intervals = _intervals_of_failure(e, self._engine)
+                if isinstance(e, exceptions.NumericalVerifyError):
+                    # A verification failing even though the intervals
+                    # are accurate to more than half of the bits (e.g., a
+                    # shape with provably negative imaginary part) cannot
+                    # be fixed by increasing the precision.
+                    lost = _max_lost_bits(bits_prec, intervals)
+                    if lost is not None and lost < bits_prec / 2:
+                        raise
+                bits_prec = self.next_bits_prec(bits_prec, intervals)
+            else:
+                self._add_rung(bits_prec, timings, None)
+                return result
+
+    def _add_rung(self, bits_prec, timings, error):
+        rung = PrecisionRung(bits_prec, timings, error)
+        self.rungs.append(rung)
+        if self.verbose:
+            print('Precision %d bits: %s: %s' % (
+                bits_prec,
+                ', '.join('%s %.3fs' % item for item in timings.items()),
+                'success' if error is None else
+                '%s: %s' % (type(error).__name__, error)))
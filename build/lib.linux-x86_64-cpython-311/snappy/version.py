@@ -0,0 +1,2 @@
+version = '3.1.1'
+release_date = 'June 2023'
@@ -0,0 +1,68 @@
+/* Generated by Cython 3.0.12 */
+
+#ifndef __PYX_HAVE__SnapPy
+#define __PYX_HAVE__SnapPy
+
+#include "Python.h"
+
+#ifndef __PYX_HAVE_API__SnapPy
+
+#ifdef CYTHON_EXTERN_C
+    #undef __PYX_EXTERN_C
+    #define __PYX_EXTERN_C CYTHON_EXTERN_C
+#elif defined(__PYX_EXTERN_C)
+    #ifdef _MSC_VER
+    #pragma message ("Please do not define the '__PYX_EXTERN_C' macro externally. Use 'CYTHON_EXTERN_C' instead.")
+    #else
+    #warning Please do not define the '__PYX_EXTERN_C' macro externally. Use 'CYTHON_EXTERN_C' instead.
+    #endif
+#else
+  #ifdef __cplusplus
+    #define __PYX_EXTERN_C extern "C"
+  #else
+    #define __PYX_EXTERN_C extern
+  #endif
+#endif
+
+#ifndef DL_IMPORT
+  #define DL_IMPORT(_T) _T
+#endif
+
+__PYX_EXTERN_C PyObject *UCS2_hack(char *, Py_ssize_t, char *);
+__PYX_EXTERN_C void uFatalError(const char*, const char*);
+__PYX_EXTERN_C void uLongComputationBegins(const char*, Boolean);
+__PYX_EXTERN_C FuncResult uLongComputationContinues(void);
+__PYX_EXTERN_C void uLongComputationEnds(void);
+__PYX_EXTERN_C void uAcknowledge(const char*);
+__PYX_EXTERN_C void uAbortMemoryFull(void);
+__PYX_EXTERN_C int uQuery(const char*, const int, const char* *, const int);
+
+__PYX_EXTERN_C int SnapPy_test_flag;
+
+#endif /* !__PYX_HAVE_API__SnapPy */
+
+/* WARNING: the interface of the module init function changed in CPython 3.5. */
+/* It now returns a PyModuleDef instance instead of a PyModule instance. */
+
+#if PY_MAJOR_VERSION < 3
+PyMODINIT_FUNC initSnapPy(void);
+#else
+/* WARNING: Use PyImport_AppendInittab("SnapPy", PyInit_SnapPy) instead of calling PyInit_SnapPy directly from Python 3.5 */
+PyMODINIT_FUNC PyInit_SnapPy(void);
+
+#if PY_VERSION_HEX >= 0x03050000 && (defined(__GNUC__) || defined(__clang__) || defined(_MSC_VER) || (defined(__cplusplus) && __cplusplus >= 201402L))
+#if defined(__cplusplus) && __cplusplus >= 201402L
+[[deprecated("Use PyImport_AppendInittab(\"SnapPy\", PyInit_SnapPy) instead of calling PyInit_SnapPy directly.")]] inline
+#elif defined(__GNUC__) || defined(__clang__)
+__attribute__ ((__deprecated__("Use PyImport_AppendInittab(\"SnapPy\", PyInit_SnapPy) instead of calling PyInit_SnapPy directly."), __unused__)) __inline__
+#elif defined(_MSC_VER)
+__declspec(deprecated("Use PyImport_AppendInittab(\"SnapPy\", PyInit_SnapPy) instead of calling PyInit_SnapPy directly.")) __inline
+#endif
+static PyObject* __PYX_WARN_IF_PyInit_SnapPy_INIT_CALLED(PyObject* res) {
+  return res;
+}
+#define PyInit_SnapPy() __PYX_WARN_IF_PyInit_SnapPy_INIT_CALLED(PyInit_SnapPy())
+#endif
+#endif
+
+#endif /* !__PYX_HAVE__SnapPy */
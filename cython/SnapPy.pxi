@@ -23,6 +23,8 @@ cdef extern from "stdlib.h":
 
 cdef extern from "string.h":
     char* strncpy(char* dst, char* src, size_t len)
+    void* memcpy(void* dst, const void* src, size_t len) nogil
+    int memcmp(const void* s1, const void* s2, size_t len) nogil
 
 # SnapPea declarations
 
@@ -132,6 +134,13 @@ cdef extern from "SnapPea.h":
         int num_torsion_coefficients
         long int *torsion_coefficients
     ctypedef struct c_GroupPresentation "GroupPresentation"
+    ctypedef struct FGSimplificationProgress:
+        int num_moves
+        int num_generators
+        int num_relations
+        int total_length
+        int longest_relation
+    ctypedef Boolean (*FGSimplificationMonitor)(void *monitor_data, const FGSimplificationProgress *progress)
     ctypedef struct c_SymmetryGroup "SymmetryGroup"
     ctypedef struct SymmetryGroupPresentation
     ctypedef struct IsometryList
@@ -446,14 +455,19 @@ cdef extern from "unix_kit.h":
     extern c_Triangulation *DT_int_to_triangulation(int aNumCrossings, int *aDTCode)
     extern void save_triangulation(c_Triangulation *manifold, char *file_name)
 
+# The kernel functions marked nogil below can run with the GIL released,
+# so that several threads can work on independent triangulations at once.
+# The callbacks in core/basic.pyx that they may invoke (uFatalError,
+# uLongComputationContinues, ...) reacquire the GIL themselves.
+
 cdef extern from "SnapPea.h":
     extern void expand_abelian_group(c_AbelianGroup *g) except *
     extern void compress_abelian_group(c_AbelianGroup *g) except *
     extern void free_abelian_group(c_AbelianGroup *g) except *
-    extern c_FuncResult canonize(c_Triangulation *manifold) except *
-    extern c_FuncResult proto_canonize(c_Triangulation *manifold) except *
-    extern void canonical_retriangulation(c_Triangulation *manifold) except *
-    extern void canonical_retriangulation_with_opacities(c_Triangulation *manifold, Boolean *opacities) except *
+    extern c_FuncResult canonize(c_Triangulation *manifold) except * nogil
+    extern c_FuncResult proto_canonize(c_Triangulation *manifold) except * nogil
+    extern void canonical_retriangulation(c_Triangulation *manifold) except * nogil
+    extern void canonical_retriangulation_with_opacities(c_Triangulation *manifold, Boolean *opacities) except * nogil
     extern Boolean is_canonical_triangulation(c_Triangulation *manifold) except *
     extern c_FuncResult change_peripheral_curves( c_Triangulation *manifold, MatrixInt22 change_matrices[]) except *
     extern void peripheral_curves(c_Triangulation *manifold)
@@ -478,7 +492,7 @@ cdef extern from "SnapPea.h":
     extern Complex complex_volume(c_Triangulation *manifold, char** err_msg, int* precision) except *
     extern Boolean appears_rational(Real x0, Real x1, Real confidence, long *num, long *den) except *
     extern void core_geodesic(c_Triangulation *manifold, int cusp_index, int *singularity_index, Complex *core_length, int *precision) except *
-    extern c_Triangulation *construct_cover(c_Triangulation *base_manifold, RepresentationIntoSn *representation, int n) except *
+    extern c_Triangulation *construct_cover(c_Triangulation *base_manifold, RepresentationIntoSn *representation, int n) except * nogil
     extern void current_curve_basis(c_Triangulation *manifold, int cusp_index, MatrixInt22 basis_change) except *
     extern void install_current_curve_bases(c_Triangulation *manifold) except *
     extern c_CuspNeighborhoods *initialize_cusp_neighborhoods(c_Triangulation *manifold) except *
@@ -502,8 +516,8 @@ cdef extern from "SnapPea.h":
     extern CuspNbhdSegmentList *get_cusp_neighborhood_triangulation(c_CuspNeighborhoods *cusp_neighborhoods, int cusp_index) except *
     extern CuspNbhdSegmentList *get_cusp_neighborhood_Ford_domain(c_CuspNeighborhoods *cusp_neighborhoods, int cusp_index) except *
     extern void free_cusp_neighborhood_segment_list(CuspNbhdSegmentList *segment_list) except *
-    extern WEPolyhedron *Dirichlet(c_Triangulation *manifold, double vertex_epsilon, Boolean centroid_at_origin, DirichletInteractivity interactivity, Boolean maximize_injectivity_radius) except *
-    extern WEPolyhedron *Dirichlet_with_displacement(c_Triangulation *manifold, double displacement[3], double vertex_epsilon, Boolean centroid_at_origin, DirichletInteractivity interactivity, Boolean maximize_injectivity_radius, Boolean include_words) except *
+    extern WEPolyhedron *Dirichlet(c_Triangulation *manifold, double vertex_epsilon, Boolean centroid_at_origin, DirichletInteractivity interactivity, Boolean maximize_injectivity_radius) except * nogil
+    extern WEPolyhedron *Dirichlet_with_displacement(c_Triangulation *manifold, double displacement[3], double vertex_epsilon, Boolean centroid_at_origin, DirichletInteractivity interactivity, Boolean maximize_injectivity_radius, Boolean include_words) except * nogil
     extern WEPolyhedron *Dirichlet_from_generators(O31Matrix generators[], int num_generators, double vertex_epsilon, DirichletInteractivity interactivity, Boolean maximize_injectivity_radius) except *
     extern WEPolyhedron *Dirichlet_from_generators_with_displacement(O31Matrix generators[], int num_generators, double displacement[3], double vertex_epsilon, DirichletInteractivity interactivity, Boolean maximize_injectivity_radius, Boolean include_words) except *
     extern void change_basepoint(WEPolyhedron **polyhedron, c_Triangulation *manifold, O31Matrix *generators, int num_generators, double displacement[3], double vertex_epsilon, Boolean centroid_at_origin, DirichletInteractivity interactivity, Boolean maximize_injectivity_radius) except *
@@ -523,6 +537,7 @@ cdef extern from "SnapPea.h":
     extern Boolean cusp_is_fillable(c_Triangulation *manifold, int cusp_index) except *
     extern Boolean is_closed_manifold(c_Triangulation *manifold) except *
     extern c_GroupPresentation *fundamental_group(c_Triangulation *manifold, Boolean simplify_presentation, Boolean fillings_may_affect_generators, Boolean minimize_number_of_generators, Boolean try_hard_to_shorten_relators) except *
+    extern c_GroupPresentation *fundamental_group_with_monitor(c_Triangulation *manifold, Boolean simplify_presentation, Boolean fillings_may_affect_generators, Boolean minimize_number_of_generators, Boolean try_hard_to_shorten_relators, FGSimplificationMonitor monitor, void *monitor_data) except *
     extern c_GroupPresentation *compute_unsimplified_presentation(c_Triangulation *manifold) except *
     extern int fg_get_num_generators(c_GroupPresentation *group) except *
     extern int fg_get_num_orig_gens(c_GroupPresentation *group) except *
@@ -541,9 +556,9 @@ cdef extern from "SnapPea.h":
     extern c_AbelianGroup *homology_from_fundamental_group(c_GroupPresentation *group) except *
     extern void homology_presentation(c_Triangulation *manifold, RelationMatrix *relation_matrix) except *
     extern void free_relations(RelationMatrix *relation_matrix) except *
-    extern c_SolutionType find_complete_hyperbolic_structure(c_Triangulation *manifold) except *
+    extern c_SolutionType find_complete_hyperbolic_structure(c_Triangulation *manifold) except * nogil
     extern void remove_hyperbolic_structures(c_Triangulation *manifold) except *
-    extern c_SolutionType do_Dehn_filling(c_Triangulation *manifold) except *
+    extern c_SolutionType do_Dehn_filling(c_Triangulation *manifold) except * nogil
     extern c_SolutionType remove_Dehn_fillings(c_Triangulation *manifold) except *
     extern Real index_to_hue(int index) except *
     extern Real horoball_hue(int index) except *
@@ -564,7 +579,7 @@ cdef extern from "SnapPea.h":
     extern void get_holonomy(c_Triangulation *manifold, int cusp_index, Complex *meridional_holonomy, Complex *longitudinal_holonomy, int *meridional_precision, int *longitudinal_precision) except *
     extern void get_tet_shape(c_Triangulation *manifold, int which_tet, c_FillingStatus which_solution, Boolean fixed_alignment, Real *shape_rect_real, Real *shape_rect_imag, Real *shape_log_real, Real *shape_log_imag, int *precision_rect_real, int *precision_rect_imag, int *precision_log_real, int *precision_log_imag, Boolean *is_geometric) except *
     extern int get_num_edge_classes(c_Triangulation *manifold, int edge_class_order, Boolean greater_than_or_equal) except *
-    extern c_FuncResult compute_isometries(c_Triangulation *manifold0, c_Triangulation *manifold1, Boolean *are_isometric, IsometryList **isometry_list, IsometryList **isometry_list_of_links) except *
+    extern c_FuncResult compute_isometries(c_Triangulation *manifold0, c_Triangulation *manifold1, Boolean *are_isometric, IsometryList **isometry_list, IsometryList **isometry_list_of_links) except * nogil
     extern void compute_cusped_isomorphisms(c_Triangulation *manifold0, c_Triangulation *manifold1, IsometryList **isometry_list, IsometryList **isometry_list_of_links)
     extern int isometry_list_size(IsometryList *isometry_list) except *
     extern int isometry_list_num_cusps(IsometryList *isometry_list) except *
@@ -573,7 +588,7 @@ cdef extern from "SnapPea.h":
     extern void isometry_list_orientations(IsometryList *isometry_list, Boolean *contains_orientation_preserving_isometries, Boolean *contains_orientation_reversing_isometries) except *
     extern void free_isometry_list(IsometryList *isometry_list) except *
     extern Boolean same_triangulation(c_Triangulation *manifold0, c_Triangulation *manifold1) except *
-    extern void length_spectrum(WEPolyhedron *polyhedron, Real cutoff_length, Boolean full_rigor, Boolean multiplicities, Boolean grouped, Real user_radius, MultiLength **spectrum, int *num_lengths) except *
+    extern void length_spectrum(WEPolyhedron *polyhedron, Real cutoff_length, Boolean full_rigor, Boolean multiplicities, Boolean grouped, Real user_radius, MultiLength **spectrum, int *num_lengths) except * nogil
     extern void free_length_spectrum(MultiLength *spectrum, int num_lengths) except *
     extern c_Triangulation *triangulate_link_complement(KLPProjection *aLinkProjection, Boolean remove_extra_vertices) except *
     extern void Moebius_to_O31(MoebiusTransformation *A, O31Matrix B) except *
@@ -599,7 +614,7 @@ cdef extern from "SnapPea.h":
     extern void free_LR_factorization(LRFactorization *anLRFactorization) except *
     extern c_Triangulation *triangulate_punctured_torus_bundle(LRFactorization *anLRFactorization) except *
     extern void rehydrate_census_manifold(TersestTriangulation tersest, int which_census, int which_manifold, c_Triangulation **manifold) except *
-    extern RepresentationList *find_representations(c_Triangulation *manifold, int n,PermutationSubgroup range) except *
+    extern RepresentationList *find_representations(c_Triangulation *manifold, int n,PermutationSubgroup range) except * nogil
     extern void free_representation_list(RepresentationList *representation_list) except *
     extern void free_representation(RepresentationIntoSn *representation, int num_generators, int num_cusps) except *
     extern RepresentationIntoSn *initialize_new_representation(int num_original_generators, int n, int num_cusps) except *
@@ -621,7 +636,7 @@ cdef extern from "SnapPea.h":
     extern void unchangeable_tetrahedra(c_Triangulation *manifold, int* marked) except *
     extern void all_tetrahedra_changeable(c_Triangulation *manifold) except *
     extern Complex sl2c_determinant(SL2CMatrix m) except *
-    extern c_FuncResult compute_symmetry_group(c_Triangulation *manifold, c_SymmetryGroup **symmetry_group_of_manifold, c_SymmetryGroup **symmetry_group_of_link, c_Triangulation **symmetric_triangulation, Boolean *is_full_group) except *
+    extern c_FuncResult compute_symmetry_group(c_Triangulation *manifold, c_SymmetryGroup **symmetry_group_of_manifold, c_SymmetryGroup **symmetry_group_of_link, c_Triangulation **symmetric_triangulation, Boolean *is_full_group) except * nogil
     extern void free_symmetry_group(c_SymmetryGroup *symmetry_group) except *
     extern Boolean symmetry_group_is_abelian(c_SymmetryGroup *symmetry_group, c_AbelianGroup **abelian_description) except *
     extern Boolean symmetry_group_is_dihedral(c_SymmetryGroup *symmetry_group) except *
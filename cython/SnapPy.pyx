@@ -6,6 +6,7 @@ include "SnapPy.pxi"
 include "numbers/double.pyx"
 include "core/basic.pyx"
 include "core/triangulation.pyx"
+include "core/isosig.pyx"
 include "core/manifold.pyx"
 include "core/abelian_group.pyx"
 include "core/fundamental_group.pyx"
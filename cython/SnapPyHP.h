@@ -0,0 +1,64 @@
+/* Generated by Cython 3.0.12 */
+
+#ifndef __PYX_HAVE__SnapPyHP
+#define __PYX_HAVE__SnapPyHP
+
+#include "Python.h"
+
+#ifndef __PYX_HAVE_API__SnapPyHP
+
+#ifdef CYTHON_EXTERN_C
+    #undef __PYX_EXTERN_C
+    #define __PYX_EXTERN_C CYTHON_EXTERN_C
+#elif defined(__PYX_EXTERN_C)
+    #ifdef _MSC_VER
+    #pragma message ("Please do not define the '__PYX_EXTERN_C' macro externally. Use 'CYTHON_EXTERN_C' instead.")
+    #else
+    #warning Please do not define the '__PYX_EXTERN_C' macro externally. Use 'CYTHON_EXTERN_C' instead.
+    #endif
+#else
+    #define __PYX_EXTERN_C extern "C++"
+#endif
+
+#ifndef DL_IMPORT
+  #define DL_IMPORT(_T) _T
+#endif
+
+__PYX_EXTERN_C PyObject *UCS2_hack(char *, Py_ssize_t, char *);
+__PYX_EXTERN_C void uFatalError(const char*, const char*);
+__PYX_EXTERN_C void uLongComputationBegins(const char*, Boolean);
+__PYX_EXTERN_C FuncResult uLongComputationContinues(void);
+__PYX_EXTERN_C void uLongComputationEnds(void);
+__PYX_EXTERN_C void uAcknowledge(const char*);
+__PYX_EXTERN_C void uAbortMemoryFull(void);
+__PYX_EXTERN_C int uQuery(const char*, const int, const char* *, const int);
+
+__PYX_EXTERN_C int SnapPy_test_flag;
+
+#endif /* !__PYX_HAVE_API__SnapPyHP */
+
+/* WARNING: the interface of the module init function changed in CPython 3.5. */
+/* It now returns a PyModuleDef instance instead of a PyModule instance. */
+
+#if PY_MAJOR_VERSION < 3
+PyMODINIT_FUNC initSnapPyHP(void);
+#else
+/* WARNING: Use PyImport_AppendInittab("SnapPyHP", PyInit_SnapPyHP) instead of calling PyInit_SnapPyHP directly from Python 3.5 */
+PyMODINIT_FUNC PyInit_SnapPyHP(void);
+
+#if PY_VERSION_HEX >= 0x03050000 && (defined(__GNUC__) || defined(__clang__) || defined(_MSC_VER) || (defined(__cplusplus) && __cplusplus >= 201402L))
+#if defined(__cplusplus) && __cplusplus >= 201402L
+[[deprecated("Use PyImport_AppendInittab(\"SnapPyHP\", PyInit_SnapPyHP) instead of calling PyInit_SnapPyHP directly.")]] inline
+#elif defined(__GNUC__) || defined(__clang__)
+__attribute__ ((__deprecated__("Use PyImport_AppendInittab(\"SnapPyHP\", PyInit_SnapPyHP) instead of calling PyInit_SnapPyHP directly."), __unused__)) __inline__
+#elif defined(_MSC_VER)
+__declspec(deprecated("Use PyImport_AppendInittab(\"SnapPyHP\", PyInit_SnapPyHP) instead of calling PyInit_SnapPyHP directly.")) __inline
+#endif
+static PyObject* __PYX_WARN_IF_PyInit_SnapPyHP_INIT_CALLED(PyObject* res) {
+  return res;
+}
+#define PyInit_SnapPyHP() __PYX_WARN_IF_PyInit_SnapPyHP_INIT_CALLED(PyInit_SnapPyHP())
+#endif
+#endif
+
+#endif /* !__PYX_HAVE__SnapPyHP */
@@ -230,11 +230,26 @@ cdef class PresentationMatrix():
         If any entry is a unit, eliminate the corresponding generator.
         Continue until no units remain.  When a generator is removed,
         remember its column index.
+
+        The unit used next is one whose row and column are shortest
+        (the Markowitz criterion), which limits the fill-in so that the
+        very sparse matrices of large triangulations stay sparse.  The
+        lengths are only updated when a unit is taken from the heap.
         """
         cdef int i = 0, j = 0, k, l
+        heap = []
         while len(self._units) > 0:
-            for i, j in self._units:
-                break
+            if not heap:
+                heap = [(0, i, j) for i, j in self._units]
+                heapq.heapify(heap)
+            cost, i, j = heapq.heappop(heap)
+            if (i, j) not in self._units:
+                continue
+            current_cost = ((len(self._row_support[i]) - 1) *
+                            (len(self._col_support[j]) - 1))
+            if current_cost > cost:
+                heapq.heappush(heap, (current_cost, i, j))
+                continue
             col_support = [k for k in self._col_support[j] if k != i] + [i]
             row_entries = [(l, self._entries.get((i,l), 0))
                            for l in self._row_support[i]]
@@ -245,10 +260,30 @@ cdef class PresentationMatrix():
                 # (avoids calling python functions in the loop)
                 for l, a_il in row_entries:
                     kl = (k,l)
-                    temp = self._entries.get(kl, 0)
-                    self._set(kl, temp - m*a_il )
+                    temp = self._entries.get(kl, 0) - m*a_il
+                    self._set(kl, temp)
+                    if temp == 1 or temp == -1:
+                        heapq.heappush(heap, (0, k, l))
             self.dead_columns.add(j)
 
+    def elementary_divisors(self):
+        """
+        Return the elementary divisors of the presented group, in the
+        same form as AbelianGroup.elementary_divisors.  The units are
+        eliminated by simplify, and the Smith form of the remaining,
+        usually small, matrix is computed with PARI.
+
+        >>> P = PresentationMatrix(2, 3)
+        >>> P[0, 0], P[0, 1], P[0, 2] = 1, 3, 2
+        >>> P[1, 0], P[1, 2] = 2, 6
+        >>> P.elementary_divisors()
+        [2, 0]
+        """
+        self.simplify()
+        if len(self.dead_columns) == self.cols:
+            return []
+        return AbelianGroup(self.simplified_matrix()).elementary_divisors()
+
     def simplified_matrix(self):
         """
         Return the simplified presentation as a matrix.
@@ -4,19 +4,23 @@ import sys
 import operator
 import types
 import re
+import array
 import gzip
+import heapq
 import struct
 import tempfile
 import tarfile
 import atexit
 import math
 import string
+import threading
 import time
+from collections import namedtuple
 python_major_version = sys.version_info.major
 
 # Sage interaction
 from .sage_helper import _within_sage, SageNotAvailable
-from .pari import pari as pari
+from .pari import pari as pari, PariError, shut_up, speak_up
 try:
     import sage.all
     import sage.structure.sage_object
@@ -169,86 +173,122 @@ def set_test_flag(int value):
 
 
 # Implementation of the SnapPea UI functions and their global variables.
+# Since the long-running kernel functions are called with the GIL
+# released, each of these reacquires it before touching Python objects.
 cdef public void uFatalError(const_char_ptr function,
-                             const_char_ptr file) except *:
+                             const_char_ptr file) except * with gil:
     # Only raise exception the first time so that we see the first
     # uFatalError which is usually the root cause of the problem.
     if not PyErr_Occurred():
         raise SnapPeaFatalError('SnapPea crashed in function %s(), '
                                 'defined in %s.c.' % (function, file))
 
-# Global variables used for interrupt processing
-cdef public Boolean gLongComputationInProgress
-cdef public Boolean gLongComputationCancelled
-cdef public gLongComputationTicker
+# Interrupt processing.  Since the long-running kernel functions are
+# called with the GIL released, several threads may be inside the
+# kernel at the same time.  Each thread has its own LongComputation
+# state so that interrupting or finishing the computation
+# of one thread does not affect those of the other threads.
+
+class LongComputation():
+    """
+    The state of the long computation, if any, of one thread.
+    """
+    __slots__ = ('in_progress', 'cancelled', 'ticker')
+
+    def __init__(self):
+        self.in_progress = False
+        self.cancelled = False
+        self.ticker = 0.0
+
+
+_thread_state = threading.local()
+
+# The LongComputation of each thread currently inside the kernel,
+# keyed by thread identifier.
+_long_computations = {}
+
+
+def current_long_computation():
+    """
+    The LongComputation of the calling thread.
+    """
+    try:
+        return _thread_state.long_computation
+    except AttributeError:
+        state = _thread_state.long_computation = LongComputation()
+        return state
 
 # If not None, this will be called in gLongComputationContinues.
 # This enables a GUI to do updates during long computations.
 UI_callback = None
 
 
-def SnapPea_interrupt():
+def SnapPea_interrupt(all_threads=False):
     """
-    The UI can call this to stop SnapPea.  Returns True if SnapPea s busy.
-    If SnapPea is busy, the side effect is to set the gLongComputationCancelled
-    flag.
+    The UI can call this to stop SnapPea.  Returns True if SnapPea is
+    busy, and then cancels the computation.  Only the computation of
+    the calling thread is considered unless all_threads is True.
+
+    >>> SnapPea_interrupt(), SnapPea_interrupt(all_threads=True)
+    (False, False)
     """
-    global gLongComputationCancelled
-    global gLongComputationInProgress
-    if gLongComputationInProgress:
-        gLongComputationCancelled = True
-    return gLongComputationInProgress
+    if all_threads:
+        states = list(_long_computations.values())
+    else:
+        states = [current_long_computation()]
+    busy = False
+    for state in states:
+        if state.in_progress:
+            state.cancelled = busy = True
+    return busy
 
 
 cdef public void uLongComputationBegins(const_char_ptr message,
-                                        Boolean is_abortable):
-    global gLongComputationCancelled
-    global gLongComputationInProgress
-    global gLongComputationTicker
-    gLongComputationCancelled = False
-    gLongComputationInProgress = True
-    gLongComputationTicker = time.time()
-
-cdef public c_FuncResult uLongComputationContinues() except *:
-    global gLongComputationCancelled
-    global gLongComputationInProgress
-    global gLongComputationTicker
+                                        Boolean is_abortable) with gil:
+    state = current_long_computation()
+    state.cancelled = False
+    state.in_progress = True
+    state.ticker = time.time()
+    _long_computations[threading.get_ident()] = state
+
+cdef public c_FuncResult uLongComputationContinues() except * with gil:
     cdef now
-    if gLongComputationCancelled:
+    state = current_long_computation()
+    if state.cancelled:
         return func_cancelled
-    elif UI_callback is not None:
+    if UI_callback is not None:
         now = time.time()
-        if now - gLongComputationTicker > 0.2:
+        if now - state.ticker > 0.2:
             UI_callback()
-            gLongComputationTicker = now
+            state.ticker = now
     return func_OK
 
-cdef public void uLongComputationEnds() except*:
-    global gLongComputationCancelled
-    global gLongComputationInProgress
-    gLongComputationInProgress = False
-    if gLongComputationCancelled:
-        gLongComputationCancelled = False
+cdef public void uLongComputationEnds() except * with gil:
+    state = current_long_computation()
+    state.in_progress = False
+    _long_computations.pop(threading.get_ident(), None)
+    if state.cancelled:
+        state.cancelled = False
         if UI_callback is not None:
             UI_callback(interrupted=True)
 
 
 show_uAcknowledge = False
 
-cdef public void uAcknowledge(const_char_ptr message):
+cdef public void uAcknowledge(const_char_ptr message) with gil:
     if show_uAcknowledge:
         sys.stderr.write(to_str(<char *> message))
         sys.stderr.write('\n')
     return
 
-cdef public void uAbortMemoryFull():
+cdef public void uAbortMemoryFull() with gil:
     sys.stderr.write('Out of memory.\n')
     sys.exit(2)
 
 cdef public int uQuery(const_char_ptr  message,
                        const_int       num_responses,
                        const_char_ptr  responses[],
-                       const_int       default_response):
+                       const_int       default_response) with gil:
     #  If desired you could write this function to obtain a response
     #  from the user, but for now it is set up to return the default
     #  response, to facilitate batch computations.
@@ -261,6 +301,31 @@ def cy_eval(s):
     return eval(s)
 
 
+def _pari_smith_form(m, n, entries, max_stack=2**34):
+    """
+    The result of PARI's matsnf for the m by n integer matrix with the
+    given entries.  If the PARI stack overflows, the maximum stack size
+    is doubled and the computation retried, up to max_stack bytes.
+    The original stack sizes are restored afterwards.  PARI's warnings
+    about increasing the stack size are not printed.
+    """
+    size, sizemax = pari.stacksize(), pari.stacksizemax()
+    shut_up()
+    try:
+        while True:
+            try:
+                return [int(x) for x in pari.matrix(m, n, entries).matsnf()]
+            except PariError as e:
+                larger = 2*pari.stacksizemax()
+                if 'stack overflows' not in str(e) or larger > max_stack:
+                    raise
+                pari.allocatemem(pari.stacksize(), larger, silent=True)
+    finally:
+        speak_up()
+        if pari.stacksizemax() != sizemax:
+            pari.allocatemem(size, sizemax, silent=True)
+
+
 def smith_form(M):
     if _within_sage:
         if not hasattr(M, 'elementary_divisors'):
@@ -271,7 +336,7 @@ def smith_form(M):
         if not isinstance(M, matrix):
             M = matrix(M)
         m, n = M.shape
-        result = [int(x) for x in pari.matrix(m, n, M.entries()).matsnf()]
+        result = _pari_smith_form(m, n, M.entries())
 
     # PARI views the input to matsnf0 as square.
     if m < n:
@@ -331,15 +396,22 @@ cdef convert_and_free_identification_of_variables(
     return var_list
 
 
-# convert and free an integer matrix from C
+# convert and free an integer matrix from C.  If rows is given, the
+# entries are appended to it instead of being converted to a list.
 cdef convert_and_free_integer_matrix(
-        Integer_matrix_with_explanations c_matrix):
+        Integer_matrix_with_explanations c_matrix,
+        _IntegerRows rows=None):
     if not c_matrix.entries:
         return []
 
-    python_matrix = [[c_matrix.entries[i][j]
-                      for j in range(c_matrix.num_cols)]
-                     for i in range(c_matrix.num_rows)]
+    if rows is None:
+        python_matrix = [[c_matrix.entries[i][j]
+                          for j in range(c_matrix.num_cols)]
+                         for i in range(c_matrix.num_rows)]
+    else:
+        for i in range(c_matrix.num_rows):
+            rows.append(c_matrix.entries[i], c_matrix.num_cols)
+        python_matrix = []
 
     explain_row = []
 
@@ -362,6 +434,158 @@ cdef convert_and_free_integer_matrix(
     return python_matrix, explain_row, explain_column
 
 
+cdef class _IntegerRows:
+    """
+    Collects rows of integers produced by the kernel in one C array,
+    from which matrices in the formats accepted by gluing_equations
+    are built without converting the entries one at a time.
+    """
+    cdef int* data
+    cdef Py_ssize_t num_rows, num_cols, capacity
+
+    def __cinit__(self, Py_ssize_t num_cols=-1):
+        # The number of columns is set by the first row if not given.
+        self.num_cols = num_cols
+        self.num_rows = 0
+        self.capacity = 0
+        self.data = NULL
+
+    def __dealloc__(self):
+        free(self.data)
+
+    cdef append(self, int* row, Py_ssize_t length):
+        cdef int* data
+        if self.num_cols < 0:
+            self.num_cols = length
+        if length != self.num_cols:
+            raise ValueError('Rows must have %d entries' % self.num_cols)
+        if self.num_rows == self.capacity:
+            self.capacity = 2*self.capacity + 16
+            data = <int*>malloc(self.capacity*self.num_cols*sizeof(int))
+            if data == NULL:
+                raise RuntimeError('Failed to allocate memory for rows.')
+            if self.data != NULL:
+                memcpy(data, self.data,
+                       self.num_rows*self.num_cols*sizeof(int))
+                free(self.data)
+            self.data = data
+        memcpy(self.data + self.num_rows*self.num_cols, row,
+               self.num_cols*sizeof(int))
+        self.num_rows += 1
+
+    def __len__(self):
+        return self.num_rows
+
+    def to_list(self):
+        cdef Py_ssize_t i, j
+        return [[self.data[i*self.num_cols + j] for j in range(self.num_cols)]
+                for i in range(self.num_rows)]
+
+    def to_format(self, format):
+        """
+        Return the rows as a matrix, format=None, as a NumPy array,
+        format='numpy', or as a SparseIntegerMatrix, format='sparse'.
+        """
+        cdef Py_ssize_t i, j, k, nnz = 0
+        cdef int[:, ::1] dense
+        cdef int[::1] indptr, indices, values
+        cdef int x
+        if format is None:
+            return matrix(self.to_list())
+        if format == 'numpy':
+            import numpy
+            result = numpy.empty((self.num_rows, self.num_cols),
+                                 dtype=numpy.intc)
+            dense = result
+            if self.num_rows:
+                memcpy(&dense[0, 0], self.data,
+                       self.num_rows*self.num_cols*sizeof(int))
+            return result
+        if format == 'sparse':
+            for i in range(self.num_rows*self.num_cols):
+                if self.data[i] != 0:
+                    nnz += 1
+            py_indptr = array.array('i', bytes(sizeof(int)*(self.num_rows + 1)))
+            py_indices = array.array('i', bytes(sizeof(int)*nnz))
+            py_values = array.array('i', bytes(sizeof(int)*nnz))
+            indptr, indices, values = py_indptr, py_indices, py_values
+            k = 0
+            for i in range(self.num_rows):
+                for j in range(self.num_cols):
+                    x = self.data[i*self.num_cols + j]
+                    if x != 0:
+                        indices[k] = j
+                        values[k] = x
+                        k += 1
+                indptr[i + 1] = k
+            return SparseIntegerMatrix((self.num_rows, self.num_cols),
+                                       py_indptr, py_indices, py_values)
+        raise ValueError("The format must be None, 'numpy' or 'sparse'.")
+
+
+class SparseIntegerMatrix():
+    """
+    An integer matrix in compressed sparse row (CSR) form: the
+    nonzero entries of row i are data[indptr[i]:indptr[i+1]] and lie
+    in the columns indices[indptr[i]:indptr[i+1]].  The index and
+    data arrays are array.array objects, which numpy.frombuffer can
+    wrap without copying them.
+
+    >>> A = Triangulation('m004').gluing_equations(format='sparse')
+    >>> A
+    SparseIntegerMatrix(shape=(4, 6), nnz=12)
+    >>> list(A.indptr), list(A.indices[:4]), list(A.data[:4])
+    ([0, 4, 8, 10, 12], [0, 1, 3, 5], [2, 1, 1, 2])
+    >>> [list(x) for x in A.coo()][0]
+    [0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 3, 3]
+    >>> A.rows()[2]
+    [1, 0, 0, 0, -1, 0]
+    """
+
+    def __init__(self, shape, indptr, indices, data):
+        self.shape = shape
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+
+    def __repr__(self):
+        return 'SparseIntegerMatrix(shape=%s, nnz=%d)' % (
+            self.shape, len(self.data))
+
+    def coo(self):
+        """
+        Return the arrays (row indices, column indices, data) of the
+        coordinate (COO) form of the matrix.
+        """
+        row_indices = array.array('i')
+        for i in range(self.shape[0]):
+            row_indices.extend([i]*(self.indptr[i + 1] - self.indptr[i]))
+        return row_indices, self.indices, self.data
+
+    def rows(self):
+        """
+        Return the matrix as a list of rows.
+        """
+        result = []
+        for i in range(self.shape[0]):
+            row = [0]*self.shape[1]
+            for k in range(self.indptr[i], self.indptr[i + 1]):
+                row[self.indices[k]] = self.data[k]
+            result.append(row)
+        return result
+
+    def to_scipy(self):
+        """
+        Return the matrix as a scipy.sparse.csr_matrix.
+        """
+        import numpy
+        from scipy.sparse import csr_matrix
+        return csr_matrix((numpy.frombuffer(self.data, dtype=numpy.intc),
+                           numpy.frombuffer(self.indices, dtype=numpy.intc),
+                           numpy.frombuffer(self.indptr, dtype=numpy.intc)),
+                          shape=self.shape)
+
+
 class MatrixWithExplanations():
 
     def __init__(self, mat, explain_rows, explain_columns):
@@ -545,6 +769,23 @@ class Info(dict):
     pop = popitem = clear = update = _immutable
     _obsolete = {}
 
+    def __reduce__(self):
+        """
+        Used by the pickle module, e.g., when results are stored in
+        the persistent cache.
+
+        >>> from pickle import loads, dumps
+        >>> info = Manifold('m004').cusp_info(0)
+        >>> copy = loads(dumps(info))
+        >>> type(copy) == type(info), repr(copy) == repr(info)
+        (True, True)
+        """
+        return (_rebuild_info, (self.__class__, self.__dict__.copy()))
+
+
+def _rebuild_info(cls, kwargs):
+    return cls(**kwargs)
+
 
 class CuspInfo(Info):
     def __repr__(self):
@@ -762,8 +1003,9 @@ def Manifold_from_Triangulation(Triangulation T, recompute=True,
             remove_finite_vertices(c_triangulation)
             count_cusps(c_triangulation)
 
-        find_complete_hyperbolic_structure(c_triangulation)
-        do_Dehn_filling(c_triangulation)
+        with nogil:
+            find_complete_hyperbolic_structure(c_triangulation)
+            do_Dehn_filling(c_triangulation)
 
     M.set_name(T.name())
     M._cover_info = T._cover_info
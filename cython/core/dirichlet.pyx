@@ -115,6 +115,10 @@ cdef class CDirichletDomain():
                   O31_generators=None,
                   str manifold_name='unnamed'):
         cdef double c_displacement[3]
+        cdef double c_vertex_epsilon
+        cdef Boolean c_centroid_at_origin
+        cdef Boolean c_maximize_injectivity_radius
+        cdef Boolean c_include_words
         if displacement is None:
             displacement = [0.0, 0.0, 0.0]
         self.c_dirichlet_domain = NULL
@@ -148,16 +152,21 @@ cdef class CDirichletDomain():
                 raise ValueError('The Triangulation is empty.')
             for n from 0 <= n < 3:
                 c_displacement[n] = <double>displacement[n]
+            c_vertex_epsilon = vertex_epsilon
+            c_centroid_at_origin = centroid_at_origin
+            c_maximize_injectivity_radius = maximize_injectivity_radius
+            c_include_words = include_words
             copy_triangulation(manifold.c_triangulation,
                                &self.c_triangulation)
-            self.c_dirichlet_domain = Dirichlet_with_displacement(
-                self.c_triangulation,
-                c_displacement,
-                vertex_epsilon,
-                centroid_at_origin,
-                Dirichlet_keep_going,
-                maximize_injectivity_radius,
-                include_words)
+            with nogil:
+                self.c_dirichlet_domain = Dirichlet_with_displacement(
+                    self.c_triangulation,
+                    c_displacement,
+                    c_vertex_epsilon,
+                    c_centroid_at_origin,
+                    Dirichlet_keep_going,
+                    c_maximize_injectivity_radius,
+                    c_include_words)
             # num_generators computed implicitly by
             # Dirichlet_with_displacement.
             self.c_num_generators = self.c_triangulation.num_generators
@@ -270,15 +279,21 @@ cdef class CDirichletDomain():
         cdef int num_lengths
         cdef MultiLength* geodesics
         cdef int* c_word
-
-        length_spectrum(self.c_dirichlet_domain,
-                        Object2Real(cutoff_length),
-                        full_rigor,
-                        multiplicities,
-                        grouped,
-                        Object2Real(user_radius),
-                        &geodesics,
-                        &num_lengths)
+        cdef Real c_cutoff_length = Object2Real(cutoff_length)
+        cdef Real c_user_radius = Object2Real(user_radius)
+        cdef Boolean c_full_rigor = full_rigor
+        cdef Boolean c_multiplicities = multiplicities
+        cdef Boolean c_grouped = grouped
+
+        with nogil:
+            length_spectrum(self.c_dirichlet_domain,
+                            c_cutoff_length,
+                            c_full_rigor,
+                            c_multiplicities,
+                            c_grouped,
+                            c_user_radius,
+                            &geodesics,
+                            &num_lengths)
         spectrum = []
         for n from 0 <= n < num_lengths:
             length = Complex2Number(geodesics[n].length)
@@ -96,27 +96,108 @@ def word_as_list(word, int num_generators):
     return word_list
 
 
+SimplificationStep = namedtuple(
+    'SimplificationStep',
+    ['seconds', 'moves', 'generators', 'relators', 'total_length', 'longest'])
+
+
+class _SimplificationMonitor():
+    """
+    Passed to the kernel's fundamental_group_with_monitor to record the
+    size of the presentation after each pass through the simplification
+    loop and to stop that one computation once the budget is used up.
+    """
+
+    def __init__(self, max_time=None, max_relator_length=None):
+        self.max_time = max_time
+        self.max_relator_length = max_relator_length
+        self.start = time.time()
+        self.history = []
+        self.stopped_by = None
+        self.error = None
+
+    def record(self, moves, generators, relators, total_length, longest):
+        seconds = time.time() - self.start
+        self.history.append(SimplificationStep(
+            seconds, moves, generators, relators, total_length, longest))
+        if (self.max_relator_length is not None and
+                longest > self.max_relator_length):
+            self.stopped_by = 'max_relator_length'
+        return self.stop()
+
+    def stop(self):
+        if (self.stopped_by is None and self.max_time is not None and
+                time.time() - self.start > self.max_time):
+            self.stopped_by = 'max_time'
+        return self.stopped_by is not None
+
+
+cdef Boolean _monitor_simplification(
+        void *monitor_data,
+        const FGSimplificationProgress *progress) noexcept with gil:
+    monitor = <object>monitor_data
+    try:
+        if progress is NULL:
+            return monitor.stop()
+        return monitor.record(progress.num_moves,
+                              progress.num_generators,
+                              progress.num_relations,
+                              progress.total_length,
+                              progress.longest_relation)
+    except BaseException as error:
+        # There is no way to raise through the kernel, so stop the
+        # simplification and raise the error, e.g. a KeyboardInterrupt,
+        # once the kernel returns.
+        monitor.error = error
+        return True
+
+
 cdef class CFundamentalGroup():
     cdef c_GroupPresentation *c_group_presentation
     cdef c_Triangulation *c_triangulation
     cdef readonly num_cusps
+    cdef _monitor
 
     def __cinit__(self, Triangulation triangulation,
                   simplify_presentation=True,
                   fillings_may_affect_generators=True,
                   minimize_number_of_generators=True,
-                  try_hard_to_shorten_relators=True):
+                  try_hard_to_shorten_relators=True,
+                  max_time=None,
+                  max_relator_length=None,
+                  anytime=False,
+                  record_history=False):
         if triangulation.c_triangulation is NULL:
             raise ValueError('The Triangulation is empty.')
+        if (max_time is not None or max_relator_length is not None or
+            record_history):
+            self._monitor = _SimplificationMonitor(max_time,
+                                                   max_relator_length)
         copy_triangulation(triangulation.c_triangulation,
                            &self.c_triangulation)
-        self.c_group_presentation = fundamental_group(
-            self.c_triangulation,
-            simplify_presentation,
-            fillings_may_affect_generators,
-            minimize_number_of_generators,
-            try_hard_to_shorten_relators)
+        if self._monitor is None:
+            self.c_group_presentation = fundamental_group(
+                self.c_triangulation,
+                simplify_presentation,
+                fillings_may_affect_generators,
+                minimize_number_of_generators,
+                try_hard_to_shorten_relators)
+        else:
+            self.c_group_presentation = fundamental_group_with_monitor(
+                self.c_triangulation,
+                simplify_presentation,
+                fillings_may_affect_generators,
+                minimize_number_of_generators,
+                try_hard_to_shorten_relators,
+                _monitor_simplification,
+                <void *>self._monitor)
+            if self._monitor.error is not None:
+                raise self._monitor.error
         self.num_cusps = triangulation.num_cusps()
+        if self.simplification_stopped_by() and not anytime:
+            raise RuntimeError(
+                'Simplifying the presentation exceeded %s.' %
+                self.simplification_stopped_by())
 
     def __dealloc__(self):
         free_triangulation(self.c_triangulation)
@@ -127,6 +208,28 @@ cdef class CFundamentalGroup():
             ','.join(self.generators()),
             '\n   '.join(self.relators()))
 
+    def simplification_history(self):
+        """
+        Return the size of the presentation after each pass through
+        the simplification loop as a list of SimplificationStep named
+        tuples (seconds, moves, generators, relators, total_length,
+        longest).  The history is only recorded when a budget was
+        given or record_history=True.
+
+        >>> G = Triangulation('m004').fundamental_group(record_history=True)
+        >>> [step[1:] for step in G.simplification_history()]
+        [(1, 3, 2, 10, 7), (2, 3, 2, 11, 9), (3, 2, 1, 9, 9), (4, 2, 1, 9, 9)]
+        """
+        return list(self._monitor.history) if self._monitor else []
+
+    def simplification_stopped_by(self):
+        """
+        Return None if the presentation was simplified as far as the
+        kernel's algorithm goes, or else the budget, 'max_time' or
+        'max_relator_length', which stopped the simplification early.
+        """
+        return self._monitor.stopped_by if self._monitor else None
+
     def num_generators(self):
         """
         Return the number of generators for the presentation.
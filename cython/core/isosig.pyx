@@ -0,0 +1,231 @@
+# Decorated isomorphism signatures
+#
+# A compiled version of decorated_isosig.decorated_isosig, which works
+# directly with the kernel's list of combinatorial isomorphisms instead
+# of building Isometry objects and encoding each candidate decoration
+# in Python.  See decorated_isosig.py for the format.
+
+cdef char* _base64_letters = (
+    b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789+-')
+cdef char* _base64_lower = b'abcdefghijklmnopqrstuvwxyz01234+'
+cdef char* _base64_upper = b'ABCDEFGHIJKLMNOPQRSTUVWXYZ56789-'
+
+# Enough for the encoding of any C int, see _encode_int.
+cdef enum:
+    MAX_ENCODED_INT = 8
+
+
+cdef int _encode_int(long x, char* out) except -1:
+    """
+    Write encode_int(x) to out and return its length.
+    """
+    cdef unsigned long y
+    cdef int n = 0
+    if 0 <= x < 16:
+        out[0] = _base64_letters[x]
+        return 1
+    if -15 <= x < 0:
+        out[0] = _base64_letters[26 - x]
+        return 1
+    y = x if x > 0 else -x
+    while True:
+        n += 1
+        out[n] = _base64_letters[y & 63]
+        y >>= 6
+        if y == 0:
+            break
+    if n > 15:
+        raise ValueError('The given integer is too large to encode')
+    out[0] = _base64_lower[16 + n] if x > 0 else _base64_upper[16 + n]
+    return n + 1
+
+
+cdef int _sgn_column(int m[2][2], int col):
+    cdef int entry = m[0][col] if m[0][col] != 0 else m[1][col]
+    return 1 if entry > 0 else -1
+
+
+cdef _decorated_isosig(Triangulation manifold,
+                       bint ignore_cusp_ordering,
+                       bint ignore_curve_orientations,
+                       bint ignore_orientation):
+    cdef c_Triangulation* c_bare = NULL
+    cdef IsometryList* isometries = NULL
+    cdef char* c_string
+    cdef char* encoded = NULL
+    cdef char* best = NULL
+    cdef int* images = NULL
+    cdef int* perm = NULL
+    cdef int* best_perm = NULL
+    cdef int* flips = NULL
+    cdef int* best_flips = NULL
+    cdef MatrixInt22* maps = NULL
+    cdef int n, i, k, c, row, col, length, best_length = -1, det_sign
+    cdef bint orientable, identity
+    if manifold.c_triangulation is NULL:
+        raise ValueError('The Triangulation is empty.')
+    c_string = get_isomorphism_signature(manifold.c_triangulation,
+                                         ignore_orientation)
+    try:
+        isosig = to_str(c_string)
+    finally:
+        free(c_string)
+
+    # Do not decorate if no cusps
+    n = get_num_cusps(manifold.c_triangulation)
+    if n == 0:
+        return isosig
+
+    orientable = (get_orientability(manifold.c_triangulation) ==
+                  oriented_manifold)
+    try:
+        c_bare = triangulation_from_isomorphism_signature(
+            isosig.encode('ascii'))
+        peripheral_curves(c_bare)
+        compute_cusped_isomorphisms(manifold.c_triangulation, c_bare,
+                                    &isometries, NULL)
+        encoded = <char*>malloc(5 * n * MAX_ENCODED_INT)
+        best = <char*>malloc(5 * n * MAX_ENCODED_INT)
+        images = <int*>malloc(3 * n * sizeof(int))
+        perm, best_perm = images + n, images + 2 * n
+        flips = <int*>malloc(4 * n * sizeof(int))
+        best_flips = flips + 2 * n
+        maps = <MatrixInt22*>malloc(n * sizeof(MatrixInt22))
+        if (encoded == NULL or best == NULL or images == NULL or
+            flips == NULL or maps == NULL):
+            raise MemoryError
+
+        # Try all combinatorial isomorphisms
+        for i in range(isometry_list_size(isometries)):
+            for c in range(n):
+                isometry_list_cusp_action(isometries, i, c,
+                                          &images[c], maps[c])
+
+            # Do not consider orientation-reversing isomorphisms if
+            # ignore_orientation isn't specified.
+            if (orientable and not ignore_orientation and
+                maps[0][0][0] * maps[0][1][1] -
+                maps[0][0][1] * maps[0][1][0] < 0):
+                continue
+
+            # Permutation of cusps
+            identity = True
+            for c in range(n):
+                perm[images[c]] = c
+                identity = identity and images[c] == c
+
+            # If we do not include the permutation in the encoding,
+            # we need to apply it to the matrices
+            det_sign = 0
+            for k in range(n):
+                c = perm[k] if ignore_cusp_ordering else k
+                if ignore_curve_orientations:
+                    if k == 0:
+                        det_sign = (maps[c][0][0] * maps[c][1][1] -
+                                    maps[c][0][1] * maps[c][1][0])
+                    flips[2 * k] = _sgn_column(maps[c], 0)
+                    if orientable:
+                        flips[2 * k + 1] = flips[2 * k] * det_sign
+                    else:
+                        flips[2 * k + 1] = _sgn_column(maps[c], 1)
+                else:
+                    flips[2 * k] = flips[2 * k + 1] = 1
+
+            length = 0
+            if not (identity or ignore_cusp_ordering):
+                for c in range(n):
+                    length += _encode_int(perm[c], encoded + length)
+            for k in range(n):
+                c = perm[k] if ignore_cusp_ordering else k
+                for col in range(2):
+                    for row in range(2):
+                        length += _encode_int(
+                            maps[c][row][col] * flips[2 * k + col],
+                            encoded + length)
+
+            # Remember the lexicographically smallest encoding
+            if best_length < 0 or _less_than(encoded, length,
+                                             best, best_length):
+                memcpy(best, encoded, length)
+                best_length = length
+                memcpy(best_perm, perm, n * sizeof(int))
+                memcpy(best_flips, flips, 2 * n * sizeof(int))
+
+        if best_length < 0:
+            raise RuntimeError('Found no isomorphism to the triangulation '
+                               'given by the isosig.')
+        decoration = best[:best_length].decode('ascii')
+        min_perm = [best_perm[k] for k in range(n)]
+        min_flips = [(best_flips[2 * k], best_flips[2 * k + 1])
+                     for k in range(n)]
+    finally:
+        if isometries != NULL:
+            free_isometry_list(isometries)
+        if c_bare != NULL:
+            free_triangulation(c_bare)
+        free(encoded)
+        free(best)
+        free(images)
+        free(flips)
+        free(maps)
+
+    # Add decoration to isosig
+    ans = isosig + decorated_isosig.separator + decoration
+
+    # Add Dehn-fillings if we have any
+    if False in manifold.cusp_info('complete?'):
+        slopes = manifold.cusp_info('filling')
+        if ignore_cusp_ordering:
+            # If we do not include the permutation in the encoding,
+            # we need to apply it to the slopes
+            slopes = [slopes[i] for i in min_perm]
+        for flip, slope in zip(min_flips, slopes):
+            # Apply the flips to the slopes
+            ans += '(%g,%g)' % (
+                decorated_isosig.supress_minus_zero(flip[0] * slope[0]),
+                decorated_isosig.supress_minus_zero(flip[1] * slope[1]))
+
+    return ans
+
+
+cdef bint _less_than(char* a, int a_length, char* b, int b_length):
+    cdef int result = memcmp(a, b, min(a_length, b_length))
+    return result < 0 or (result == 0 and a_length < b_length)
+
+
+def triangulation_isosigs(triangulations,
+                          decorated=True,
+                          ignore_cusp_ordering=False,
+                          ignore_curve_orientations=False,
+                          ignore_orientation=True):
+    """
+    Returns the list of the isosigs of the given triangulations, as
+    computed by Triangulation.triangulation_isosig with the same
+    arguments, but without the overhead of a method call and cache
+    lookup for each triangulation.  This is meant for deduplicating
+    the large numbers of triangulations produced by enumerations.
+
+    >>> triangulation_isosigs([Triangulation('m004'), Manifold('m125')])
+    ['cPcbbbiht_BaCB', 'eLPkbcdddlfffg_BaabBaab']
+    >>> sigs = triangulation_isosigs(Triangulation('m004').covers(5))
+    >>> len(sigs), len(set(sigs))
+    (4, 4)
+    """
+    cdef Triangulation T
+    cdef char* c_string
+    result = []
+    for T in triangulations:
+        if T.c_triangulation is NULL:
+            raise ValueError('The Triangulation is empty.')
+        if decorated:
+            result.append(_decorated_isosig(T, ignore_cusp_ordering,
+                                            ignore_curve_orientations,
+                                            ignore_orientation))
+        else:
+            c_string = get_isomorphism_signature(T.c_triangulation,
+                                                 ignore_orientation)
+            try:
+                result.append(to_str(c_string))
+            finally:
+                free(c_string)
+    return result
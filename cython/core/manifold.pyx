@@ -75,11 +75,19 @@ cdef class Manifold(Triangulation):
    - A string containing the contents of a SnapPea triangulation or link
       projection file.
     """
+    # Set when the hyperbolic structure is to be computed on first use,
+    # see _from_isosig.
+    cdef bint _deferred_structure
+    # Set when the hyperbolic structure was polished from shapes stored
+    # in a pickle, see _from_pickle.
+    cdef bint _structure_from_pickle
 
     def __init__(self, spec=None):
-        if self.c_triangulation != NULL:
+        cdef c_Triangulation* c_triangulation = self.c_triangulation
+        if c_triangulation != NULL and not self._structure_from_pickle:
             self.init_hyperbolic_structure()
-            do_Dehn_filling(self.c_triangulation)
+            with nogil:
+                do_Dehn_filling(c_triangulation)
 
     @staticmethod
     def _number_(n):
@@ -134,14 +142,33 @@ cdef class Manifold(Triangulation):
         number.use_field_conversion(func)
 
     def init_hyperbolic_structure(self, force_recompute = False):
-        if not self.c_triangulation:
+        cdef c_Triangulation* c_triangulation = self.c_triangulation
+        if not c_triangulation:
             return
         if self.hyperbolic_structure_initialized and not force_recompute:
             return
-        find_complete_hyperbolic_structure(self.c_triangulation)
-        do_Dehn_filling(self.c_triangulation)
+        self._deferred_structure = False
+        with nogil:
+            find_complete_hyperbolic_structure(c_triangulation)
+            do_Dehn_filling(c_triangulation)
         self.hyperbolic_structure_initialized = True
 
+    def structure_is_deferred(self):
+        """
+        Whether the hyperbolic structure of this lazily constructed
+        manifold will only be computed when it is first needed.
+
+        >>> M = Manifold('empty')
+        >>> M._from_isosig('cPcbbbiht_BaCB', initialize_structure='lazy')
+        >>> M.structure_is_deferred(), M.homology()
+        (True, Z)
+        >>> M.volume() # doctest: +NUMERIC6
+        2.02988321
+        >>> M.structure_is_deferred()
+        False
+        """
+        return bool(self._deferred_structure)
+
     def canonize(self):
         """
         Change the triangulation to an arbitrary retriangulation of
@@ -158,7 +185,10 @@ cdef class Manifold(Triangulation):
         actually the canonical triangulation.
         """
         cdef c_FuncResult result
-        result = proto_canonize(self.c_triangulation)
+        cdef c_Triangulation* c_triangulation = self.c_triangulation
+        _ensure_structure(self)
+        with nogil:
+            result = proto_canonize(c_triangulation)
         if FuncResult[result] != 'func_OK':
             raise RuntimeError('SnapPea failed to find the canonical '
                                'triangulation.')
@@ -196,13 +226,26 @@ cdef class Manifold(Triangulation):
         >>> len(T.isomorphisms_to(T))
         8
 
+        When the opacities are computed numerically, the result is
+        cached until the shapes or the Dehn fillings change, and a
+        copy of it is returned.
         """
+        if opacities:
+            return self._compute_canonical_retriangulation(opacities)
+        try:
+            T = self._cache.lookup('canonical_retriangulation')
+        except KeyError:
+            T = self._cache.save(self._compute_canonical_retriangulation(),
+                                 'canonical_retriangulation')
+        return T.copy()
 
+    def _compute_canonical_retriangulation(self, opacities = None):
         cdef Boolean *c_opacities
         cdef c_Triangulation *c_retriangulated_triangulation
         cdef int n = get_num_tetrahedra(self.c_triangulation)
-        cdef result
+        cdef c_FuncResult result
         cdef Triangulation new_tri
+        _ensure_structure(self)
 
         if self.c_triangulation is NULL:
             return ""
@@ -218,13 +261,15 @@ cdef class Manifold(Triangulation):
                 c_opacities[i] = 1 if opacities[i] else 0
         else:
             c_opacities = NULL
-            result = proto_canonize(c_retriangulated_triangulation)
+            with nogil:
+                result = proto_canonize(c_retriangulated_triangulation)
             if FuncResult[result] != 'func_OK':
                 free_triangulation(c_retriangulated_triangulation)
                 raise RuntimeError('SnapPea failed to find the canonical '
                                    'triangulation.')
 
-        canonical_retriangulation_with_opacities(
+        with nogil:
+            canonical_retriangulation_with_opacities(
                 c_retriangulated_triangulation, c_opacities)
 
         free(c_opacities)
@@ -235,6 +280,31 @@ cdef class Manifold(Triangulation):
 
         return new_tri
 
+    def _isometry_signature(self, of_link=False):
+        """
+        The unverified isometry signature, see isometry_signature.  It
+        is cached until the shapes or the Dehn fillings change, so
+        comparing the signatures of many manifolds only canonizes each
+        of them once.
+
+        >>> M = Manifold('m125')
+        >>> M._isometry_signature()
+        'gLLPQccdefffqffqqof'
+        """
+        try:
+            return self._cache.lookup('isometry_signature', of_link)
+        except KeyError:
+            pass
+        try:
+            T = self._cache.lookup('canonical_retriangulation')
+        except KeyError:
+            T = self._cache.save(self._compute_canonical_retriangulation(),
+                                 'canonical_retriangulation')
+        signature = T.triangulation_isosig(decorated=of_link,
+                                           ignore_cusp_ordering=True,
+                                           ignore_curve_orientations=True)
+        return self._cache.save(signature, 'isometry_signature', of_link)
+
     def _canonical_cells_are_tetrahedra(self):
         """
         Returns True if and only if the canonical
@@ -247,10 +317,14 @@ cdef class Manifold(Triangulation):
         """
 
         cdef Manifold M
+        cdef c_Triangulation* c_triangulation
+        _ensure_structure(self)
         M = self.copy()
         M.canonize()
-        canonical_retriangulation(M.c_triangulation)
-        count_cusps(M.c_triangulation)
+        c_triangulation = M.c_triangulation
+        with nogil:
+            canonical_retriangulation(c_triangulation)
+        count_cusps(c_triangulation)
         return get_num_fake_cusps(M.c_triangulation) == 0
 
     def _from_string(self, string, initialize_structure=True):
@@ -283,15 +357,64 @@ cdef class Manifold(Triangulation):
         if initialize_structure:
             self.init_hyperbolic_structure()
 
+    def _from_pickle(self, bytestring, remove_finite_vertices=True):
+        """
+        Fill an empty manifold from a pickle generated by the pickle
+        method.  If the pickle includes shapes, they are polished
+        instead of solving the gluing equations from scratch.
+        """
+        shapes = Triangulation._from_pickle(self, bytestring,
+                                            remove_finite_vertices)
+        if shapes and len(shapes) == self.num_tetrahedra():
+            filled, complete = zip(*shapes)
+            self.set_tetrahedra_shapes(filled, complete)
+            self._polish_hyperbolic_structures()
+            self.hyperbolic_structure_initialized = True
+            self._structure_from_pickle = True
+        return shapes
+
+    def pickle(self, include_shapes=False):
+        """
+        Return a compact byte sequence encoding this manifold, see
+        Triangulation.pickle.  If include_shapes is True, the shapes of
+        the tetrahedra in the filled and complete structures are
+        included, so that the hyperbolic structure of the manifold
+        built from the pickle only needs to be polished:
+
+        >>> M = Manifold('m125(2,3)(0,0)')
+        >>> seed = M.pickle(include_shapes=True)
+        >>> N = Manifold(seed)
+        >>> N, N.solution_type()
+        (m125(2,3)(0,0), 'all tetrahedra positively oriented')
+        >>> abs(N.volume() - M.volume()) < 1e-12
+        True
+        """
+        if not include_shapes:
+            return Triangulation.pickle(self)
+        if self.c_triangulation is NULL:
+            raise ValueError('The Triangulation is empty.')
+        shapes = zip(self._get_tetrahedra_shapes('filled'),
+                     self._get_tetrahedra_shapes('complete'))
+        return pickle_triangulation_varint(self.c_triangulation, shapes)
+
     def _from_isosig(self, isosig, initialize_structure=True):
         """
         Fill an empty manifold from an isosig generated by
         triangulation_isosig.
+
+        If initialize_structure is 'lazy', the hyperbolic structure is
+        computed the first time a method which needs it is called, so
+        purely combinatorial methods like homology and
+        triangulation_isosig never solve the gluing equations.  Dehn
+        fillings set before then are applied when the structure is
+        computed.
         """
         Triangulation._from_isosig(self, isosig)
         if self.c_triangulation == NULL:
             return
-        if initialize_structure:
+        if initialize_structure == 'lazy':
+            self._deferred_structure = True
+        elif initialize_structure:
             self.init_hyperbolic_structure()
 
     def copy(self):
@@ -320,6 +443,7 @@ cdef class Manifold(Triangulation):
         178
         >>> CN.view()  # Opens picture of the horoballs  #doctest: +CYOPENGL
         """
+        _ensure_structure(self)
         return CuspNeighborhood(self)
 
     def dirichlet_domain(self,
@@ -362,6 +486,7 @@ cdef class Manifold(Triangulation):
         >>> E
         44 finite vertices, 1 ideal vertices; 69 edges; 26 faces
         """
+        _ensure_structure(self)
         args = (vertex_epsilon, tuple(displacement), centroid_at_origin,
                 maximize_injectivity_radius, include_words)
         try:
@@ -384,6 +509,7 @@ cdef class Manifold(Triangulation):
 
         This does not work when using SnapPy in a Docker container.
         """
+        _ensure_structure(self)
         if Browser is None:
             raise RuntimeError("Browser not imported; Tk, CyOpenGL or pypng is probably missing.")
         return Browser(self)
@@ -410,6 +536,7 @@ cdef class Manifold(Triangulation):
         >>> M.filled_triangulation([0,2])
         v3227_filled(3,4)
         """
+        _ensure_structure(self)
         filled = _triangulation_class.filled_triangulation(self, cusps_to_fill)
         if filled.num_cusps() == 0:
             return Triangulation_from_Manifold(filled)
@@ -419,7 +546,11 @@ cdef class Manifold(Triangulation):
                           simplify_presentation = True,
                           fillings_may_affect_generators = True,
                           minimize_number_of_generators = True,
-                          try_hard_to_shorten_relators = True):
+                          try_hard_to_shorten_relators = True,
+                          max_time = None,
+                          max_relator_length = None,
+                          anytime = False,
+                          record_history = False):
         """
         Return a HolonomyGroup representing the fundamental group of
         the manifold, together with its holonomy representation.  If
@@ -451,12 +582,23 @@ cdef class Manifold(Triangulation):
         Relators:
            CbAcB
            BacA
+
+        The simplification can be given a budget with max_time and
+        max_relator_length, see Triangulation.fundamental_group.
         """
+        _ensure_structure(self)
         if self.c_triangulation is NULL:
             raise ValueError('The Triangulation is empty.')
 
         args = (simplify_presentation, fillings_may_affect_generators,
                 minimize_number_of_generators, try_hard_to_shorten_relators)
+        if (max_time is not None or max_relator_length is not None or
+            record_history):
+            # A budgeted simplification may stop early, so is not cached.
+            return HolonomyGroup(self, *args, max_time=max_time,
+                                 max_relator_length=max_relator_length,
+                                 anytime=anytime,
+                                 record_history=record_history)
         try:
             return self._cache.lookup('fundamental_group', *args)
         except KeyError:
@@ -478,8 +620,10 @@ cdef class Manifold(Triangulation):
         cdef Boolean is_full_group
         cdef c_FuncResult result
         cdef SymmetryGroup symmetry_group
+        cdef c_Triangulation* c_triangulation = self.c_triangulation
+        _ensure_structure(self)
 
-        if self.c_triangulation is NULL:
+        if c_triangulation is NULL:
             raise ValueError('The Triangulation is empty.')
 
         try:
@@ -487,11 +631,12 @@ cdef class Manifold(Triangulation):
         except KeyError:
             pass
 
-        result = compute_symmetry_group(self.c_triangulation,
-                                        &symmetries_of_manifold,
-                                        &symmetries_of_link,
-                                        &c_symmetric_triangulation,
-                                        &is_full_group)
+        with nogil:
+            result = compute_symmetry_group(c_triangulation,
+                                            &symmetries_of_manifold,
+                                            &symmetries_of_link,
+                                            &c_symmetric_triangulation,
+                                            &is_full_group)
 
         if result != func_OK:
             raise ValueError('SnapPea failed to compute any part '
@@ -529,6 +674,9 @@ cdef class Manifold(Triangulation):
         try:
             return self._cache.lookup('symmetric_triangulation')
         except KeyError:
+            # The symmetry group may still be cached after the symmetric
+            # triangulation has been evicted.
+            self._cache.discard('symmetry_group', False)
             self.symmetry_group()
             return self._cache.lookup('symmetric_triangulation')
 
@@ -600,6 +748,7 @@ cdef class Manifold(Triangulation):
           sage: N2 == N4                                     #doctest: +SKIP
           True
         """
+        _ensure_structure(self)
         cover = Triangulation.cover(self, permutation_rep)
         return Manifold_from_Triangulation(cover, recompute=False,
                                            manifold_class=self.__class__)
@@ -642,6 +791,7 @@ cdef class Manifold(Triangulation):
         argument method = 'gap' If you have Magma installed, you can
         used it to do the heavy lifting by specifying method='magma'.
         """
+        _ensure_structure(self)
         covers = Triangulation.covers(self, degree, method,cover_type)
         return [Manifold_from_Triangulation(cover,
                                             recompute=False,
@@ -700,6 +850,7 @@ cdef class Manifold(Triangulation):
     def _complex_volume(self):
         cdef Complex volume
         cdef int accuracy
+        _ensure_structure(self)
         if True in self.cusp_info('is_complete'):
             self._cusped_complex_volume(&volume, &accuracy)
             set_CS_value(self.c_triangulation, volume.imag / PI_SQUARED_BY_2)
@@ -740,6 +891,7 @@ cdef class Manifold(Triangulation):
             sage: M.volume(verified=True, bits_prec=100)   #doctest: +NUMERIC24
             2.029883212819307250042405109?
         """
+        _ensure_structure(self)
 
         if verified or bits_prec:
             if accuracy:
@@ -838,6 +990,7 @@ cdef class Manifold(Triangulation):
         currently known' if the first call to chern_simons is not
         made.
         """
+        _ensure_structure(self)
 
         cs = self._chern_simons()
         if accuracy:
@@ -858,6 +1011,7 @@ cdef class Manifold(Triangulation):
         return Triangulation_from_Manifold(self)
 
     def _polish_hyperbolic_structures(self):
+        _ensure_structure(self)
         polish_hyperbolic_structures(self.c_triangulation)
 
     def tetrahedra_shapes(self, part=None, fixed_alignment=True,
@@ -894,6 +1048,7 @@ cdef class Manifold(Triangulation):
         cdef Real rect_re, rect_im, log_re, log_im
         cdef int acc_rec_re, acc_rec_im, acc_log_re, acc_log_im
         cdef Boolean is_geometric
+        _ensure_structure(self)
 
         if self.c_triangulation is NULL:
             return []
@@ -991,6 +1146,7 @@ cdef class Manifold(Triangulation):
         cdef int acc_rec_re, acc_rec_im, acc_log_re, acc_log_im
         cdef Boolean is_geometric
         cdef c_FillingStatus soln
+        _ensure_structure(self)
 
         if which_solution == 'filled':
             soln = filled
@@ -1020,6 +1176,7 @@ cdef class Manifold(Triangulation):
         cdef int i, N
         cdef Complex *filled_shape_array = NULL
         cdef Complex *complete_shape_array = NULL
+        _ensure_structure(self)
 
         if self.c_triangulation is NULL:
             raise ValueError('The Triangulation is empty.')
@@ -1081,6 +1238,7 @@ cdef class Manifold(Triangulation):
         'contains degenerate tetrahedra'
         """
         cdef c_SolutionType solution_type
+        _ensure_structure(self)
 
         if self.c_triangulation is NULL:
             raise ValueError('The Triangulation is empty.')
@@ -1101,6 +1259,7 @@ cdef class Manifold(Triangulation):
         equations are modified, but not solved.
         """
         cdef Complex c_target
+        _ensure_structure(self)
         c_target = Object2Complex(target)
         set_target_holonomy(self.c_triangulation,
                             which_cusp, c_target, recompute)
@@ -1165,6 +1324,7 @@ cdef class Manifold(Triangulation):
         cdef Complex initial_modulus, current_modulus
         cdef int meridian_accuracy, longitude_accuracy, singularity_index, accuracy
         cdef Complex c_meridian, c_longitude, c_core_length
+        _ensure_structure(self)
 
         if self.c_triangulation is NULL:
             raise ValueError('The Triangulation is empty.')
@@ -1262,8 +1422,12 @@ cdef class Manifold(Triangulation):
 
         Does not return a new Manifold.
         """
+        cdef c_Triangulation* c_triangulation
         Triangulation.dehn_fill(self, filling_data, which_cusp)
-        do_Dehn_filling(self.c_triangulation)
+        c_triangulation = self.c_triangulation
+        if not self._deferred_structure:
+            with nogil:
+                do_Dehn_filling(c_triangulation)
         self._cache.clear(message='Manifold.dehn_fill')
 
     def set_peripheral_curves(self, peripheral_data,
@@ -1363,6 +1527,7 @@ cdef class Manifold(Triangulation):
             if which_cusp is not None:
                 raise ValueError("You must apply 'shortest' to all "
                                  "of the cusps.")
+            _ensure_structure(self)
             if return_matrices:
                 matrices = <MatrixInt22 *>malloc(self.num_cusps() *
                                                  sizeof(MatrixInt22))
@@ -1419,6 +1584,7 @@ cdef class Manifold(Triangulation):
         cdef DualOneSkeletonCurve **curve_list
         cdef c_MatrixParity parity
         cdef Complex complete_length, filled_length
+        _ensure_structure(self)
 
         if self.c_triangulation is NULL:
             raise ValueError('The Triangulation is empty.')
@@ -1468,6 +1634,7 @@ cdef class Manifold(Triangulation):
         >>> L[0].length # doctest: +NUMERIC6
         0.584603685017987 + 2.495370455560469*I
         """
+        _ensure_structure(self)
         args = (cutoff, full_rigor, grouped, include_words)
         try:
             return self._cache.lookup('length_spectrum', *args)
@@ -1500,6 +1667,7 @@ cdef class Manifold(Triangulation):
         cdef c_Triangulation *c_triangulation
         cdef Triangulation result
         cdef char* c_new_name
+        _ensure_structure(self)
 
         if isinstance(which_curve, DualCurveInfo):
             max_segments = which_curve.max_segments
@@ -1565,12 +1733,22 @@ cdef class Manifold(Triangulation):
         Note: The answer True is rigorous, but the answer False may
         not be as there could be numerical errors resulting in finding
         an incorrect canonical triangulation.
+
+        When both manifolds are cusped with all cusps complete and the
+        isometries are not requested, their cached isometry signatures
+        are compared, so that each manifold is only canonized once
+        however many others it is compared with.
         """
         cdef Boolean are_isometric
         cdef c_FuncResult result
         cdef IsometryList *isometries = NULL
+        cdef IsometryList **isometries_ptr = NULL
+        cdef c_Triangulation* c_triangulation0 = self.c_triangulation
+        cdef c_Triangulation* c_triangulation1 = other.c_triangulation
+        _ensure_structure(self)
+        _ensure_structure(other)
 
-        if self.c_triangulation is NULL or other.c_triangulation is NULL:
+        if c_triangulation0 is NULL or c_triangulation1 is NULL:
             raise ValueError('Manifolds must be non-empty.')
 
         try:
@@ -1582,15 +1760,23 @@ cdef class Manifold(Triangulation):
         except ValueError:
             pass
 
+        if not return_isometries:
+            cusps0 = self.cusp_info('is_complete')
+            cusps1 = other.cusp_info('is_complete')
+            if cusps0 and cusps1 and False not in cusps0 + cusps1:
+                try:
+                    return (self._isometry_signature() ==
+                            other._isometry_signature())
+                except RuntimeError:
+                    pass
+
         if return_isometries:
-            result = compute_isometries(self.c_triangulation,
-                                        other.c_triangulation,
+            isometries_ptr = &isometries
+        with nogil:
+            result = compute_isometries(c_triangulation0,
+                                        c_triangulation1,
                                         &are_isometric,
-                                        &isometries, NULL)
-        else:
-            result = compute_isometries(self.c_triangulation,
-                                        other.c_triangulation,
-                                        &are_isometric, NULL, NULL)
+                                        isometries_ptr, NULL)
 
         if FuncResult[result] == 'func_bad_input':
             raise ValueError('The Dehn filling coefficients must be '
@@ -1633,12 +1819,14 @@ cdef class Manifold(Triangulation):
         cdef Boolean is_two_bridge
         cdef long int p, q
         cdef c_Triangulation *c_canonized_triangulation
+        _ensure_structure(self)
 
         if self.c_triangulation is NULL:
             return False
 
         copy_triangulation(self.c_triangulation, &c_canonized_triangulation)
-        proto_canonize(c_canonized_triangulation)
+        with nogil:
+            proto_canonize(c_canonized_triangulation)
         two_bridge(c_canonized_triangulation, &is_two_bridge, &p, &q)
         free_triangulation(c_canonized_triangulation)
         if is_two_bridge:
@@ -1647,6 +1835,7 @@ cdef class Manifold(Triangulation):
             return False
 
     def _choose_generators(self, compute_corners, centroid_at_origin):
+        _ensure_structure(self)
         choose_generators(self.c_triangulation,
                           compute_corners,
                           centroid_at_origin)
@@ -1661,6 +1850,7 @@ cdef class Manifold(Triangulation):
         cdef Complex c0, c1, c2, c3
         cdef int neighbor0_idx, neighbor1_idx, neighbor2_idx, neighbor3_idx
         cdef int perm0, perm1, perm2, perm3
+        _ensure_structure(self)
 
         ans = []
         for i in range(self.num_tetrahedra()):
@@ -1764,6 +1954,7 @@ cdef class Manifold(Triangulation):
         cdef int num_surfaces
         cdef c_Triangulation *pieces[2]
         cdef Manifold M0, M1
+        _ensure_structure(self)
 
         if self.c_triangulation is NULL:
             raise ValueError('The Triangulation is empty.')
@@ -1808,6 +1999,7 @@ cdef class Manifold(Triangulation):
 
     def _cusp_cross_section_info(self):
         cdef c_Tetrahedron *tet
+        _ensure_structure(self)
         allocate_cross_sections(self.c_triangulation)
         compute_cross_sections(self.c_triangulation)
         compute_tilts(self.c_triangulation)
@@ -1831,3 +2023,13 @@ cdef class Manifold(Triangulation):
 
         free_cross_sections(self.c_triangulation)
         return tilts, side_lengths
+
+
+cdef _ensure_structure(Manifold M):
+    """
+    Compute the hyperbolic structure of a lazily constructed manifold
+    if it has not been computed yet.  This is a function rather than a
+    method so that it can be used while the manifold is constructed.
+    """
+    if M._deferred_structure:
+        M.init_hyperbolic_structure()
@@ -14,8 +14,9 @@
 # These functions are limited to manifolds with at most 255 cusps
 # such that the normal coordinates for the peripheral curves are assumed
 # to be in the interval [-128, 127].  Also the Dehn filling coefficients
-# must be integers in that interval.  If these conditions do not hold
-# then the _to_string method can be used as an alternative.
+# must be integers in that interval.  Triangulations are now pickled
+# with pickle_triangulation_varint, which has no such limits, and
+# unpickle_triangulation is kept to read existing pickles.
 #
 # Note that the byte sequences produced by pickle_triangulation
 # are very likely to contain null bytes, so care must be taken
@@ -309,6 +310,367 @@ cdef int unpickle_tetrahedron_data(c_TetrahedronData *data, bytes pickle,
     return n
 
 
+# The varint format
+#
+# pickle_triangulation_varint and unpickle_triangulation_varint
+# serialize the same TriangulationData structure, but every integer
+# is written as a little endian base 128 varint, with signed integers
+# zigzag encoded, so that there are no limits on the number of
+# tetrahedra or cusps, on the peripheral curve weights or on the
+# Dehn filling coefficients.  A pickle consists of b'varint:' followed
+# by
+#
+#   flags, num_tetrahedra, num_or_cusps, num_nonor_cusps
+#   the Dehn filling coefficients, unless all cusps are complete
+#   for each tetrahedron: the 4 neighbors, the 4 gluings packed into
+#   a byte each, the 4 cusp indices and the 4 groups of 16 curve
+#   weights, each as a 16 bit mask of the nonzero weights followed
+#   by those weights
+#   the length of the name, followed by the name
+#   optionally, the filled and complete shape of each tetrahedron
+#
+# Non-integral filling coefficients and the shapes are written as
+# little endian doubles.  The decoder reads from a buffer, so the
+# pickles packed into one buffer by pack_triangulations can be
+# unpickled without copying them.
+
+cdef enum:
+    VARINT_ORIENTABILITY = 0x3
+    VARINT_COMPLETE = 1 << 2
+    VARINT_REAL_FILLINGS = 1 << 3
+    VARINT_SHAPES = 1 << 4
+
+# An upper bound on the encoded size of one tetrahedron: 8 varints of
+# at most 5 bytes, 4 gluing bytes and 4 masks followed by up to 16
+# curve weights of at most 5 bytes each.
+cdef enum:
+    VARINT_MAX_TET_SIZE = 8*5 + 4 + 4*(3 + 16*5)
+
+cdef inline Py_ssize_t put_varint(unsigned char* buf, Py_ssize_t n,
+                                  unsigned long long x) nogil:
+    while x >= 0x80:
+        buf[n] = (x & 0x7f) | 0x80
+        x >>= 7
+        n += 1
+    buf[n] = <unsigned char>x
+    return n + 1
+
+cdef inline Py_ssize_t put_signed(unsigned char* buf, Py_ssize_t n,
+                                  long long x) nogil:
+    return put_varint(buf, n, ((<unsigned long long>x) << 1) ^
+                      (<unsigned long long>(x >> 63)))
+
+cdef inline Py_ssize_t put_double(unsigned char* buf, Py_ssize_t n,
+                                  double x) nogil:
+    cdef unsigned long long bits
+    cdef int i
+    memcpy(&bits, &x, 8)
+    for i in range(8):
+        buf[n + i] = (bits >> (8*i)) & 0xff
+    return n + 8
+
+cdef class _VarintReader:
+    """
+    Reads varints and doubles from a buffer, raising ValueError
+    instead of reading past its end.
+    """
+    cdef const unsigned char[:] data
+    cdef Py_ssize_t n
+
+    def __cinit__(self, const unsigned char[:] data, Py_ssize_t start):
+        self.data = data
+        self.n = start
+
+    cdef unsigned long long read_varint(self) except? 0xffffffffffffffff:
+        cdef unsigned long long x = 0
+        cdef int shift = 0
+        cdef unsigned char byte
+        while True:
+            if self.n >= self.data.shape[0] or shift > 63:
+                raise ValueError('Invalid varint pickle')
+            byte = self.data[self.n]
+            self.n += 1
+            x |= (<unsigned long long>(byte & 0x7f)) << shift
+            if byte < 0x80:
+                return x
+            shift += 7
+
+    cdef long long read_signed(self) except? -0x7fffffffffffffff:
+        cdef unsigned long long x = self.read_varint()
+        return <long long>(x >> 1) ^ -(<long long>(x & 1))
+
+    cdef int read_index(self, long long bound) except -2:
+        cdef unsigned long long x = self.read_varint()
+        if x >= <unsigned long long>bound:
+            raise ValueError('Invalid varint pickle')
+        return <int>x
+
+    cdef unsigned char read_byte(self) except? 0xff:
+        if self.n >= self.data.shape[0]:
+            raise ValueError('Invalid varint pickle')
+        self.n += 1
+        return self.data[self.n - 1]
+
+    cdef double read_double(self) except? -1.0:
+        cdef unsigned long long bits = 0
+        cdef double x
+        cdef int i
+        if self.n + 8 > self.data.shape[0]:
+            raise ValueError('Invalid varint pickle')
+        for i in range(8):
+            bits |= (<unsigned long long>self.data[self.n + i]) << (8*i)
+        self.n += 8
+        memcpy(&x, &bits, 8)
+        return x
+
+cdef pickle_triangulation_varint(c_Triangulation *tri, shapes=None):
+    """
+    Pickle a Triangulation in the varint format.  If shapes is given,
+    it must be a list of pairs (filled shape, complete shape), one for
+    each tetrahedron, which are stored with the triangulation.
+    """
+    cdef TriangulationData* tri_data
+    cdef c_TetrahedronData* tet
+    cdef unsigned char* buf = NULL
+    cdef Py_ssize_t n = 0, size, mask_start
+    cdef int i, j, a, b, v, f, num_cusps, flags, curve
+    cdef unsigned int mask
+    cdef double M, L
+    cdef unsigned char* curve_buf
+    cdef unsigned char curves[16*5]
+    cdef Py_ssize_t count
+
+    triangulation_to_data(tri, &tri_data)
+    try:
+        name = bytes(tri_data.name)
+        num_cusps = tri_data.num_or_cusps + tri_data.num_nonor_cusps
+        flags = <int>tri_data.orientability
+        fillings = [(<double>tri_data.cusp_data[j].m,
+                     <double>tri_data.cusp_data[j].l)
+                    for j in range(num_cusps)]
+        if all(M == 0.0 and L == 0.0 for M, L in fillings):
+            flags |= VARINT_COMPLETE
+        elif not all(M == floor(M) and L == floor(L) and
+                     abs(M) < 2.0**62 and abs(L) < 2.0**62
+                     for M, L in fillings):
+            flags |= VARINT_REAL_FILLINGS
+        if shapes is not None:
+            shapes = [(complex(z), complex(w)) for z, w in shapes]
+            if len(shapes) != tri_data.num_tetrahedra:
+                raise ValueError('There must be one pair of shapes '
+                                 'for each tetrahedron.')
+            flags |= VARINT_SHAPES
+        size = (64 + len(name) + 20*num_cusps +
+                (VARINT_MAX_TET_SIZE + 32)*tri_data.num_tetrahedra)
+        buf = <unsigned char*>malloc(size)
+        if buf == NULL:
+            raise RuntimeError('Failed to allocate memory for the pickle.')
+        n = put_varint(buf, n, flags)
+        n = put_varint(buf, n, tri_data.num_tetrahedra)
+        n = put_varint(buf, n, tri_data.num_or_cusps)
+        n = put_varint(buf, n, tri_data.num_nonor_cusps)
+        if flags & VARINT_REAL_FILLINGS:
+            for M, L in fillings:
+                n = put_double(buf, n, M)
+                n = put_double(buf, n, L)
+        elif not flags & VARINT_COMPLETE:
+            for M, L in fillings:
+                n = put_signed(buf, n, <long long>M)
+                n = put_signed(buf, n, <long long>L)
+        for i in range(tri_data.num_tetrahedra):
+            tet = &tri_data.tetrahedron_data[i]
+            for j in range(4):
+                n = put_varint(buf, n, tet.neighbor_index[j])
+            # Pack each permutation into a byte, like SnapPea does.
+            for j in range(4):
+                buf[n] = (tet.gluing[j][0] | tet.gluing[j][1] << 2 |
+                          tet.gluing[j][2] << 4 | tet.gluing[j][3] << 6)
+                n += 1
+            for j in range(4):
+                n = put_signed(buf, n, tet.cusp_index[j])
+            for a in range(2):
+                for b in range(2):
+                    mask, count = 0, 0
+                    for v in range(4):
+                        for f in range(4):
+                            curve = tet.curve[a][b][v][f]
+                            if curve != 0:
+                                mask |= 1 << (4*v + f)
+                                count = put_signed(curves, count, curve)
+                    n = put_varint(buf, n, mask)
+                    memcpy(buf + n, curves, count)
+                    n += count
+        n = put_varint(buf, n, len(name))
+        result = b'varint:' + buf[:n] + name
+        if shapes is not None:
+            n = 0
+            for z, w in shapes:
+                n = put_double(buf, n, z.real)
+                n = put_double(buf, n, z.imag)
+                n = put_double(buf, n, w.real)
+                n = put_double(buf, n, w.imag)
+            result += buf[:n]
+        return result
+    finally:
+        free(buf)
+        free_triangulation_data(tri_data)
+
+cdef c_Triangulation* unpickle_triangulation_varint(
+        const unsigned char[:] pickle, list shapes) except *:
+    """
+    Unpickle a Triangulation from a buffer holding a pickle in the
+    varint format.  If the pickle includes shapes, the pairs (filled
+    shape, complete shape) are appended to the list shapes.
+    """
+    cdef c_TetrahedronData* tets = NULL
+    cdef c_CuspData* cusps = NULL
+    cdef c_TetrahedronData* tet
+    cdef c_Triangulation *tri
+    cdef TriangulationData tri_data
+    cdef int i, j, a, b, v, f, flags, num_tets, num_cusps
+    cdef unsigned int mask
+    cdef unsigned char perm
+    cdef _VarintReader reader
+
+    if pickle.shape[0] < 7 or bytes(pickle[:7]) != b'varint:':
+        raise ValueError('Invalid varint pickle')
+    reader = _VarintReader(pickle, 7)
+    flags = reader.read_index(1 << 5)
+    tri_data.solution_type = not_attempted
+    tri_data.volume = <Real>0.0
+    tri_data.orientability = <c_Orientability>(flags & VARINT_ORIENTABILITY)
+    tri_data.CS_value_is_known = 0
+    tri_data.CS_value = <Real>0.0
+    num_tets = reader.read_index(1 << 30)
+    tri_data.num_tetrahedra = num_tets
+    tri_data.num_or_cusps = reader.read_index(1 << 30)
+    tri_data.num_nonor_cusps = reader.read_index(1 << 30)
+    num_cusps = tri_data.num_or_cusps + tri_data.num_nonor_cusps
+    # Every cusp meets some tetrahedron, so this rejects absurd sizes
+    # before allocating memory for them.
+    if num_cusps > 4*num_tets or 4*num_tets > pickle.shape[0]:
+        raise ValueError('Invalid varint pickle')
+
+    try:
+        # Use malloc (not mymalloc) to allocate memory for the data.
+        # We free the memory before returning.
+        if num_cusps > 0:
+            cusps = <c_CuspData*>malloc(num_cusps*sizeof(c_CuspData))
+            if cusps == NULL:
+                raise RuntimeError('Failed to allocate memory for cusps')
+        for i in range(num_cusps):
+            if i < tri_data.num_or_cusps:
+                cusps[i].topology = torus_cusp
+            else:
+                cusps[i].topology = Klein_cusp
+            if flags & VARINT_COMPLETE:
+                cusps[i].m = <Real>0.0
+                cusps[i].l = <Real>0.0
+            elif flags & VARINT_REAL_FILLINGS:
+                cusps[i].m = <Real>reader.read_double()
+                cusps[i].l = <Real>reader.read_double()
+            else:
+                cusps[i].m = <Real><double>reader.read_signed()
+                cusps[i].l = <Real><double>reader.read_signed()
+        tri_data.cusp_data = cusps
+
+        tets = <c_TetrahedronData*>malloc(num_tets*sizeof(c_TetrahedronData))
+        if tets == NULL:
+            raise RuntimeError('Failed to allocate memory for tets.')
+        for i in range(num_tets):
+            tet = &tets[i]
+            for j in range(4):
+                tet.neighbor_index[j] = reader.read_index(num_tets)
+            for j in range(4):
+                perm = reader.read_byte()
+                for v in range(4):
+                    tet.gluing[j][v] = (perm >> (2*v)) & 0x3
+            for j in range(4):
+                tet.cusp_index[j] = <int>reader.read_signed()
+                if not -num_tets <= tet.cusp_index[j] < num_cusps:
+                    raise ValueError('Invalid varint pickle')
+            for a in range(2):
+                for b in range(2):
+                    mask = reader.read_index(1 << 16)
+                    for v in range(4):
+                        for f in range(4):
+                            if mask & (1 << (4*v + f)):
+                                tet.curve[a][b][v][f] = <int>reader.read_signed()
+                            else:
+                                tet.curve[a][b][v][f] = 0
+        tri_data.tetrahedron_data = tets
+
+        j = reader.read_index(pickle.shape[0] + 1 - reader.n)
+        py_name = bytes(pickle[reader.n:reader.n + j])
+        reader.n += j
+        tri_data.name = py_name
+        if flags & VARINT_SHAPES:
+            for i in range(num_tets):
+                z = complex(reader.read_double(), reader.read_double())
+                w = complex(reader.read_double(), reader.read_double())
+                shapes.append((z, w))
+
+        data_to_triangulation(&tri_data, &tri)
+    finally:
+        free(tets)
+        free(cusps)
+    return tri
+
+def pack_triangulations(triangulations, include_shapes=False):
+    """
+    Packs the pickles of the given Triangulations or Manifolds into
+    one bytes object, which unpack_triangulations turns back into a
+    list.  The buffer can be sent to another process, or placed in
+    shared memory, and unpacked there without copying the pickles.
+
+    >>> M, N = Manifold('m004'), Manifold('m125(2,3)(0,0)')
+    >>> data = pack_triangulations([M, N], include_shapes=True)
+    >>> unpack_triangulations(data)
+    [m004(0,0), m125(2,3)(0,0)]
+    """
+    cdef unsigned char* buf
+    cdef Py_ssize_t n = 0
+    pickles = [T.pickle(include_shapes=True)
+               if include_shapes and isinstance(T, Manifold) else T.pickle()
+               for T in triangulations]
+    buf = <unsigned char*>malloc(10*(len(pickles) + 1))
+    if buf == NULL:
+        raise RuntimeError('Failed to allocate memory for the header.')
+    try:
+        n = put_varint(buf, n, len(pickles))
+        for pickle in pickles:
+            n = put_varint(buf, n, len(pickle))
+        header = b'varpack:' + buf[:n]
+    finally:
+        free(buf)
+    return b''.join([header] + pickles)
+
+def unpack_triangulations(buffer, cls=None):
+    """
+    Returns the list of Triangulations or Manifolds, of class cls,
+    packed into buffer by pack_triangulations.  By default they are
+    Manifolds.  The buffer can be any object supporting the buffer
+    protocol, e.g. a memoryview of shared memory.
+    """
+    cdef const unsigned char[:] data = buffer
+    cdef _VarintReader reader
+    cdef Py_ssize_t i, count, start
+    if cls is None:
+        cls = _manifold_class
+    if data.shape[0] < 8 or bytes(data[:8]) != b'varpack:':
+        raise ValueError('Invalid packed triangulations')
+    reader = _VarintReader(data, 8)
+    count = reader.read_index(data.shape[0])
+    lengths = [reader.read_index(data.shape[0] + 1) for i in range(count)]
+    view = memoryview(buffer).cast('B')
+    start, result = reader.n, []
+    for length in lengths:
+        if start + length > data.shape[0]:
+            raise ValueError('Invalid packed triangulations')
+        result.append(cls(view[start:start + length]))
+        start += length
+    return result
+
 cdef c_Triangulation* listlike_to_triangulation(listlike,
                                                 num_or_cusps=0,
                                                 num_nonor_cusps=0,
@@ -289,6 +289,54 @@ def get_HT_knot_by_index(alternation, index, manifold_class):
     return manifold_class(name)
 
 
+#   Archives
+
+class IndexedArchive:
+    """
+    Random access to the members of a (possibly compressed) tar
+    archive.  Reading a member of a gzipped tarball with tarfile
+    decompresses the archive from the beginning, so this
+    decompresses it once into a temporary file and remembers the
+    offset and size of each member.  Several threads may read from
+    it at the same time.
+    """
+    def __init__(self, path):
+        self.file = tempfile.TemporaryFile()
+        self.index = {}
+        self._lock = threading.Lock()
+        with tarfile.open(path, 'r:*') as archive:
+            for member in archive:
+                if member.isfile():
+                    self.index[member.name] = (self.file.tell(), member.size)
+                    self.file.write(archive.extractfile(member).read())
+        self.file.flush()
+
+    def read(self, name):
+        offset, size = self.index[name]
+        if hasattr(os, 'pread'):
+            return os.pread(self.file.fileno(), size, offset)
+        # Without pread, the seek and read on the shared file must not
+        # be interleaved with those of another thread.
+        with self._lock:
+            self.file.seek(offset)
+            return self.file.read(size)
+
+
+_indexed_archives = {}
+_indexed_archives_lock = threading.Lock()
+
+
+def indexed_archive(path):
+    """
+    The IndexedArchive for the tarball at path, which is built the
+    first time it is requested.
+    """
+    with _indexed_archives_lock:
+        if path not in _indexed_archives:
+            _indexed_archives[path] = IndexedArchive(path)
+        return _indexed_archives[path]
+
+
 #   Iterators
 
 class Census:
@@ -375,7 +423,8 @@ class CuspedCensus(Census):
 
     def __init__(self, indices=(0, length, 1)):
         Census.__init__(self, indices)
-        self.Census_Morwen8 = tarfile.open(os.path.join(manifold_path, 'morwen8.tgz'), 'r:*')
+        self.Census_Morwen8 = indexed_archive(
+            os.path.join(manifold_path, 'morwen8.tgz'))
 
     # Override
     def lookup(self, n):
@@ -407,7 +456,7 @@ class CuspedCensus(Census):
             spec = "t" + "0"*(5 - len(num)) + num
             tarpath = "morwen8/" + spec
             try:
-                filedata = self.Census_Morwen8.extractfile(tarpath).read()
+                filedata = self.Census_Morwen8.read(tarpath)
                 c_triangulation = read_triangulation_from_string(filedata)
             except:
                 raise IOError('The Morwen 8 tetrahedra manifold %s '
@@ -570,7 +619,7 @@ class ObsCensusKnots(Census):
 
     def __init__(self, indices=(0, sum(census_knot_numbers), 1)):
         Census.__init__(self, indices)
-        self.Census_Knots = tarfile.open(census_knot_archive, 'r:*')
+        self.Census_Knots = indexed_archive(census_knot_archive)
 
     def __repr__(self):
         return 'Knots in S^3 which appear in the SnapPea Census'
@@ -590,7 +639,7 @@ class ObsCensusKnots(Census):
             if name:
                 tarpath = 'CensusKnots/%s' % name
                 try:
-                    filedata = self.Census_Knots.extractfile(tarpath).read()
+                    filedata = self.Census_Knots.read(tarpath)
                     c_triangulation = read_triangulation_from_string(filedata)
                 except:
                     raise IOError("The census knot %s was not found." % name)
@@ -617,7 +666,7 @@ class ObsLinkExteriors(Census):
     max_crossings = 11
 
     def __init__(self, components, indices=(0, 10000, 1)):
-        self.Christy_links = tarfile.open(link_archive, 'r:*')
+        self.Christy_links = indexed_archive(link_archive)
 
         if not (1 <= components < len(self.num_links)):
             raise IndexError('SnapPy has no data on links with '
@@ -651,7 +700,7 @@ class ObsLinkExteriors(Census):
                     name = "%d_%d" % (k, l)
                 tarpath = 'ChristyLinks/%s' % filename
                 try:
-                    filedata = self.Christy_links.extractfile(tarpath).read()
+                    filedata = self.Christy_links.read(tarpath)
                     c_triangulation = read_triangulation_from_string(filedata)
                 except:
                     raise IOError('The link complement %s was not '
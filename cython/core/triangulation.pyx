@@ -1,6 +1,150 @@
 from .cache import SnapPyCache
 import low_index
 
+
+def _cover_type(rep):
+    """
+    The type of the cover given by a transitive permutation
+    representation: 'cyclic', 'regular' or 'irregular'.  The cover is
+    regular when the group generated by the permutations acts simply
+    transitively, i.e. has order equal to the degree.
+    """
+    degree = len(rep[0]) if rep else 1
+    identity = tuple(range(degree))
+    gens = [tuple(perm) for perm in rep]
+    elements, new = {identity}, [identity]
+    while new:
+        current, new = new, []
+        for x in current:
+            for g in gens:
+                y = tuple(g[i] for i in x)
+                if y not in elements:
+                    if len(elements) == degree:
+                        return 'irregular'
+                    elements.add(y)
+                    new.append(y)
+
+    def order(perm):
+        n, x = 1, perm
+        while x != identity:
+            x, n = tuple(perm[i] for i in x), n + 1
+        return n
+    is_cyclic = any(order(x) == degree for x in elements)
+    return 'cyclic' if is_cyclic else 'regular'
+
+
+def _cover_relation_matrix(relators, int num_generators, rep):
+    """
+    Reidemeister-Schreier for abelianizations.  Given the relators of
+    a presentation of a group G, as lists of nonzero integers, and a
+    transitive permutation representation of G of degree d, returns a
+    sparse presentation matrix for the abelianization of the
+    stabilizer of 0, i.e. the first homology of the corresponding
+    cover.
+
+    The generators of the subgroup are the edges (i, g) of the Schreier
+    graph, minus those in a spanning tree, and each relator gives one
+    relation for each of the d vertices it can be lifted to.
+    """
+    cdef int degree = len(rep[0]) if rep else 1
+    cdef int i, j, g, letter, column
+    perms = [list(perm) for perm in rep] or [[0]] * num_generators
+    inverses = []
+    for perm in perms:
+        inverse = [0] * degree
+        for i in range(degree):
+            inverse[perm[i]] = i
+        inverses.append(inverse)
+    # Breadth first spanning tree of the Schreier graph.
+    in_tree = set()
+    seen, queue = {0}, [0]
+    while queue:
+        i = queue.pop(0)
+        for g in range(num_generators):
+            j = perms[g][i]
+            if j not in seen:
+                seen.add(j)
+                queue.append(j)
+                in_tree.add(i * num_generators + g)
+            j = inverses[g][i]
+            if j not in seen:
+                seen.add(j)
+                queue.append(j)
+                in_tree.add(j * num_generators + g)
+    columns = {}
+    for column in range(degree * num_generators):
+        if column not in in_tree:
+            columns[column] = len(columns)
+    matrix = PresentationMatrix(len(relators) * degree, len(columns))
+    row = 0
+    for relator in relators:
+        for start in range(degree):
+            i = start
+            for letter in relator:
+                if letter > 0:
+                    g = letter - 1
+                    column = i * num_generators + g
+                    i = perms[g][i]
+                    if column in columns:
+                        matrix[row, columns[column]] += 1
+                else:
+                    g = -letter - 1
+                    i = inverses[g][i]
+                    column = i * num_generators + g
+                    if column in columns:
+                        matrix[row, columns[column]] -= 1
+            row += 1
+    return matrix
+
+
+class CoverDescriptor():
+    """
+    A finite cover of a Triangulation or Manifold, as yielded by
+    iter_covers.  It holds the permutation representation, or the
+    subgroup, which specifies the cover, and the cover itself is only
+    constructed when the method cover is first called.
+    """
+    def __init__(self, base, permutation_rep, degree, cover=None):
+        self.base = base
+        self.permutation_rep = permutation_rep
+        self.degree = degree
+        self._cover = cover
+
+    def cover(self):
+        """
+        Return the cover, constructing it on the first call.
+        """
+        if self._cover is None:
+            self._cover = self.base.cover(self.permutation_rep)
+        return self._cover
+
+    def homology(self):
+        """
+        Return the first homology group of the cover.  When the cover
+        is given by a permutation representation and has not been
+        constructed, the homology is computed from the fundamental
+        group of the base by the Reidemeister-Schreier method, as in
+        cover_homologies.  Otherwise it is computed from the cover
+        with homology(method='sparse').  Either way the presentation
+        matrix is simplified by sparse elimination.
+
+        >>> M = Triangulation('m003')
+        >>> sorted(C.homology() for C in M.iter_covers(4))
+        [Z/3 + Z/15 + Z, Z/5 + Z + Z]
+        >>> [C.homology() for C in M.iter_covers(4, cover_type='cyclic')]
+        [Z/3 + Z/15 + Z]
+        """
+        if self._cover is None and isinstance(self.permutation_rep, list):
+            relators, num_generators = self.base._cover_homology_relators()
+            matrix = _cover_relation_matrix(relators, num_generators,
+                                            self.permutation_rep)
+            return AbelianGroup(
+                elementary_divisors=matrix.elementary_divisors())
+        return self.cover().homology(method='sparse')
+
+    def __repr__(self):
+        return 'Cover of %s of degree %d' % (self.base.name(), self.degree)
+
 _low_index_version = [int(n) for n in low_index.version().split('.')]
 
 cdef class Triangulation():
@@ -95,7 +239,7 @@ cdef class Triangulation():
                 spec = getattr(spec, attr)()
                 break
         if spec is not None and spec != 'empty':
-            if not isinstance(spec, (str, bytes)):
+            if not isinstance(spec, (str, bytes, memoryview)):
                 raise TypeError(triangulation_help %
                                 self.__class__.__name__)
             self.get_triangulation(spec, remove_finite_vertices)
@@ -121,7 +265,8 @@ cdef class Triangulation():
 
     cdef get_triangulation(self, spec, remove_finite_vertices=True):
         # Step -1 Check for an entire-triangulation-file-in-a-string
-        if isinstance(spec, bytes) and spec.startswith(b'pickle:'):
+        if isinstance(spec, memoryview) or isinstance(spec, bytes) and (
+                spec.startswith(b'pickle:') or spec.startswith(b'varint:')):
             return self._from_pickle(spec, remove_finite_vertices)
 
         if (isinstance(spec, str) and spec.startswith('% Triangulation') or
@@ -755,14 +900,23 @@ cdef class Triangulation():
 
     def _from_pickle(self, bytestring, remove_finite_vertices=True):
         """
+        Fill an empty triangulation from a pickle generated by the
+        pickle method, given as bytes or as a memoryview.  Returns the
+        list of pairs (filled shape, complete shape) stored in the
+        pickle, which is empty unless the shapes were included.
         """
         cdef c_Triangulation* c_triangulation = NULL
         if self.c_triangulation is not NULL:
             raise ValueError('The Triangulation must be empty.')
-        c_triangulation = unpickle_triangulation(bytestring)
+        shapes = []
+        if bytestring[:7] == b'pickle:':
+            c_triangulation = unpickle_triangulation(bytes(bytestring))
+        else:
+            c_triangulation = unpickle_triangulation_varint(bytestring, shapes)
         self.set_c_triangulation(c_triangulation)
         if remove_finite_vertices:
             self._remove_finite_vertices()
+        return shapes
 
     def _from_tetrahedra_gluing_data(self, tetrahedra_data,
                                      num_or_cusps=0,
@@ -891,17 +1045,33 @@ cdef class Triangulation():
         ...
         >>> M == loads(dumps(M))
         True
+        >>> M = Manifold('m004(1.5,2)')
+        >>> loads(dumps(M))
+        m004(1.5,2)
         """
         return (self.__class__, (self.pickle(),))
 
     def pickle(self):
-        try:
-            return pickle_triangulation(self.c_triangulation)
-        except ValueError:
-            # When M has > 255 cusps or does not have integer filling
-            # coefficients and curve weights in the interval [-128, 127] we use
-            # _to_string.
-            return self._to_string()
+        """
+        Return a compact byte sequence encoding this triangulation,
+        including its Dehn filling coefficients, peripheral curves and
+        name, from which the Triangulation can be reconstructed.  There
+        are no limits on the number of tetrahedra or cusps or on the
+        size of the filling coefficients.
+
+        >>> M = Triangulation('m004(1000,-1)')
+        >>> seed = M.pickle()
+        >>> seed[:7]
+        b'varint:'
+        >>> N = Triangulation(seed)
+        >>> N
+        m004(1000,-1)
+        >>> N.triangulation_isosig() == M.triangulation_isosig()
+        True
+        """
+        if self.c_triangulation is NULL:
+            raise ValueError('The Triangulation is empty.')
+        return pickle_triangulation_varint(self.c_triangulation)
 
     def _reindex_cusps(self, permutation):
         """
@@ -1421,7 +1591,7 @@ cdef class Triangulation():
             v += 1
         return ans
 
-    def gluing_equations_pgl(self, N=2, equation_type='all'):
+    def gluing_equations_pgl(self, N=2, equation_type='all', format=None):
 
         """
         M.gluing_equations_pgl(N = 2, equation_type='all')
@@ -1500,9 +1670,16 @@ cdef class Triangulation():
 
           * cusp gluing equations for meridians: 'meridian'
           * cusp gluing equations for longitudes: 'longitude'
+
+        As for gluing_equations, the matrix can be a NumPy array,
+        format='numpy', or a SparseIntegerMatrix, format='sparse':
+
+        >>> M.gluing_equations_pgl(N = 3, format='sparse').matrix
+        SparseIntegerMatrix(shape=(12, 24), nnz=84)
         """
 
         cdef Integer_matrix_with_explanations c_matrix
+        cdef _IntegerRows rows = None
 
         if N < 2 or N > 15:
             raise ValueError('N has to be 2...15')
@@ -1517,6 +1694,8 @@ cdef class Triangulation():
         if self.c_triangulation is NULL:
             raise ValueError('The Triangulation is empty.')
 
+        if format is not None:
+            rows = _IntegerRows()
         equations = []
         explain_rows = []
         explain_cols = []
@@ -1526,7 +1705,8 @@ cdef class Triangulation():
             # Add edge equations
             get_edge_gluing_equations_pgl(self.c_triangulation,
                                           &c_matrix, N)
-            eqns, r, explain_cols = convert_and_free_integer_matrix(c_matrix)
+            eqns, r, explain_cols = convert_and_free_integer_matrix(
+                c_matrix, rows)
             equations += eqns
             explain_rows += r
 
@@ -1535,7 +1715,8 @@ cdef class Triangulation():
             # Add face equations
             get_face_gluing_equations_pgl(self.c_triangulation,
                                           &c_matrix, N)
-            eqns, r, explain_cols = convert_and_free_integer_matrix(c_matrix)
+            eqns, r, explain_cols = convert_and_free_integer_matrix(
+                c_matrix, rows)
             equations += eqns
             explain_rows += r
 
@@ -1544,7 +1725,8 @@ cdef class Triangulation():
             # Add internal equations
             get_internal_gluing_equations_pgl(self.c_triangulation,
                                               &c_matrix, N)
-            eqns, r, explain_cols = convert_and_free_integer_matrix(c_matrix)
+            eqns, r, explain_cols = convert_and_free_integer_matrix(
+                c_matrix, rows)
             equations += eqns
             explain_rows += r
 
@@ -1588,13 +1770,18 @@ cdef class Triangulation():
                                            N, i, m, l)
 
                     eqns, r, explain_cols = (
-                        convert_and_free_integer_matrix(c_matrix))
+                        convert_and_free_integer_matrix(c_matrix, rows))
                     equations += eqns
 
-        if equations == []:
+        if equations == [] and not rows:
             # cover cases N = 2, 3 and equation_type = 'internal'
             return None
 
+        if rows is not None:
+            return NeumannZagierTypeEquations(rows.to_format(format),
+                                              explain_rows,
+                                              explain_cols)
+
         return NeumannZagierTypeEquations(matrix(equations),
                                           explain_rows,
                                           explain_cols)
@@ -2072,7 +2259,7 @@ cdef class Triangulation():
             simplify = simplify,
             eliminate_fixed_ptolemys = eliminate_fixed_ptolemys)
 
-    def gluing_equations(self,form='log'):
+    def gluing_equations(self, form='log', format=None):
         """
         In the default mode, this function returns a matrix with rows
         of the form
@@ -2111,19 +2298,35 @@ cdef class Triangulation():
         [ 2  0  0  0 -8  6]
         >>> M.gluing_equations(form='rect')
         [([2, -1], [-1, 2], 1), ([-2, 1], [1, -2], 1), ([2, -6], [0, 14], 1)]
-        """
 
+        For large triangulations, where each equation only involves a
+        few tetrahedra, the matrix in the 'log' form can instead be
+        returned as a NumPy array of C ints, with format='numpy', or
+        as a SparseIntegerMatrix in compressed sparse row form, with
+        format='sparse'.  Both are built directly from the kernel's
+        arrays.
+
+        >>> M.gluing_equations(format='sparse').rows()[2]
+        [2, 0, 0, 0, -8, 6]
+        """
         cdef int **c_eqns
-        cdef int num_rows, num_cols
+        cdef int num_rows, num_cols, length
         cdef int* eqn
+        cdef _IntegerRows rows
 
         if self.c_triangulation is NULL:
             raise ValueError('The Triangulation is empty.')
+        if format is not None and form != 'log':
+            raise ValueError("The format can only be given for the "
+                             "'log' form.")
         c_eqns = get_gluing_equations(self.c_triangulation,
                                       &num_rows, &num_cols)
-        eqns = [ [ c_eqns[i][j] for j in range(num_cols) ]
-                 for i in range(num_rows) ]
-        free_gluing_equations(c_eqns, num_rows)
+        rows = _IntegerRows(num_cols)
+        try:
+            for i in range(num_rows):
+                rows.append(c_eqns[i], num_cols)
+        finally:
+            free_gluing_equations(c_eqns, num_rows)
 
         for i in range(self.num_cusps()):
             cusp_info = self.cusp_info(i)
@@ -2133,18 +2336,20 @@ cdef class Triangulation():
                 to_do = [cusp_info.filling]
             for (m, l) in to_do:
                 eqn = get_cusp_equation(self.c_triangulation,
-                                        i, int(m), int(l), &num_rows)
-                eqns.append([eqn[j] for j in range(num_rows)])
-                free_cusp_equation(eqn)
+                                        i, int(m), int(l), &length)
+                try:
+                    rows.append(eqn, length)
+                finally:
+                    free_cusp_equation(eqn)
 
         if form == 'log':
-            return matrix(eqns)
+            return rows.to_format(format)
 
         if form != 'rect':
             raise ValueError("Equations are available in 'log' and "
                              "'rect' forms only.")
         rect = []
-        for row in eqns:
+        for row in rows.to_list():
             n = self.num_tetrahedra()
             a, b = [0,]*n, [0,]*n
             c = 1
@@ -2275,7 +2480,7 @@ cdef class Triangulation():
                                "the homology presentation matrix")
         return AbelianGroup(relations)
 
-    def homology(self):
+    def homology(self, method=None):
         """
         Returns an AbelianGroup representing the first integral
         homology group of the underlying (Dehn filled) manifold.
@@ -2284,6 +2489,38 @@ cdef class Triangulation():
         >>> M.homology()
         Z/5 + Z
 
+        By default the SnapPea kernel computes the homology, falling
+        back to the slower methods below if its 32 bit integers
+        overflow.  With method='sparse', the units of the presentation
+        matrix are instead eliminated by sparse elimination with
+        arbitrary precision integers, and the Smith form of the small
+        remaining matrix is computed with PARI.  This is much faster
+        for large triangulations, e.g. covers of high degree, where
+        the kernel overflows.  If the PARI stack overflows on the
+        remaining matrix, its maximum size is temporarily doubled
+        until the computation succeeds.
+
+        >>> C = M.covers(10, cover_type='cyclic')[0]
+        >>> C.homology(method='sparse')
+        Z/5 + Z/5 + Z
+        >>> C.copy().homology()
+        Z/5 + Z/5 + Z
+
+        Here the matrix left after the elimination is 95 by 96 with
+        entries of up to 43 digits, which does not fit in a 1MB stack.
+
+        >>> from snappy.pari import pari
+        >>> sizes = pari.stacksize(), pari.stacksizemax()
+        >>> pari.allocatemem(2**20, 2**20, silent=True)
+        >>> C = M.covers(2000, cover_type='cyclic')[0]
+        >>> C.num_tetrahedra()
+        4000
+        >>> H = C.homology(method='sparse')
+        >>> [len(str(n)) for n in H.elementary_divisors()]
+        [84, 84, 1]
+        >>> (pari.stacksize(), pari.stacksizemax()) == (2**20, 2**20)
+        True
+        >>> pari.allocatemem(*sizes, silent=True)
         """
         try:
             return self._cache.lookup('homology')
@@ -2295,6 +2532,10 @@ cdef class Triangulation():
 
         if self.c_triangulation is NULL:
             return AbelianGroup()
+        if method == 'sparse':
+            return self._cache.save(self.big_homology(), 'homology')
+        elif method not in (None, 'kernel'):
+            raise ValueError("Supported methods are 'kernel' and 'sparse'.")
         H = homology(self.c_triangulation)
         if H != NULL:
             coefficient_list = []
@@ -2314,7 +2555,11 @@ cdef class Triangulation():
                           simplify_presentation = True,
                           fillings_may_affect_generators = True,
                           minimize_number_of_generators = True,
-                          try_hard_to_shorten_relators = True):
+                          try_hard_to_shorten_relators = True,
+                          max_time = None,
+                          max_relator_length = None,
+                          anytime = False,
+                          record_history = False):
         """
         Returns a FundamentalGroup object representing the fundamental
         group of the manifold.  If integer Dehn surgery parameters
@@ -2344,11 +2589,39 @@ cdef class Triangulation():
         Relators:
            CbAcB
            BacA
+
+        For large triangulations the simplification can take a long
+        time.  It can be given a budget of max_time seconds, and can
+        be stopped once some relator has more than max_relator_length
+        letters.  When the budget is exceeded, a RuntimeError is
+        raised, unless anytime=True in which case the partially
+        simplified presentation is returned.  The progress of the
+        simplification is recorded when a budget is given or
+        record_history=True, and reported by the method
+        simplification_history of the returned group.  So it is only
+        available when a group is returned: if the budget is exceeded
+        and anytime=False, the RuntimeError is all there is.
+
+        >>> N = Triangulation('m004').covers(3)[0]
+        >>> G = N.fundamental_group(max_relator_length=8, anytime=True)
+        >>> G.simplification_stopped_by(), G.num_generators()
+        ('max_relator_length', 4)
+        >>> N.fundamental_group(max_relator_length=8)
+        Traceback (most recent call last):
+           ...
+        RuntimeError: Simplifying the presentation exceeded max_relator_length.
         """
         if self.c_triangulation is NULL:
             raise ValueError('The Triangulation is empty.')
         args = (simplify_presentation, fillings_may_affect_generators,
                 minimize_number_of_generators, try_hard_to_shorten_relators)
+        if (max_time is not None or max_relator_length is not None or
+            record_history):
+            # A budgeted simplification may stop early, so is not cached.
+            return FundamentalGroup(self, *args, max_time=max_time,
+                                    max_relator_length=max_relator_length,
+                                    anytime=anytime,
+                                    record_history=record_history)
         try:
             return self._cache.lookup('fundamental_group', *args)
         except KeyError:
@@ -2386,6 +2659,8 @@ cdef class Triangulation():
         """
         cdef RepresentationIntoSn* c_representation
         cdef c_Triangulation* c_triangulation
+        cdef c_Triangulation* c_base
+        cdef int c_degree
         cdef Triangulation cover
 
         if self.c_triangulation is NULL:
@@ -2441,9 +2716,12 @@ cdef class Triangulation():
         # function "fundamental_group" on a copy of self.c_triangulation.
         free_group_presentation(compute_unsimplified_presentation(self.c_triangulation))
 
-        c_triangulation = construct_cover(self.c_triangulation,
-                                          c_representation,
-                                          <int>degree)
+        c_base = self.c_triangulation
+        c_degree = degree
+        with nogil:
+            c_triangulation = construct_cover(c_base,
+                                              c_representation,
+                                              c_degree)
         cover = self.__class__('empty')
         cover.set_c_triangulation(c_triangulation)
         cover._cover_info = info = {
@@ -2521,9 +2799,147 @@ cdef class Triangulation():
         raise ValueError("Supported methods are 'low_index', 'gap', 'magma' "
                          "and 'snappea'")
 
-    def _covers_low_index(self, degree, num_threads=0):
+    def iter_covers(self, degree, method=None, cover_type='all',
+                    num_threads=0, stop=None):
         """
-        Compute all covers using low_index.
+        M.iter_covers(degree, method=None, cover_type='all', num_threads=0, stop=None)
+
+        A generator version of covers.  It yields a CoverDescriptor for
+        each finite cover of the given degree, which holds the
+        permutation representation of the cover and only constructs
+        the cover when its method cover is called.  This makes it
+        possible to construct the covers of large degree one at a
+        time, or to filter them by their permutation representations
+        or their homology, see CoverDescriptor.homology, without
+        constructing them.
+
+        Only the construction of the covers is streamed: all the
+        permutation representations (for 'low_index') or subgroups
+        (for 'gap') are found before the first CoverDescriptor is
+        yielded.
+
+        >>> M = Triangulation('m003')
+        >>> sorted(C.cover().homology() for C in M.iter_covers(4))
+        [Z/3 + Z/15 + Z, Z/5 + Z + Z]
+        >>> C = next(M.iter_covers(4))
+        >>> C
+        Cover of m003 of degree 4
+        >>> len(C.permutation_rep), len(C.permutation_rep[0])
+        (2, 4)
+
+        The argument num_threads is passed on to the low_index module,
+        where 0 means one thread per core.  If stop is given, the
+        generator stops after the first cover C for which stop(C) is
+        true.
+
+        >>> M = Triangulation('m125')
+        >>> betti = lambda C: C.cover().homology().betti_number()
+        >>> covers = list(M.iter_covers(5, num_threads=1,
+        ...                             stop=lambda C: betti(C) > 2))
+        >>> [betti(C) > 2 for C in covers].count(True)
+        1
+
+        The methods 'snappea', which is also used for cyclic covers,
+        and 'magma' even construct all the covers before the first
+        one is yielded.
+        """
+        if degree < 1:
+            raise ValueError('Cover degree should be at least 1')
+        if self.c_triangulation is NULL:
+            raise ValueError('The Triangulation is empty.')
+        if cover_type not in ('cyclic', 'all'):
+            raise ValueError("Supported cover_types are 'all' "
+                             "and 'cyclic'.")
+        method = 'low_index' if method is None else method.lower()
+
+        if cover_type == 'cyclic' or method in ('snappea', 'magma'):
+            descriptors = (CoverDescriptor(self, None, degree, cover)
+                           for cover in self.covers(degree, method, cover_type))
+        elif method == 'low_index':
+            descriptors = (CoverDescriptor(self, rep, degree) for rep in
+                           self._permutation_reps_low_index(degree,
+                                                            num_threads))
+        elif method == 'gap':
+            if not _within_sage:
+                raise SageNotAvailable('the "gap" method for covers requires Sage')
+            G = gap(self.fundamental_group())
+            descriptors = (CoverDescriptor(self, H, degree)
+                           for H in G.LowIndexSubgroupsFpGroup(degree)
+                           if G.Index(H) == degree)
+        else:
+            raise ValueError("Supported methods are 'low_index', 'gap', "
+                             "'magma' and 'snappea'")
+
+        for descriptor in descriptors:
+            yield descriptor
+            if stop is not None and stop(descriptor):
+                return
+
+    def cover_homologies(self, degree, cover_type='all', num_threads=0,
+                         include_cover_types=False):
+        """
+        M.cover_homologies(degree, cover_type='all', num_threads=0, include_cover_types=False)
+
+        Returns the first homology groups of the finite covers of the
+        given degree, in the same order as M.covers(degree) or, for
+        cyclic covers, as M.covers(degree, method='low_index').  The
+        covers are not constructed: the homology of each is computed
+        from its permutation representation and the presentation of
+        the fundamental group by the Reidemeister-Schreier method.
+
+        >>> M = Triangulation('m003')
+        >>> sorted(M.cover_homologies(4))
+        [Z/3 + Z/15 + Z, Z/5 + Z + Z]
+        >>> sorted(N.homology() for N in M.covers(4))
+        [Z/3 + Z/15 + Z, Z/5 + Z + Z]
+        >>> M.cover_homologies(4, cover_type='cyclic')
+        [Z/3 + Z/15 + Z]
+
+        With include_cover_types=True, pairs consisting of the type of
+        each cover and its homology are returned.
+
+        >>> M = Triangulation('m004')
+        >>> M.cover_homologies(5, include_cover_types=True)[:2]
+        [('cyclic', Z/11 + Z/11 + Z), ('irregular', Z/2 + Z + Z)]
+
+        The Dehn filling coefficients must be relatively prime integers.
+        """
+        if degree < 1:
+            raise ValueError('Cover degree should be at least 1')
+        if self.c_triangulation is NULL:
+            raise ValueError('The Triangulation is empty.')
+        if cover_type not in ('cyclic', 'all'):
+            raise ValueError("Supported cover_types are 'all' "
+                             "and 'cyclic'.")
+        relators, num_generators = self._cover_homology_relators()
+        ans = []
+        for rep in self._permutation_reps_low_index(degree, num_threads):
+            rep_type = _cover_type(rep)
+            if cover_type == 'cyclic' and rep_type != 'cyclic':
+                continue
+            matrix = _cover_relation_matrix(relators, num_generators, rep)
+            H = AbelianGroup(elementary_divisors=matrix.elementary_divisors())
+            ans.append((rep_type, H) if include_cover_types else H)
+        return ans
+
+    def _cover_homology_relators(self):
+        """
+        The relators, as lists of integers, and the number of generators
+        of the fundamental group, for computing the homology of covers
+        from their permutation representations.
+        """
+        for m, l in self.cusp_info('filling'):
+            if (m != int(m) or l != int(l) or
+                    math.gcd(int(m), int(l)) != 1 and (m, l) != (0, 0)):
+                raise ValueError('The Dehn filling coefficients must be '
+                                 'relatively prime integers.')
+        G = self.fundamental_group()
+        return G.relators(as_int_list=True), G.num_generators()
+
+    def _permutation_reps_low_index(self, degree, num_threads=0):
+        """
+        The permutation representations of the fundamental group of
+        the given degree, found by low_index.
         """
         G = self.fundamental_group()
 
@@ -2551,7 +2967,14 @@ cdef class Triangulation():
         def index(subgroup):
             return 1 if len(subgroup) == 0 else len(subgroup[0])
 
-        return [self.cover(H) for H in reps if index(H) == degree]
+        return [H for H in reps if index(H) == degree]
+
+    def _covers_low_index(self, degree, num_threads=0):
+        """
+        Compute all covers using low_index.
+        """
+        return [self.cover(H) for H in
+                self._permutation_reps_low_index(degree, num_threads)]
 
     def _covers_gap(self, degree):
         """
@@ -2586,22 +3009,23 @@ cdef class Triangulation():
         cdef c_Triangulation* cover
         cdef Triangulation T
         cdef PermutationSubgroup c_cover_type
+        cdef c_Triangulation* c_base = self.c_triangulation
+        cdef int c_degree = degree
 
         if cover_type == 'cyclic':
             c_cover_type = permutation_subgroup_Zn
         else:
             c_cover_type = permutation_subgroup_Sn
 
-        reps = find_representations(
-            self.c_triangulation, degree, c_cover_type)
+        with nogil:
+            reps = find_representations(c_base, c_degree, c_cover_type)
 
         covers = []
         rep = reps.list
         cover_count = 0
         while rep != NULL:
-            cover = construct_cover(self.c_triangulation,
-                                    rep,
-                                    reps.num_sheets)
+            with nogil:
+                cover = construct_cover(c_base, rep, reps.num_sheets)
             T = self.__class__('empty')
             T.set_c_triangulation(cover)
             T._cover_info = info = {
@@ -3024,11 +3448,10 @@ cdef class Triangulation():
             finally:
                 free(c_string)
         else:
-            result = decorated_isosig.decorated_isosig(
-                self, _triangulation_class,
-                ignore_cusp_ordering = ignore_cusp_ordering,
-                ignore_curve_orientations = ignore_curve_orientations,
-                ignore_orientation = ignore_orientation)
+            result = _decorated_isosig(self,
+                                       ignore_cusp_ordering,
+                                       ignore_curve_orientations,
+                                       ignore_orientation)
         return self._cache.save(result, 'triangulation_isosig', *args)
 
     def _symplectic_form(self, u, v):
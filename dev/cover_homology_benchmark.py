@@ -0,0 +1,40 @@
+"""
+Time for computing the homology of all covers of a given degree by
+constructing each cover, as db_utilities.cover_hash does, and by
+Triangulation.cover_homologies, which works directly with the
+permutation representations.
+
+Usage: python cover_homology_benchmark.py [num_manifolds] [max_degree]
+"""
+
+import sys
+import time
+
+import snappy
+
+
+def constructed(M, degree):
+    return sorted(C.homology() for C in M.covers(degree))
+
+
+def direct(M, degree):
+    return sorted(M.cover_homologies(degree))
+
+
+def main(num_manifolds=20, max_degree=7):
+    manifolds = list(snappy.OrientableCuspedCensus[:num_manifolds])
+    for degree in range(2, max_degree + 1):
+        times = []
+        results = []
+        for method in (constructed, direct):
+            start = time.time()
+            results.append([method(M, degree) for M in manifolds])
+            times.append(time.time() - start)
+        assert results[0] == results[1]
+        print('degree %d  covers %6.2fs  cover_homologies %6.2fs  '
+              'speedup %5.1f' % (degree, times[0], times[1],
+                                 times[0] / times[1]))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
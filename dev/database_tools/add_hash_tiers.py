@@ -0,0 +1,91 @@
+"""
+Add the columns basic_hash and cyclic_hash, the cheaper tiers of the
+staged hash used by ManifoldTable.siblings, to the tables of an
+existing manifold database, together with indexes on them.
+
+Usage: python add_hash_tiers.py manifolds.sqlite [table ...]
+
+By default all tables with a hash column are migrated.  The work is
+committed in batches and only rows whose tiers are missing are
+processed, so an interrupted migration can simply be restarted.
+
+The views orientable_closed_view and nonorientable_closed_view select
+their columns explicitly and need to be recreated to include the new
+columns of the closed census tables.
+"""
+
+import sqlite3
+import sys
+
+import snappy
+from snappy.database import split_filling_info, parse_fillings
+from snappy.db_utilities import basic_db_hash, cyclic_db_hash
+
+
+def manifold_from_row(triangulation, m=None, l=None):
+    """
+    Rebuild a manifold from the triangulation column of a cusped
+    table, or from the cuspedtriangulation, m and l columns of a
+    closed table.
+    """
+    match = split_filling_info.match(triangulation)
+    M = snappy.Manifold('empty')
+    M._from_isosig(match.group(1))
+    fillings = parse_fillings(match.group(2))
+    if m is not None:
+        fillings = [(m, l)]
+    if fillings:
+        M.dehn_fill(fillings)
+    return M
+
+
+def add_hash_tiers(connection, table, batch_size=500):
+    columns = [row[1] for row in
+               connection.execute('pragma table_info(%s)' % table)]
+    for column in ('basic_hash', 'cyclic_hash'):
+        if column not in columns:
+            connection.execute(
+                'alter table %s add column %s text' % (table, column))
+    if 'cuspedtriangulation' in columns:
+        select = 'select id, cuspedtriangulation, m, l from %s'
+    else:
+        select = 'select id, triangulation from %s'
+    select = (select + ' where cyclic_hash is null limit %d') % (
+        table, batch_size)
+    done = 0
+    while True:
+        rows = connection.execute(select).fetchall()
+        if not rows:
+            break
+        updates = []
+        for row in rows:
+            M = manifold_from_row(*row[1:])
+            updates.append((basic_db_hash(M), cyclic_db_hash(M), row[0]))
+        with connection:
+            connection.executemany(
+                'update %s set basic_hash=?, cyclic_hash=? where id=?' % table,
+                updates)
+        done += len(rows)
+        print('%s: %d rows' % (table, done))
+    with connection:
+        for column in ('basic_hash', 'cyclic_hash'):
+            connection.execute(
+                'create index if not exists %s_by_%s on %s (%s)' %
+                (table, column, table, column))
+
+
+def main(db_path, *tables):
+    connection = sqlite3.connect(db_path)
+    if not tables:
+        tables = [row[0] for row in connection.execute(
+            "select name from sqlite_master where type='table'")]
+        tables = [table for table in tables if 'hash' in
+                  [row[1] for row in
+                   connection.execute('pragma table_info(%s)' % table)]]
+    for table in tables:
+        add_hash_tiers(connection, table)
+    connection.close()
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -410,10 +410,11 @@ def make_nono_closed(dbfile):
     connection.commit()
     copy_table_to_disk(connection, table, dbfile)
 
-def make_indexes(dbfile, columns_to_index=['name']):
+def make_indexes(dbfile, columns_to_index=['name', 'hash']):
     """
     Add an index for each table on the name column. This is necessary for
-    joins as well as looking up manifolds quickly.
+    joins as well as looking up manifolds quickly.  The hash index and
+    the index on (cusps, betti, volume) are used by ManifoldTable.identify.
     """
     connection = sqlite3.connect(dbfile)
     cur = connection.execute('select name from sqlite_master where type="table"')
@@ -423,6 +424,8 @@ def make_indexes(dbfile, columns_to_index=['name']):
         for col in columns_to_index:
             if col in cols:
                 cur.execute('CREATE INDEX %s_%s_index ON %s (%s)' % (table, col, table, col))
+        if {'cusps', 'betti', 'volume'}.issubset(cols):
+            cur.execute('CREATE INDEX %s_invariants_index ON %s (cusps, betti, volume)' % (table, table))
     connection.close()
     
 def setup_db(dbfile):
@@ -0,0 +1,45 @@
+"""
+Time for computing the volumes of many Dehn fillings of a cusp,
+filling each slope starting from the complete structure and with
+Manifold.dehn_filling_sweep, which visits the slopes along a path
+and reuses the shapes of the previous filling.
+
+Usage: python filling_sweep_benchmark.py [manifold] [max_coefficient]
+"""
+
+import math
+import sys
+import time
+
+import snappy
+
+
+def cold(name, slopes):
+    volumes = []
+    for slope in slopes:
+        M = snappy.Manifold(name)
+        M.dehn_fill(slope)
+        volumes.append(float(M.volume()))
+    return volumes
+
+
+def main(name='m016', max_coefficient=30):
+    max_coefficient = int(max_coefficient)
+    slopes = [(p, q) for p in range(-max_coefficient, max_coefficient + 1)
+              for q in range(max_coefficient + 1)
+              if math.gcd(p, q) == 1 and (q > 0 or p == 1)]
+    start = time.time()
+    expected = cold(name, slopes)
+    cold_time = time.time() - start
+    start = time.time()
+    table = snappy.Manifold(name).dehn_filling_sweep(slopes)
+    sweep_time = time.time() - start
+    differ = sum(abs(record.values['volume'] - volume) > 1e-8
+                 for record, volume in zip(table, expected))
+    print('%d slopes: cold %.2fs  sweep %.2fs  speedup %.2f  '
+          'volumes differing %d' % (len(slopes), cold_time, sweep_time,
+                                    cold_time / sweep_time, differ))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,51 @@
+"""
+Progress of the fundamental group simplification for covers of
+increasing degree, and the presentations reached with time budgets.
+The output is meant for choosing max_time and max_relator_length for
+batch jobs.
+
+Usage: python fundamental_group_budget.py [manifold] [degree ...]
+"""
+
+import sys
+import time
+
+import snappy
+
+
+def cover_of_degree(M, degree):
+    for N in M.covers(degree, cover_type='cyclic'):
+        return N
+
+
+def summarize(G):
+    history = G.simplification_history()
+    if not history:
+        return '%3d gens %3d rels, stopped during the first pass' % (
+            G.num_generators(), G.num_relators())
+    last = history[-1]
+    return ('%3d gens %3d rels, total length %6d, longest %5d '
+            'after %5d moves in %6.2fs' %
+            (G.num_generators(), G.num_relators(), last.total_length,
+             last.longest, last.moves, last.seconds))
+
+
+def main(name='m004', *degrees):
+    degrees = [int(d) for d in degrees] or [5, 10, 15]
+    M = snappy.Triangulation(name)
+    for degree in degrees:
+        N = cover_of_degree(M, degree)
+        start = time.time()
+        G = N.fundamental_group(record_history=True)
+        elapsed = time.time() - start
+        print('%s degree %d, %d tetrahedra, full simplification %.2fs' %
+              (name, degree, N.num_tetrahedra(), elapsed))
+        print('    ' + summarize(G))
+        for fraction in [0.1, 0.3]:
+            G = N.fundamental_group(max_time=fraction * elapsed,
+                                    anytime=True)
+            print('    budget %4.0f%%: %s' % (100 * fraction, summarize(G)))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,49 @@
+"""
+Time for computing the decorated isosigs of the manifolds in a census
+table with the original Python implementation of the decoration, with
+Triangulation.triangulation_isosig and with triangulation_isosigs.
+
+Usage: python isosig_benchmark.py [num_manifolds]
+
+By default the whole OrientableCuspedCensus is used.
+"""
+
+import sys
+import time
+
+import snappy
+from snappy import decorated_isosig
+
+
+def python_isosig(T):
+    return decorated_isosig.decorated_isosig(T, snappy.Triangulation)
+
+
+def main(num_manifolds=None):
+    census = snappy.OrientableCuspedCensus(lazy=True)[:num_manifolds]
+    # Separate copies, so that no run benefits from the caches filled
+    # by another.
+    copies = [[M.copy() for M in census] for run in range(3)]
+    print('%d triangulations' % len(copies[0]))
+
+    start = time.time()
+    expected = [python_isosig(T) for T in copies[0]]
+    python = time.time() - start
+
+    start = time.time()
+    results = [T.triangulation_isosig() for T in copies[1]]
+    method = time.time() - start
+    assert results == expected
+
+    start = time.time()
+    results = snappy.triangulation_isosigs(copies[2])
+    bulk = time.time() - start
+    assert results == expected
+
+    print('python decoration %7.2fs' % python)
+    print('method            %7.2fs  speedup %5.2f' % (method, python / method))
+    print('bulk              %7.2fs  speedup %5.2f' % (bulk, python / bulk))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,103 @@
+"""
+Time for certifying the shapes of cyclic covers of increasing degree
+with the KrawczykShapesEngine, compared to the kernel's solution of
+the gluing equations and to the previous implementation of the
+Krawczyk test, which formed c * df([z]) in each iteration by
+multiplying the approximate inverse with the sparse derivative.
+
+Usage: python krawczyk_benchmark.py [manifold] [bits_prec] [degree ...]
+"""
+
+import sys
+import time
+
+import snappy
+from snappy import snap
+from snappy.pari import pari
+from snappy.verify import KrawczykShapesEngine, interval_backend
+
+
+class SparseLoopKrawczykShapesEngine(KrawczykShapesEngine):
+    """
+    The previous implementation: the approximate inverse is computed by
+    the interval backend and each Krawczyk iteration multiplies it
+    entry by entry with the sparse derivative.
+    """
+    def __init__(self, M, initial_shapes, bits_prec):
+        backend = interval_backend()
+        self.prec = bits_prec
+        self.CIF = backend.ComplexIntervalField(self.prec)
+        self.initial_shapes = backend.vector(
+            [self.CIF(shape) for shape in initial_shapes])
+        self.equations = snap.shapes.enough_gluing_equations(M)
+        self._make_sparse_equations()
+        self.identity = backend.matrix.identity(
+            self.CIF, len(self.initial_shapes))
+        CDF = backend.ComplexDoubleField()
+        approx_deriv = self.log_gluing_LHS_derivatives(
+            [ CDF(shape) for shape in initial_shapes] )
+        self.approx_inverse = approx_deriv.inverse().change_ring(self.CIF)
+        value_at_initial_shapes = self.log_gluing_LHSs(self.initial_shapes)
+        self.first_term = (self.initial_shapes
+                           - self.approx_inverse * value_at_initial_shapes)
+        self.certified_shapes = None
+
+    @staticmethod
+    def matrix_times_sparse(m, sparse_m):
+        CIF = m.base_ring()
+        zero = CIF(0)
+        rows = []
+        for row in m.rows():
+            result_row = []
+            for col in sparse_m:
+                v = zero
+                for r, d in col:
+                    v += d * row[r]
+                result_row.append(v)
+            rows.append(result_row)
+        return interval_backend().matrix(CIF, rows)
+
+    def krawczyk_interval(self, shape_intervals):
+        derivative = self.log_gluing_LHS_derivatives_sparse(shape_intervals)
+        p = self.matrix_times_sparse(self.approx_inverse, derivative)
+        diff = self.identity - p
+        return (self.first_term
+                + diff * (shape_intervals - self.initial_shapes))
+
+
+def certify(engine_class, M, shapes, bits_prec):
+    start = time.time()
+    engine = engine_class(M, shapes, bits_prec=bits_prec)
+    setup = time.time() - start
+    if not engine.expand_until_certified():
+        raise RuntimeError('Could not certify %s' % M)
+    return setup, time.time() - start
+
+
+def main(name='m004', bits_prec=212, *degrees):
+    bits_prec = int(bits_prec)
+    degrees = [int(d) for d in degrees] or [5, 10, 25, 50, 75, 100]
+    # For enough_gluing_equations of the large covers
+    pari.allocatemem(2**30, silent=True)
+    print('%6s %5s %8s %8s %16s %16s' % (
+        'degree', 'tets', 'kernel', 'polish',
+        'old setup/total', 'new setup/total'))
+    for degree in degrees:
+        M = snappy.Manifold(name).covers(degree, cover_type='cyclic')[0]
+        start = time.time()
+        M.init_hyperbolic_structure(force_recompute=True)
+        kernel = time.time() - start
+        start = time.time()
+        if bits_prec > 53:
+            shapes = M.tetrahedra_shapes('rect', bits_prec=bits_prec)
+        else:
+            shapes = M.tetrahedra_shapes('rect')
+        polish = time.time() - start
+        old = certify(SparseLoopKrawczykShapesEngine, M, shapes, bits_prec)
+        new = certify(KrawczykShapesEngine, M, shapes, bits_prec)
+        print('%6d %5d %7.2fs %7.2fs %7.2fs/%7.2fs %7.2fs/%7.2fs' % (
+            (degree, M.num_tetrahedra(), kernel, polish) + old + new))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
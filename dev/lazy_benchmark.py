@@ -0,0 +1,36 @@
+"""
+Time for scans of the census tables which only compute combinatorial
+invariants, with the hyperbolic structures computed up front as usual
+and with lazy tables, which never compute them.
+
+Usage: python lazy_benchmark.py [num_manifolds]
+"""
+
+import sys
+import time
+
+import snappy
+
+
+def scan(table, invariant):
+    start = time.time()
+    results = [invariant(M) for M in table]
+    return time.time() - start, results
+
+
+def main(num_manifolds=5000):
+    invariants = [('homology', lambda M: M.homology()),
+                  ('isosig', lambda M: M.triangulation_isosig()),
+                  ('num_cusps', lambda M: M.num_cusps())]
+    for table in [snappy.OrientableCuspedCensus, snappy.LinkExteriors,
+                  snappy.OrientableClosedCensus]:
+        for name, invariant in invariants:
+            eager, expected = scan(table[:num_manifolds], invariant)
+            lazy, results = scan(table(lazy=True)[:num_manifolds], invariant)
+            assert [repr(r) for r in results] == [repr(r) for r in expected]
+            print('%-24s %-10s eager %6.2fs  lazy %6.2fs  speedup %5.2f' %
+                  (table.__class__.__name__, name, eager, lazy, eager / lazy))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
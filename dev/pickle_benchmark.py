@@ -0,0 +1,53 @@
+"""
+Size of, and time for writing and reading, the pickles of cyclic
+covers of m003, compared with the triangulation file format which
+was used for triangulations the old pickle format could not handle.
+Also times rebuilding the Manifolds from pickles which include the
+shapes, and packing all of them into a single buffer.
+
+Usage: python pickle_benchmark.py [degree ...]
+"""
+
+import sys
+import time
+
+import snappy
+
+
+def timed(func, *args):
+    start = time.time()
+    result = func(*args)
+    return time.time() - start, result
+
+
+def main(*degrees):
+    degrees = [int(d) for d in degrees] or [50, 200, 1000]
+    covers = []
+    for degree in degrees:
+        T = snappy.Triangulation('m003').covers(degree, cover_type='cyclic')[0]
+        covers.append(T)
+        text_write, text = timed(T._to_string)
+        text_read, _ = timed(snappy.Triangulation, text)
+        write, seed = timed(T.pickle)
+        read, U = timed(snappy.Triangulation, seed)
+        assert U.triangulation_isosig(decorated=True) == \
+            T.triangulation_isosig(decorated=True)
+        print('%6d tets  text %9d bytes %.4fs / %.4fs  '
+              'varint %8d bytes %.4fs / %.4fs' % (
+                  T.num_tetrahedra(), len(text), text_write, text_read,
+                  len(seed), write, read))
+    for T in covers[:2]:
+        M = snappy.Manifold(T)
+        solve, _ = timed(snappy.Manifold, M.pickle())
+        polish, _ = timed(snappy.Manifold, M.pickle(include_shapes=True))
+        print('%6d tets  Manifold from pickle %.3fs, with shapes %.3fs' % (
+            M.num_tetrahedra(), solve, polish))
+    pack, buffer = timed(snappy.pack_triangulations, covers)
+    unpack, _ = timed(snappy.unpack_triangulations, memoryview(buffer),
+                      snappy.Triangulation)
+    print('packed %d triangulations into %d bytes in %.4fs, '
+          'unpacked in %.4fs' % (len(covers), len(buffer), pack, unpack))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,52 @@
+"""
+Time for verify_hyperbolicity on cyclic covers that cannot be verified
+with 53 bits, when retrying with a fixed list of precisions where each
+precision starts from scratch, compared to the PrecisionLadder used
+by verify_hyperbolicity(max_bits_prec=...).
+
+Usage: python precision_ladder_benchmark.py [manifold] [degree ...]
+"""
+
+import sys
+import time
+
+import snappy
+from snappy.pari import pari
+
+fixed_bits_precs = [53, 212, 424, 848]
+
+
+def fixed(M):
+    for bits_prec in fixed_bits_precs:
+        # Drop the polished shapes so that each precision starts from
+        # scratch as it did before the PrecisionLadder.
+        M._cache.clear()
+        if M.verify_hyperbolicity(bits_prec=bits_prec)[0]:
+            return bits_prec
+
+
+def adaptive(M):
+    M._cache.clear()
+    if M.verify_hyperbolicity(max_bits_prec=fixed_bits_precs[-1])[0]:
+        return 'ok'
+
+
+def main(name='m004', *degrees):
+    degrees = [int(d) for d in degrees] or [25, 50, 75, 100]
+    # For enough_gluing_equations of the large covers
+    pari.allocatemem(2**30, silent=True)
+    print('%6s %5s %16s %16s' % ('degree', 'tets', 'fixed', 'adaptive'))
+    for degree in degrees:
+        M = snappy.Manifold(name).covers(degree, cover_type='cyclic')[0]
+        M.tetrahedra_shapes()
+        results = []
+        for method in [fixed, adaptive]:
+            start = time.time()
+            result = method(M)
+            results += [time.time() - start, result]
+        print('%6d %5d %7.2fs (%5s) %7.2fs (%5s)' % (
+            (degree, M.num_tetrahedra()) + tuple(results)))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,57 @@
+"""
+Throughput of the SnapPea kernel when driven from a thread pool.
+
+The long-running kernel calls (canonize, symmetry_group,
+is_isometric_to, dirichlet_domain, length_spectrum, covers and the
+Dehn filling solver) release the GIL, so running them on independent
+Manifolds in several threads should scale with the number of cores.
+
+Usage: python threaded_benchmark.py [num_manifolds]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import snappy
+
+
+def work(isosig):
+    M = snappy.Manifold(isosig)
+    M.canonize()
+    order = M.symmetry_group().order()
+    try:
+        lengths = len(M.dirichlet_domain().length_spectrum_dicts(1.0))
+    except RuntimeError:
+        # The Dirichlet construction fails for a few census manifolds.
+        lengths = None
+    covers = len(M.covers(2))
+    return (M.num_tetrahedra(), order, lengths, covers,
+            M.is_isometric_to(snappy.Manifold(isosig)))
+
+
+def run(isosigs, threads, expected=None):
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(work, isosigs))
+    if expected is not None:
+        assert results == expected, 'threaded results differ'
+    return time.time() - start, results
+
+
+def main(num_manifolds=500):
+    isosigs = [M.triangulation_isosig()
+               for M in snappy.OrientableCuspedCensus[:num_manifolds]]
+    base, expected = run(isosigs, 1)
+    print(' 1 threads: %7.2fs' % base)
+    threads = 2
+    while threads <= max(os.cpu_count(), 2):
+        elapsed, _ = run(isosigs, threads, expected)
+        print('%2d threads: %7.2fs  speedup %5.2f' %
+              (threads, elapsed, base / elapsed))
+        threads *= 2
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,46 @@
+"""
+Throughput of verify_hyperbolicity and the verified volume with each
+available interval backend (Sage's intervals when run inside Sage and
+python-flint's balls when it is installed).
+
+Usage: python verify_backend_benchmark.py [num_manifolds] [bits_prec]
+
+Also reports the time of importing snappy, which is dominated by
+importing Sage when run inside Sage.
+"""
+
+import sys
+import time
+
+start = time.time()
+import snappy
+from snappy import verify
+import_time = time.time() - start
+
+
+def run(manifolds, bits_prec):
+    start = time.time()
+    verified = 0
+    for M in manifolds:
+        if M.verify_hyperbolicity(bits_prec=bits_prec)[0]:
+            M.volume(verified=True, bits_prec=bits_prec)
+            verified += 1
+    return verified, time.time() - start
+
+
+def main(num_manifolds=500, bits_prec=53):
+    num_manifolds, bits_prec = int(num_manifolds), int(bits_prec)
+    manifolds = list(snappy.OrientableCuspedCensus(lazy=True)[:num_manifolds])
+    for M in manifolds:
+        M.tetrahedra_shapes()
+    print('Importing snappy: %.2fs' % import_time)
+    print('%d manifolds, %d bits' % (len(manifolds), bits_prec))
+    for name in verify.available_interval_backends():
+        verify.set_interval_backend(name)
+        verified, elapsed = run(manifolds, bits_prec)
+        print('%6s: verified %d in %6.2fs, %7.1f manifolds/s' % (
+            name, verified, elapsed, len(manifolds) / elapsed))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
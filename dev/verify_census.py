@@ -0,0 +1,32 @@
+"""
+Certifies the first manifolds of a census with snappy.verify.batch
+and prints the summary. Running it again with the same results file
+resumes an interrupted run; comparing the summaries of two versions
+shows regressions in the certification rate or speed.
+
+Usage: python verify_census.py census num_manifolds results_file [task ...]
+
+For example:
+
+    python verify_census.py OrientableCuspedCensus 1000 cusped.pickle hyperbolicity canonical
+"""
+
+import sys
+import time
+
+import snappy
+from snappy.verify import batch
+
+
+def main(census='OrientableCuspedCensus', num_manifolds=1000,
+         results_file=None, *tasks):
+    manifolds = getattr(snappy, census)[:int(num_manifolds)]
+    start = time.time()
+    records = list(batch.certify(manifolds, tasks or ['hyperbolicity'],
+                                 timeout=600, results_file=results_file))
+    print('%s[:%s] in %.1fs' % (census, num_manifolds, time.time() - start))
+    print(batch.summary(records))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
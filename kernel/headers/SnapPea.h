@@ -436,6 +436,33 @@ typedef struct GroupPresentation            GroupPresentation;
 typedef struct CuspNeighborhoods            CuspNeighborhoods;
 typedef struct NormalSurfaceList            NormalSurfaceList;
 
+/**
+ *  The size of a presentation while fundamental_group_with_monitor()
+ *  simplifies it:  the number of passes through the main simplification
+ *  loop so far, and the size of the presentation after the last one.
+ */
+
+typedef struct
+{
+    int num_moves,
+        num_generators,
+        num_relations,
+        total_length,
+        longest_relation;
+} FGSimplificationProgress;
+
+/**
+ *  A function which fundamental_group_with_monitor() calls with the
+ *  monitor_data passed to it.  The simplification stops, leaving the
+ *  presentation in a valid, partially simplified, state as soon as it
+ *  returns TRUE.  progress is NULL when it is only asked whether to stop,
+ *  from within the searches of the simplification loop.
+ */
+
+typedef Boolean (*FGSimplificationMonitor)(
+                    void                            *monitor_data,
+                    const FGSimplificationProgress  *progress);
+
 #include "end_namespace.h"
 
 /*
@@ -1436,6 +1463,23 @@ extern GroupPresentation *fundamental_group(
  *  fundamental_group.c for an explanation of the arguments.
  */
 
+extern GroupPresentation *fundamental_group_with_monitor(
+                    Triangulation           *manifold,
+                    Boolean                 simplify_presentation,
+                    Boolean                 fillings_may_affect_generators,
+                    Boolean                 minimize_number_of_generators,
+                    Boolean                 try_hard_to_shorten_relators,
+                    FGSimplificationMonitor monitor,
+                    void                    *monitor_data);
+/**<
+ *  Like fundamental_group(), but reports the progress of the
+ *  simplification to monitor (if not NULL) after each pass through the
+ *  main simplification loop, and asks it between the candidates of the
+ *  searches in that loop whether to stop.  This lets the UI impose a
+ *  budget on a single computation without cancelling the others.
+ *  The size of the presentation is only computed when there is a monitor.
+ */
+
 extern GroupPresentation *compute_unsimplified_presentation(Triangulation *manifold);
 
 /**<
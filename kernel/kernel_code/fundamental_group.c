@@ -10,6 +10,15 @@
  *                  Boolean         minimize_number_of_generators,
  *                  Boolean         try_hard_to_shorten_relators);
  *
+ *      GroupPresentation   *fundamental_group_with_monitor(
+ *                  Triangulation           *manifold,
+ *                  Boolean                 simplify_presentation,
+ *                  Boolean                 fillings_may_affect_generators,
+ *                  Boolean                 minimize_number_of_generators,
+ *                  Boolean                 try_hard_to_shorten_relators,
+ *                  FGSimplificationMonitor monitor,
+ *                  void                    *monitor_data);
+ *
  *      int     fg_get_num_generators   (GroupPresentation  *group);
  *      int     fg_get_num_orig_gens    (GroupPresentation  *group);
  *      Boolean fg_integer_fillings     (GroupPresentation  *group);
@@ -373,6 +382,15 @@ struct GroupPresentation
      */
     Boolean     minimize_number_of_generators;
 
+    /*
+     *  The optional monitor of the simplification, passed to
+     *  fundamental_group_with_monitor(), and whether it asked to stop.
+     *  monitor is NULL for the other ways of computing a group.
+     */
+    FGSimplificationMonitor monitor;
+    void                    *monitor_data;
+    Boolean                 simplification_stopped;
+
     /*
      *  If try_hard_to_shorten_relators is TRUE,
      *  simplify_presentation() will try to reduce the length of the
@@ -403,6 +421,8 @@ static void                 prepend_inverse(CyclicWord *source, CyclicWord *dest
 */
 static void                 initialize_original_generators(GroupPresentation *group, int num_generators);
 static void                 simplify(GroupPresentation *group);
+static Boolean              report_simplification_progress(GroupPresentation *group, int num_moves);
+static Boolean              simplification_stopped(GroupPresentation *group);
 static void                 insert_basepoints(GroupPresentation *group);
 static void                 insert_basepoints_on_list(CyclicWord *list);
 static void                 insert_basepoint_in_word(CyclicWord *word);
@@ -434,8 +454,8 @@ static void                 eliminate_word(GroupPresentation *group, CyclicWord
 static Boolean              remove_empty_relations(GroupPresentation *group);
 static Boolean              insert_word_from_group(GroupPresentation *group);
 static Boolean              insert_word_into_group(GroupPresentation *group, CyclicWord *word);
-static Boolean              insert_word_into_list(CyclicWord *list, CyclicWord *word);
-static Boolean              insert_word_into_word(CyclicWord *word, CyclicWord *target);
+static Boolean              insert_word_into_list(GroupPresentation *group, CyclicWord *list, CyclicWord *word);
+static Boolean              insert_word_into_word(GroupPresentation *group, CyclicWord *word, CyclicWord *target);
 static Boolean              insert_word_forwards(CyclicWord *word, CyclicWord *target);
 static Boolean              insert_word_backwards(CyclicWord *word, CyclicWord *target);
 static Boolean              simplify_one_word_presentations(GroupPresentation *group);
@@ -496,6 +516,26 @@ GroupPresentation *fundamental_group(
     Boolean         minimize_number_of_generators,
     Boolean         try_hard_to_shorten_relators)
 {
+    return fundamental_group_with_monitor(
+        manifold,
+        simplify_presentation,
+        fillings_may_affect_generators,
+        minimize_number_of_generators,
+        try_hard_to_shorten_relators,
+        NULL,
+        NULL);
+}
+
+
+GroupPresentation *fundamental_group_with_monitor(
+    Triangulation           *manifold,
+    Boolean                 simplify_presentation,
+    Boolean                 fillings_may_affect_generators,
+    Boolean                 minimize_number_of_generators,
+    Boolean                 try_hard_to_shorten_relators,
+    FGSimplificationMonitor monitor,
+    void                    *monitor_data)
+{
 
     GroupPresentation   *group;
     uLongComputationBegins("Computing the fundamental group.", TRUE);
@@ -517,6 +557,8 @@ GroupPresentation *fundamental_group(
     group->fillings_may_affect_generators   = fillings_may_affect_generators;
     group->minimize_number_of_generators    = minimize_number_of_generators;
     group->try_hard_to_shorten_relators   = try_hard_to_shorten_relators;
+    group->monitor                          = monitor;
+    group->monitor_data                     = monitor_data;
 
     /*
      *  Simplify the group presentation if requested to do so.
@@ -560,6 +602,10 @@ GroupPresentation *compute_unsimplified_presentation(
 
     group->integer_fillings = all_Dehn_coefficients_are_integers(manifold);
 
+    group->monitor                  = NULL;
+    group->monitor_data             = NULL;
+    group->simplification_stopped   = FALSE;
+
     return group;
 }
 
@@ -1331,9 +1377,68 @@ static void initialize_original_generators(
 }
 
 
+static Boolean report_simplification_progress(
+    GroupPresentation   *group,
+    int                 num_moves)
+{
+    /*
+     *  Report the size of the presentation after num_moves passes
+     *  through the main simplification loop to the monitor, if any,
+     *  and return TRUE if the simplification should stop.
+     *  The relations are only walked when there is a monitor.
+     */
+
+    FGSimplificationProgress    progress;
+    CyclicWord                  *word;
+
+    if (group->monitor == NULL || group->simplification_stopped == TRUE)
+        return group->simplification_stopped;
+
+    progress.num_moves          = num_moves;
+    progress.num_generators     = group->itsNumGenerators;
+    progress.num_relations      = group->itsNumRelations;
+    progress.total_length       = 0;
+    progress.longest_relation   = 0;
+
+    for (word = group->itsRelations; word != NULL; word = word->next)
+    {
+        progress.total_length += word->itsLength;
+        if (word->itsLength > progress.longest_relation)
+            progress.longest_relation = word->itsLength;
+    }
+
+    if ((*group->monitor)(group->monitor_data, &progress) == TRUE)
+        group->simplification_stopped = TRUE;
+
+    return group->simplification_stopped;
+}
+
+
+static Boolean simplification_stopped(
+    GroupPresentation   *group)
+{
+    /*
+     *  Ask the monitor, if any, whether the simplification should stop.
+     *  This is called between the candidates considered by the searches
+     *  in the main simplification loop, which may take a long time on
+     *  large presentations, at points where the presentation is valid.
+     *  The searches then give up, so that the main loop terminates.
+     */
+
+    if (group->monitor != NULL
+     && group->simplification_stopped == FALSE
+     && (*group->monitor)(group->monitor_data, NULL) == TRUE)
+        group->simplification_stopped = TRUE;
+
+    return group->simplification_stopped;
+}
+
+
 static void simplify(
     GroupPresentation   *group)
 {
+    int num_moves;
+
     /*
      *  The Induction Variable
      *
@@ -1411,6 +1516,8 @@ static void simplify(
      *  do make some progress with the fancier ones, we want to try the
      *  basic ones again.
      */
+    num_moves = 0;
+
     while
     (
          remove_empty_relations(group)
@@ -1482,6 +1589,8 @@ static void simplify(
 	)
      {
       /*NMD 2008/5/31*/
+      if (report_simplification_progress(group, ++num_moves) == TRUE)
+        break;
       if (uLongComputationContinues() == func_cancelled) 
         break;
       }
@@ -1730,6 +1839,9 @@ static Boolean try_handle_slides(
         if (a == 0)     /*  There is no generator 0.  */
             continue;
 
+        if (simplification_stopped(group) == TRUE)
+            return FALSE;
+
         for (b = - group->itsNumGenerators; b <= group->itsNumGenerators; b++)
         {
             if (b == 0)     /*  There is no generator 0.  */
@@ -2218,7 +2330,10 @@ static Boolean two_singletons_in_group(
 
     for (i = 1; i <= group->itsNumGenerators; i++)
 
-        if (generator_occurs_as_two_singletons_in_group(group, i, &word_containing_singletons)
+        if (simplification_stopped(group) == TRUE)
+            return FALSE;
+
+        else if (generator_occurs_as_two_singletons_in_group(group, i, &word_containing_singletons)
          && generator_occurs_in_no_other_word_in_group(group, i, word_containing_singletons))
         {
             make_singletons_adjacent(group, i, word_containing_singletons);
@@ -2406,6 +2521,9 @@ static Boolean eliminate_word_in_group(
 
     for (generator = 1; generator <= group->itsNumGenerators; generator++)
     {
+        if (simplification_stopped(group) == TRUE)
+            return FALSE;
+
         word_with_singleton
             = shortest_word_in_which_generator_occurs_precisely_once
                 (group, generator);
@@ -2643,7 +2761,11 @@ static Boolean insert_word_from_group(
      */
     for (word = group->itsRelations; word != NULL; word = word->next)
 
-        if (word->is_Dehn_relation == FALSE
+        if (simplification_stopped(group) == TRUE)
+
+            return FALSE;
+
+        else if (word->is_Dehn_relation == FALSE
          || group->fillings_may_affect_generators == TRUE)
 
             if (insert_word_into_group(group, word) == TRUE)
@@ -2667,22 +2789,23 @@ static Boolean insert_word_into_group(
      */
 
     return
-    (   insert_word_into_list(group->itsRelations,          word) == TRUE
-     || insert_word_into_list(group->itsMeridians,          word) == TRUE
-     || insert_word_into_list(group->itsLongitudes,         word) == TRUE
-     || insert_word_into_list(group->itsOriginalGenerators, word) == TRUE);
+    (   insert_word_into_list(group, group->itsRelations,          word) == TRUE
+     || insert_word_into_list(group, group->itsMeridians,          word) == TRUE
+     || insert_word_into_list(group, group->itsLongitudes,         word) == TRUE
+     || insert_word_into_list(group, group->itsOriginalGenerators, word) == TRUE);
 }
 
 
 static Boolean insert_word_into_list(
-    CyclicWord  *list,
-    CyclicWord  *word)
+    GroupPresentation   *group,
+    CyclicWord          *list,
+    CyclicWord          *word)
 {
     CyclicWord  *target;
 
     for (target = list; target != NULL; target = target->next)
 
-        if (insert_word_into_word(word, target) == TRUE)
+        if (insert_word_into_word(group, word, target) == TRUE)
 
             return TRUE;
 
@@ -2691,6 +2814,7 @@ static Boolean insert_word_into_list(
 
 
 static Boolean insert_word_into_word(
+    GroupPresentation   *group,
     CyclicWord          *word,
     CyclicWord          *target)
 {
@@ -2726,10 +2850,19 @@ static Boolean insert_word_into_word(
      *  We use word->itsLetters and target->itsLetters to mark
      *  the possible insertion points.  Note too that the following
      *  code automatically ignores relations of length zero.
+     *
+     *  For long words this takes a while, so we check whether the
+     *  simplification should stop before each rotation of word.
+     *  At that point the target has been rotated back to its original
+     *  starting point, and word is a relation, so the rotation of
+     *  word doesn't matter.
      */
 
     for (i = 0; i < word->itsLength; i++)
     {
+        if (simplification_stopped(group) == TRUE)
+            return FALSE;
+
         for (j = 0; j < target->itsLength; j++)
         {
             if (insert_word_forwards(word, target)  == TRUE
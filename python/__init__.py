@@ -23,6 +23,9 @@ import time
 from .SnapPy import set_rand_seed
 set_rand_seed(int(time.time()))
 
+from .SnapPy import pack_triangulations, unpack_triangulations
+from .SnapPy import triangulation_isosigs
+
 
 class Triangulation(_TriangulationLP):
     __doc__ = _TriangulationLP.__doc__
@@ -70,11 +73,11 @@ class Manifold(_ManifoldLP):
         >>> type(M.high_precision())
         <class 'snappy.ManifoldHP'>
         """
-        HP = ManifoldHP('empty')
-        HP._from_string(self._to_string(), initialize_structure=False)
         fillings = [self.cusp_info(n).filling for n in range(self.num_cusps())]
         filled = self._get_tetrahedra_shapes('filled')
         complete = self._get_tetrahedra_shapes('complete')
+        HP = ManifoldHP('empty')
+        HP._from_string(self._to_string(), initialize_structure=False)
         HP.set_tetrahedra_shapes(filled, complete, fillings)
         HP._polish_hyperbolic_structures()
         HP.set_name(self.name())
@@ -106,11 +109,11 @@ class ManifoldHP(_ManifoldHP):
         <class 'snappy.Manifold'>
 
         """
-        LP = Manifold('empty')
-        LP._from_string(self._to_string(), initialize_structure=False)
         fillings = [self.cusp_info(n).filling for n in range(self.num_cusps())]
         filled = [complex(z) for z in self._get_tetrahedra_shapes('filled')]
         complete = [complex(z) for z in self._get_tetrahedra_shapes('complete')]
+        LP = Manifold('empty')
+        LP._from_string(self._to_string(), initialize_structure=False)
         LP.set_tetrahedra_shapes(filled, complete, fillings)
         LP._polish_hyperbolic_structures()
         LP.set_name(self.name())
@@ -158,6 +161,23 @@ class ManifoldHP(_ManifoldHP):
         return self.low_precision()._identify(extends_to_link)
 
 
+from .cache import persistent
+
+
+def _length_spectrum_with_words(cutoff=1.0, full_rigor=True, grouped=True,
+                                include_words=False):
+    # The words are in terms of the generators of the Dirichlet
+    # domain, which depend on the triangulation.
+    return include_words
+
+
+Manifold.length_spectrum = persistent(
+    _ManifoldLP.length_spectrum,
+    depends_on_triangulation=_length_spectrum_with_words)
+ManifoldHP.length_spectrum = persistent(
+    _ManifoldHP.length_spectrum,
+    depends_on_triangulation=_length_spectrum_with_words)
+
 SnapPy._manifold_class = Manifold
 SnapPy._triangulation_class = Triangulation
 SnapPyHP._triangulation_class = TriangulationHP
@@ -169,7 +189,8 @@ __all__ = ['Triangulation', 'Manifold', 'ManifoldHP', 'AbelianGroup',
            'CuspNeighborhoodHP', 'SymmetryGroup', 'AlternatingKnotExteriors',
            'NonalternatingKnotExteriors', 'SnapPeaFatalError',
            'InsufficientPrecisionError',
-           'pari', 'twister', ]
+           'pari', 'twister', 'pack_triangulations',
+           'unpack_triangulations', 'triangulation_isosigs']
 
 from .sage_helper import _within_sage
 
@@ -232,8 +253,8 @@ def canonical_retriangulation(
         return manifold._canonical_retriangulation()
 
 
-Manifold.canonical_retriangulation = canonical_retriangulation
-ManifoldHP.canonical_retriangulation = canonical_retriangulation
+Manifold.canonical_retriangulation = persistent(canonical_retriangulation)
+ManifoldHP.canonical_retriangulation = persistent(canonical_retriangulation)
 
 
 def isometry_signature(
@@ -286,6 +307,9 @@ def isometry_signature(
     if False in manifold.cusp_info('complete?'):
         raise ValueError('isometry_signature needs all cusps to be complete')
 
+    if not verified:
+        return manifold._isometry_signature(of_link)
+
     retrig = manifold.canonical_retriangulation(
          verified=verified,
          interval_bits_precs=interval_bits_precs,
@@ -300,8 +324,8 @@ def isometry_signature(
                                        ignore_curve_orientations=True)
 
 
-Manifold.isometry_signature = isometry_signature
-ManifoldHP.isometry_signature = isometry_signature
+Manifold.isometry_signature = persistent(isometry_signature)
+ManifoldHP.isometry_signature = persistent(isometry_signature)
 
 
 def cusp_area_matrix(manifold, method='trigDependentTryCanonize',
@@ -808,6 +832,12 @@ for manifold_package, required in known_manifold_packages:
 
 __all__ += database_objects
 
+from . import batch
+from .batch import classify_up_to_isometry
+__all__ += ['classify_up_to_isometry']
+Manifold.dehn_filling_sweep = batch.dehn_filling_sweep
+ManifoldHP.dehn_filling_sweep = batch.dehn_filling_sweep
+
 # Monkey patch the link_exterior method into Spherogram.
 
 from spherogram.codecs import DTcodec
@@ -50,6 +50,9 @@ def cover_type(mfld):
     return re.findall("~reg~|~irr~|~cyc~", mfld.name())[-1][1:-1]
 
 
+# The hashes stored in the databases were computed from the covers
+# constructed by the SnapPea kernel, so db_hash keeps doing that rather
+# than using cover_homologies.
 def cover_hash(mfld, degrees):
     return [ repr(sorted(
         [(cover_type(C), C.homology())
@@ -57,6 +60,15 @@ def cover_hash(mfld, degrees):
         )) for degree in degrees ]
 
 
+# Only used for the hash tiers added by dev/database_tools/add_hash_tiers.py,
+# which are computed with this same function, so here the homology of
+# the covers is computed without constructing them.
+def cyclic_cover_hash(mfld, degrees):
+    return [ repr(sorted(
+        mfld.cover_homologies(degree, cover_type='cyclic')
+        )) for degree in degrees ]
+
+
 def old_combined_hash(mfld):
     hash = str(" &and& ".join([old_basic_hash(mfld)] +
                               cover_hash(mfld, (2, 3))))
@@ -77,3 +89,17 @@ def old_db_hash(mfld):
 # This one is used now.
 def db_hash(mfld):
     return md5(combined_hash(mfld)).hexdigest()
+
+
+# The first two tiers of the staged hash used by ManifoldTable.siblings
+# for tables with the columns basic_hash and cyclic_hash.  The last
+# tier is db_hash, which also computes the homology of all covers of
+# degree 2 and 3 rather than just the cyclic ones.
+def basic_db_hash(mfld):
+    return md5(basic_hash(mfld).encode('utf8')).hexdigest()
+
+
+def cyclic_db_hash(mfld):
+    hash = str(" &and& ".join([basic_hash(mfld)] +
+                              cyclic_cover_hash(mfld, (2, 3, 4))))
+    return md5(hash.encode('utf8')).hexdigest()
@@ -0,0 +1,758 @@
+"""
+Helper code for verified computations outside of Sage.
+
+The verified computations in snappy.verify are written against Sage's
+RealIntervalField, ComplexIntervalField, matrix and vector.  This
+module implements the part of that interface they use on top of the
+arb and acb ball types of python-flint, so that they can also run in
+plain Python when python-flint is installed.
+
+Note that python-flint keeps its working precision in the global
+context flint.ctx.  Every operation here calls into flint at the
+precision of the field the result lives in, see _at_prec, and restores
+the previous precision afterwards, so that other users of python-flint
+are not affected.
+
+>>> CIF = ComplexIntervalField(80)            #doctest: +FLINT
+>>> z = CIF(1, 2) ** 3 / 2                     #doctest: +FLINT
+>>> z.real(), z.parent()                       #doctest: +FLINT
+(-5.5000000000000000000000, Complex Interval Field with 80 bits of precision)
+>>> w = CIF(CIF.real_field()(0.5, 0.75), 1)    #doctest: +FLINT
+>>> 0.5 in w.real(), 0.75 in w.real(), 0.8 in w.real()   #doctest: +FLINT
+(True, True, False)
+>>> w.center() in w, w in w.center(), w.imag() > 0.5   #doctest: +FLINT
+(True, False, True)
+>>> w * None                                   #doctest: +FLINT
+Traceback (most recent call last):
+   ...
+TypeError: unsupported operand type(s) for *: 'ComplexIntervalFieldElement' and 'NoneType'
+>>> import flint                               #doctest: +FLINT
+>>> RealIntervalField(200)('0.1').absolute_diameter() < 2.0**-190, flint.ctx.prec   #doctest: +FLINT
+(True, 53)
+"""
+
+try:
+    import flint
+    _within_flint = True
+except ImportError:
+    _within_flint = False
+
+from .pari import Gen
+
+import operator
+
+__all__ = ['RealIntervalField',
+           'ComplexIntervalField',
+           'ComplexDoubleField',
+           'matrix',
+           'vector',
+           'is_RealIntervalFieldElement',
+           'is_ComplexIntervalFieldElement']
+
+
+def _at_prec(prec, function, *args, **kwargs):
+    """
+    Returns function(*args, **kwargs) computed with the given working
+    precision of flint, restoring the previous one afterwards.  This is
+    cheaper than the context manager flint.ctx.workprec.
+    """
+    ctx = flint.ctx
+    saved = ctx.prec
+    ctx.prec = prec
+    try:
+        return function(*args, **kwargs)
+    finally:
+        ctx.prec = saved
+
+
+def _pari_real_to_arb(x):
+    """
+    Converts a pari t_INT, t_FRAC or t_REAL to an arb exactly.
+    """
+    t = x.type()
+    if t == 't_INT':
+        return flint.arb(int(x))
+    if t == 't_FRAC':
+        return flint.arb(flint.fmpq(int(x.numerator()),
+                                    int(x.denominator())))
+    if t == 't_REAL':
+        if x == 0:
+            return flint.arb(0)
+        # A t_REAL is an integer with bitprecision bits times a power of 2.
+        e = int(x.exponent())
+        p = int(x.bitprecision())
+        return flint.arb((int(x.shift(p - e - 1).truncate()), e - p + 1))
+    raise TypeError('Cannot convert pari %s to a real interval.' % t)
+
+
+def _to_arb(x, prec):
+    """
+    Converts x to an arb without rounding, except for strings which
+    are enclosed with the given precision.
+    """
+    if isinstance(x, RealIntervalFieldElement):
+        return x._ball
+    if isinstance(x, (int, float)):
+        return flint.arb(x)
+    if isinstance(x, str):
+        return _at_prec(prec, flint.arb, x)
+    if isinstance(x, Gen):
+        return _pari_real_to_arb(x)
+    gen = getattr(x, 'gen', None)
+    if isinstance(gen, Gen):
+        # A snappy.Number
+        return _pari_real_to_arb(gen)
+    raise TypeError('Cannot convert %r to a real interval.' % (x,))
+
+
+def _to_acb(x, prec):
+    """
+    Converts x to an acb, see _to_arb.
+    """
+    if isinstance(x, ComplexIntervalFieldElement):
+        return x._ball
+    if isinstance(x, complex):
+        return flint.acb(x.real, x.imag)
+    if isinstance(x, Gen):
+        gen = x
+    else:
+        gen = getattr(x, 'gen', None)
+    if isinstance(gen, Gen) and gen.type() == 't_COMPLEX':
+        return flint.acb(_pari_real_to_arb(gen.real()),
+                         _pari_real_to_arb(gen.imag()))
+    return flint.acb(_to_arb(x, prec))
+
+
+class RealIntervalField_class():
+    """
+    The analogue of Sage's RealIntervalField, see RealIntervalField.
+    """
+    def __init__(self, prec):
+        self._prec = prec
+
+    def __call__(self, x, y=None):
+        """
+        Returns the interval containing x, respectively, the smallest
+        interval containing x and y.  Unlike in Sage, the result is not
+        rounded to the precision of the field.
+        """
+        if y is None:
+            return RealIntervalFieldElement(self, _to_arb(x, self._prec))
+        return RealIntervalFieldElement(
+            self, _at_prec(self._prec, flint.arb.union,
+                           _to_arb(x, self._prec), _to_arb(y, self._prec)))
+
+    def __repr__(self):
+        return 'Real Interval Field with %d bits of precision' % self._prec
+
+    def precision(self):
+        return self._prec
+
+    prec = precision
+
+    def pi(self):
+        return RealIntervalFieldElement(self, _at_prec(self._prec,
+                                                       flint.arb.pi))
+
+    def is_exact(self):
+        return False
+
+    def complex_field(self):
+        return ComplexIntervalField(self._prec)
+
+
+class ComplexIntervalField_class():
+    """
+    The analogue of Sage's ComplexIntervalField, see ComplexIntervalField.
+    """
+    def __init__(self, prec):
+        self._prec = prec
+
+    def __call__(self, x, y=None):
+        if y is None:
+            return ComplexIntervalFieldElement(self, _to_acb(x, self._prec))
+        return ComplexIntervalFieldElement(
+            self, flint.acb(_to_arb(x, self._prec), _to_arb(y, self._prec)))
+
+    def __repr__(self):
+        return 'Complex Interval Field with %d bits of precision' % self._prec
+
+    def precision(self):
+        return self._prec
+
+    prec = precision
+
+    def is_exact(self):
+        return False
+
+    def real_field(self):
+        return RealIntervalField(self._prec)
+
+
+class ComplexDoubleField_class(ComplexIntervalField_class):
+    """
+    Stands in for Sage's ComplexDoubleField in approximate computations
+    such as preconditioners.  Elements are balls of radius zero and
+    matrices over this field are inverted without error bounds.
+    """
+    def __init__(self):
+        super().__init__(53)
+
+    def __call__(self, x, y=None):
+        z = ComplexIntervalField_class.__call__(self, x, y)
+        z._ball = z._ball.mid()
+        return z
+
+    def __repr__(self):
+        return 'Complex Double Field'
+
+
+_fields = {}
+
+
+def RealIntervalField(prec=53):
+    """
+    Returns the field of real intervals (arb balls) computed with the
+    given precision in bits.
+    """
+    key = ('real', prec)
+    if key not in _fields:
+        _fields[key] = RealIntervalField_class(prec)
+    return _fields[key]
+
+
+def ComplexIntervalField(prec=53):
+    """
+    Returns the field of complex intervals (acb balls) computed with the
+    given precision in bits.
+    """
+    key = ('complex', prec)
+    if key not in _fields:
+        _fields[key] = ComplexIntervalField_class(prec)
+    return _fields[key]
+
+
+def ComplexDoubleField():
+    key = ('double', 53)
+    if key not in _fields:
+        _fields[key] = ComplexDoubleField_class()
+    return _fields[key]
+
+
+def _common_parent(a, b):
+    # As in Sage, the result of an operation on intervals of different
+    # precision has the lower precision.
+    return a if a._prec <= b._prec else b
+
+
+class _IntervalFieldElement():
+    """
+    Base class for the elements of RealIntervalField_class and
+    ComplexIntervalField_class wrapping an arb or acb ball.
+    """
+    __slots__ = ('_parent', '_ball')
+
+    # Intervals are not hashable (as in Sage).
+    __hash__ = None
+
+    def __init__(self, parent, ball):
+        self._parent = parent
+        self._ball = ball
+
+    def parent(self):
+        return self._parent
+
+    def prec(self):
+        return self._parent._prec
+
+    def _coerce(self, other):
+        """
+        Returns the parent of the result of a binary operation and
+        other as something flint accepts, or None, None if other
+        cannot be converted.
+        """
+        raise NotImplementedError()
+
+    def _coerce_or_raise(self, other):
+        parent, other_ball = self._coerce(other)
+        if parent is None:
+            raise TypeError('Cannot convert %r to an element of %r.' % (
+                other, self._parent))
+        return parent, other_ball
+
+    def _binop(self, other, op):
+        parent, other = self._coerce(other)
+        if parent is None:
+            return NotImplemented
+        return type(self)(parent, _at_prec(parent._prec, op, self._ball, other))
+
+    def _rbinop(self, other, op):
+        parent, other = self._coerce(other)
+        if parent is None:
+            return NotImplemented
+        return type(self)(parent, _at_prec(parent._prec, op, other, self._ball))
+
+    def _cmp(self, other, op):
+        parent, other = self._coerce(other)
+        if parent is None:
+            return NotImplemented
+        return op(self._ball, other)
+
+    def __add__(self, other):
+        return self._binop(other, operator.add)
+
+    def __radd__(self, other):
+        return self._rbinop(other, operator.add)
+
+    def __sub__(self, other):
+        return self._binop(other, operator.sub)
+
+    def __rsub__(self, other):
+        return self._rbinop(other, operator.sub)
+
+    def __mul__(self, other):
+        return self._binop(other, operator.mul)
+
+    def __rmul__(self, other):
+        return self._rbinop(other, operator.mul)
+
+    def __truediv__(self, other):
+        return self._binop(other, operator.truediv)
+
+    def __rtruediv__(self, other):
+        return self._rbinop(other, operator.truediv)
+
+    def __pow__(self, other):
+        return self._binop(other, operator.pow)
+
+    def __neg__(self):
+        return type(self)(self._parent, -self._ball)
+
+    def __pos__(self):
+        return self
+
+    # As in Sage, a comparison is True if it holds for all elements of
+    # the intervals.
+
+    def __eq__(self, other):
+        return self._cmp(other, operator.eq)
+
+    def __ne__(self, other):
+        return self._cmp(other, operator.ne)
+
+    def __contains__(self, other):
+        """
+        Whether other is contained in this interval.
+        """
+        parent, other = self._coerce(other)
+        if parent is None:
+            return False
+        # A ball with NaN midpoint contains everything, but Sage's NaN
+        # intervals contain nothing. Being conservative is what matters
+        # for the containment tests of verified computations.
+        if not self._ball.is_finite():
+            return False
+        return self._ball.contains(other)
+
+    def _unop(self, method, *args):
+        return type(self)(self._parent, _at_prec(
+            self._parent._prec, getattr(self._ball, method), *args))
+
+    def center(self):
+        """
+        The midpoint of this interval, as an interval of radius zero.
+        """
+        return type(self)(self._parent, self._ball.mid())
+
+    def union(self, other):
+        """
+        An interval containing this and the other interval.
+        """
+        parent, other = self._coerce_or_raise(other)
+        return type(self)(parent, _at_prec(parent._prec, self._ball.union,
+                                           other))
+
+    def contains_zero(self):
+        return self._ball.contains(0)
+
+    def is_NaN(self):
+        return not self._ball.is_finite()
+
+    def log(self):
+        return self._unop('log')
+
+    def exp(self):
+        return self._unop('exp')
+
+    def sqrt(self):
+        return self._unop('sqrt')
+
+    def __repr__(self):
+        # The number of digits printed depends on the working precision.
+        return _at_prec(self._parent._prec, self._ball.str, radius=True)
+
+
+class RealIntervalFieldElement(_IntervalFieldElement):
+    __slots__ = ()
+
+    def _coerce(self, other):
+        if isinstance(other, RealIntervalFieldElement):
+            return _common_parent(self._parent, other._parent), other._ball
+        if isinstance(other, (int, float)):
+            return self._parent, other
+        if isinstance(other, (ComplexIntervalFieldElement, complex,
+                              Vector, Matrix)):
+            return None, None
+        try:
+            return self._parent, _to_arb(other, self._parent._prec)
+        except TypeError:
+            return None, None
+
+    def __lt__(self, other):
+        return self._cmp(other, operator.lt)
+
+    def __le__(self, other):
+        return self._cmp(other, operator.le)
+
+    def __gt__(self, other):
+        return self._cmp(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._cmp(other, operator.ge)
+
+    def __abs__(self):
+        return self._unop('__abs__')
+
+    abs = __abs__
+
+    def __float__(self):
+        return float(self._ball.mid())
+
+    def lower(self):
+        return RealIntervalFieldElement(self._parent, self._ball.lower())
+
+    def upper(self):
+        return RealIntervalFieldElement(self._parent, self._ball.upper())
+
+    def endpoints(self):
+        return self.lower(), self.upper()
+
+    def absolute_diameter(self):
+        return RealIntervalFieldElement(
+            self._parent, _at_prec(self._parent._prec, operator.mul,
+                                   2, flint.arb(self._ball.rad())))
+
+    def min(self, other):
+        parent, other = self._coerce_or_raise(other)
+        return RealIntervalFieldElement(
+            parent, _at_prec(parent._prec, self._ball.min, other))
+
+    def max(self, other):
+        parent, other = self._coerce_or_raise(other)
+        return RealIntervalFieldElement(
+            parent, _at_prec(parent._prec, self._ball.max, other))
+
+    def sin(self):
+        return self._unop('sin')
+
+    def cos(self):
+        return self._unop('cos')
+
+    def arccos(self):
+        return self._unop('acos')
+
+    def arcsin(self):
+        return self._unop('asin')
+
+    def arctan(self):
+        return self._unop('atan')
+
+    def cosh(self):
+        return self._unop('cosh')
+
+    def sinh(self):
+        return self._unop('sinh')
+
+    def arccosh(self):
+        return self._unop('acosh')
+
+
+class ComplexIntervalFieldElement(_IntervalFieldElement):
+    __slots__ = ()
+
+    def _coerce(self, other):
+        if isinstance(other, ComplexIntervalFieldElement):
+            return _common_parent(self._parent, other._parent), other._ball
+        if isinstance(other, RealIntervalFieldElement):
+            return (_common_parent(self._parent,
+                                   other._parent.complex_field()),
+                    other._ball)
+        if isinstance(other, (int, float)):
+            return self._parent, other
+        if isinstance(other, (Vector, Matrix)):
+            return None, None
+        try:
+            return self._parent, _to_acb(other, self._parent._prec)
+        except TypeError:
+            return None, None
+
+    def _real_part(self, ball):
+        return RealIntervalFieldElement(self._parent.real_field(), ball)
+
+    def real(self):
+        return self._real_part(self._ball.real)
+
+    def imag(self):
+        return self._real_part(self._ball.imag)
+
+    def __abs__(self):
+        return self._real_part(_at_prec(self._parent._prec, abs, self._ball))
+
+    abs = __abs__
+
+    def arg(self):
+        return self._real_part(_at_prec(self._parent._prec, self._ball.arg))
+
+    def conjugate(self):
+        return self._unop('conjugate')
+
+    def polylog(self, s):
+        return ComplexIntervalFieldElement(
+            self._parent, _at_prec(self._parent._prec, self._ball.polylog, s))
+
+    def __complex__(self):
+        return complex(self._ball.mid())
+
+
+def is_RealIntervalFieldElement(x):
+    return isinstance(x, RealIntervalFieldElement)
+
+
+def is_ComplexIntervalFieldElement(x):
+    return isinstance(x, ComplexIntervalFieldElement)
+
+
+def _entries_to_acb(base_ring, entries):
+    return [ _to_acb(base_ring(e), base_ring._prec) for e in entries ]
+
+
+def _element(base_ring, ball):
+    """
+    The element of base_ring for an acb ball.
+    """
+    if isinstance(base_ring, RealIntervalField_class):
+        return RealIntervalFieldElement(base_ring, ball.real)
+    return ComplexIntervalFieldElement(base_ring, ball)
+
+
+class Vector():
+    """
+    The analogue of a Sage vector over the above fields.  The entries
+    are stored as a column acb_mat so that sums and products with
+    scalars and matrices are computed by flint.
+    """
+    def __init__(self, base_ring, entries):
+        self._base_ring = base_ring
+        self._column = flint.acb_mat(
+            [ [ b ] for b in _entries_to_acb(base_ring, entries) ])
+
+    @staticmethod
+    def _from_column(base_ring, column):
+        v = Vector.__new__(Vector)
+        v._base_ring = base_ring
+        v._column = column
+        return v
+
+    def base_ring(self):
+        return self._base_ring
+
+    def __len__(self):
+        return self._column.nrows()
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('Vector index out of range.')
+        return _element(self._base_ring, self._column[i, 0])
+
+    def list(self):
+        return list(self)
+
+    def apply_map(self, f):
+        return vector([ f(e) for e in self ])
+
+    def _check(self, other):
+        if len(self) != len(other):
+            raise ValueError('Vectors of different lengths %d and %d.' % (
+                len(self), len(other)))
+
+    def __add__(self, other):
+        self._check(other)
+        return Vector._from_column(self._base_ring, _at_prec(
+            self._base_ring._prec, operator.add, self._column, other._column))
+
+    def __sub__(self, other):
+        self._check(other)
+        return Vector._from_column(self._base_ring, _at_prec(
+            self._base_ring._prec, operator.sub, self._column, other._column))
+
+    def __neg__(self):
+        return Vector._from_column(self._base_ring, -self._column)
+
+    def __mul__(self, other):
+        prec = self._base_ring._prec
+        return Vector._from_column(self._base_ring, _at_prec(
+            prec, operator.mul, self._column, _to_acb(other, prec)))
+
+    __rmul__ = __mul__
+
+    def __repr__(self):
+        return '(%s)' % ', '.join(repr(e) for e in self)
+
+
+def vector(base_ring_or_entries, entries=None):
+    """
+    Creates a vector, the base ring can be omitted if the entries are
+    intervals.
+    """
+    if entries is None:
+        entries = list(base_ring_or_entries)
+        if not entries:
+            raise ValueError('Cannot infer the base ring of an empty vector.')
+        base_ring = entries[0].parent()
+    else:
+        base_ring = base_ring_or_entries
+    return Vector(base_ring, entries)
+
+
+def _row_to_acb(base_ring, row):
+    if isinstance(row, Vector) and row._base_ring is base_ring:
+        column = row._column
+        return [ column[i, 0] for i in range(column.nrows()) ]
+    return _entries_to_acb(base_ring, row)
+
+
+class Matrix():
+    """
+    The analogue of a Sage matrix over the above fields.  The entries
+    are stored in an acb_mat so that products, differences and inverses
+    are computed by flint.
+    """
+    def __init__(self, base_ring_or_rows, rows=None):
+        if rows is None:
+            rows = [ list(row) for row in base_ring_or_rows ]
+            base_ring = rows[0][0].parent()
+        else:
+            base_ring = base_ring_or_rows
+        self._base_ring = base_ring
+        self._mat = flint.acb_mat(
+            [ _row_to_acb(base_ring, row) for row in rows ])
+
+    @staticmethod
+    def _from_acb_mat(base_ring, mat):
+        m = Matrix.__new__(Matrix)
+        m._base_ring = base_ring
+        m._mat = mat
+        return m
+
+    @staticmethod
+    def identity(base_ring, n):
+        return Matrix._from_acb_mat(base_ring, flint.acb_mat(n, n, 1))
+
+    def base_ring(self):
+        return self._base_ring
+
+    def nrows(self):
+        return self._mat.nrows()
+
+    def ncols(self):
+        return self._mat.ncols()
+
+    def dimensions(self):
+        return self.nrows(), self.ncols()
+
+    def _element(self, ball):
+        return _element(self._base_ring, ball)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            return self._element(self._mat[key])
+        return self.rows()[key]
+
+    def rows(self):
+        return [ [ self._element(self._mat[i, j])
+                   for j in range(self.ncols()) ]
+                 for i in range(self.nrows()) ]
+
+    def list(self):
+        return [ e for row in self.rows() for e in row ]
+
+    def columns(self):
+        return [ Vector._from_column(
+                     self._base_ring,
+                     flint.acb_mat([ [ self._mat[i, j] ]
+                                     for i in range(self.nrows()) ]))
+                 for j in range(self.ncols()) ]
+
+    def transpose(self):
+        return Matrix._from_acb_mat(self._base_ring, self._mat.transpose())
+
+    def change_ring(self, base_ring):
+        return Matrix._from_acb_mat(base_ring, self._mat)
+
+    def _check(self, other):
+        if self.dimensions() != other.dimensions():
+            raise ValueError('Matrices of different dimensions.')
+
+    def __add__(self, other):
+        self._check(other)
+        return Matrix._from_acb_mat(self._base_ring, _at_prec(
+            self._base_ring._prec, operator.add, self._mat, other._mat))
+
+    def __sub__(self, other):
+        self._check(other)
+        return Matrix._from_acb_mat(self._base_ring, _at_prec(
+            self._base_ring._prec, operator.sub, self._mat, other._mat))
+
+    def __neg__(self):
+        return Matrix._from_acb_mat(self._base_ring, -self._mat)
+
+    def __mul__(self, other):
+        prec = self._base_ring._prec
+        if isinstance(other, Matrix):
+            return Matrix._from_acb_mat(self._base_ring, _at_prec(
+                prec, operator.mul, self._mat, other._mat))
+        if isinstance(other, Vector):
+            if len(other) != self.ncols():
+                raise ValueError('Vector of length %d does not match the '
+                                 '%dx%d matrix.' % ((len(other),) +
+                                                    self.dimensions()))
+            return Vector._from_column(self._base_ring, _at_prec(
+                prec, operator.mul, self._mat, other._column))
+        return Matrix._from_acb_mat(self._base_ring, _at_prec(
+            prec, operator.mul, self._mat, _to_acb(other, prec)))
+
+    def inverse(self):
+        """
+        The inverse, with error bounds unless the base ring is the
+        ComplexDoubleField.
+        """
+        n, prec = self.nrows(), self._base_ring._prec
+        if isinstance(self._base_ring, ComplexDoubleField_class):
+            inverse = _at_prec(prec, self._mat.solve, flint.acb_mat(n, n, 1),
+                               algorithm='approx')
+        else:
+            inverse = _at_prec(prec, self._mat.inv)
+        return Matrix._from_acb_mat(self._base_ring, inverse)
+
+    def __repr__(self):
+        return '\n'.join('[%s]' % ', '.join(repr(e) for e in row)
+                         for row in self.rows())
+
+
+matrix = Matrix
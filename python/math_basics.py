@@ -1,5 +1,6 @@
 from .sage_helper import _within_sage
 from .exceptions import InsufficientPrecisionError
+from . import flint_helper
 
 from functools import reduce
 import operator
@@ -14,15 +15,27 @@ __all__ = ['prod',
 
 if _within_sage:
     from sage.all import prod, xgcd
-    from sage.rings.real_mpfi import is_RealIntervalFieldElement
-    from sage.rings.complex_interval import is_ComplexIntervalFieldElement
+    from sage.rings.real_mpfi import (
+        is_RealIntervalFieldElement as _is_sage_RealIntervalFieldElement)
+    from sage.rings.complex_interval import (
+        is_ComplexIntervalFieldElement as _is_sage_ComplexIntervalFieldElement)
+
+    def is_RealIntervalFieldElement(x):
+        """
+        is_RealIntervalFieldElement returns whether x is a real
+        interval, either Sage's or one from flint_helper.
+        """
+        return (_is_sage_RealIntervalFieldElement(x) or
+                flint_helper.is_RealIntervalFieldElement(x))
 
     def is_Interval(x):
         """
         Returns True is x is either a real or complex interval as constructed
         with RealIntervalField or ComplexIntervalField, respectively.
         """
-        return is_RealIntervalFieldElement(x) or is_ComplexIntervalFieldElement(x)
+        return (is_RealIntervalFieldElement(x) or
+                _is_sage_ComplexIntervalFieldElement(x) or
+                flint_helper.is_ComplexIntervalFieldElement(x))
 
 else:
 
@@ -71,14 +84,14 @@ else:
         """
         is_RealIntervalFieldElement returns whether x is a real
         interval (constructed with RealIntervalField(precision)(value)).
-        """
 
-        # We do not support interval arithmetic outside of SnapPy,
-        # so always return False.
-        return False
+        Outside of Sage, the only intervals are those of flint_helper.
+        """
+        return flint_helper.is_RealIntervalFieldElement(x)
 
     def is_Interval(x):
-        return False
+        return (flint_helper.is_RealIntervalFieldElement(x) or
+                flint_helper.is_ComplexIntervalFieldElement(x))
 
 
 def correct_min(l):
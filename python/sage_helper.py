@@ -17,6 +17,7 @@ except ImportError:
 
 import sys
 import doctest
+import importlib.util
 import re
 import types
 
@@ -116,6 +117,7 @@ class DocTestParser(doctest.DocTestParser):
     _use_cyopengl = False
     use_modernopengl = True
     use_sage = False
+    use_flint = False
 
     def parse(self, string, name='<string>'):
         string = re.subn(
@@ -131,6 +133,11 @@ class DocTestParser(doctest.DocTestParser):
              else '#doctest: +SKIP'),
             string)[0]
 
+        string = re.subn(
+            r'#doctest: \+FLINT',
+            '' if DocTestParser.use_flint else '#doctest: +SKIP',
+            string)[0]
+
         if DocTestParser.use_sage:
             string = re.subn(r'(\n\s*)sage:|(\A\s*)sage:',
                              r'\g<1>>>>',
@@ -139,6 +146,9 @@ class DocTestParser(doctest.DocTestParser):
 
 
 DocTestParser.use_sage = _within_sage
+# Doctests marked "#doctest: +FLINT" use the verified computations
+# outside of Sage, see flint_helper.py.
+DocTestParser.use_flint = importlib.util.find_spec('flint') is not None
 
 if _within_sage:
     globs = {'PSL': sage.all.PSL, 'BraidGroup': sage.all.BraidGroup}
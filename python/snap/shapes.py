@@ -38,7 +38,11 @@ def eval_gluing_equation(eqn, shapes):
     a, b, c = eqn
     ans = int(c)
     for i, z in enumerate(shapes):
-        ans = ans * (z**int(a[i]) * (1 - z)**int(b[i]))
+        # Most exponents are zero
+        if a[i]:
+            ans = ans * z**int(a[i])
+        if b[i]:
+            ans = ans * (1 - z)**int(b[i])
     return ans
 
 
@@ -85,6 +89,12 @@ def enough_gluing_equations(manifold):
     return [(list(map(int, A)), list(map(int, B)), int(c)) for A, B, c in ans_eqns]
 
 
+def _log_derivative(a, b, z):
+    if a == 0 and b == 0:
+        return 0
+    return a / z - b / (1 - z)
+
+
 def float_to_pari(x, dec_prec):
     return pari(0) if x == 0 else pari(x).precision(dec_prec)
 
@@ -94,10 +104,16 @@ def complex_to_pari(z, dec_prec):
                         float_to_pari(z.imag, dec_prec))
 
 
-def polished_tetrahedra_shapes(manifold, dec_prec=None, bits_prec=200, ignore_solution_type=False):
+def polished_tetrahedra_shapes(manifold, dec_prec=None, bits_prec=200,
+                               ignore_solution_type=False, equations=None):
     """
     Refines the current solution to the gluing equations to one with
     the specified accuracy.
+
+    The equations used for Newton's method can be given as returned by
+    enough_gluing_equations (they are computed otherwise). If the shapes
+    were already polished to a lower precision, Newton's method starts
+    from these shapes.
     """
     if dec_prec is None:
         dec_prec = prec_bits_to_dec(bits_prec)
@@ -114,6 +130,7 @@ def polished_tetrahedra_shapes(manifold, dec_prec=None, bits_prec=200, ignore_so
 
     # This is a potentially long calculation, so we cache the result
 
+    curr_sol = None
     if "polished_shapes" in manifold._cache:
         curr_bits_prec, curr_sol = manifold._cache["polished_shapes"]
         if bits_prec <= curr_bits_prec:
@@ -130,15 +147,22 @@ def polished_tetrahedra_shapes(manifold, dec_prec=None, bits_prec=200, ignore_so
         raise ValueError('Initial solution not very good')
 
     # Now begin the actual computation
-    eqns = enough_gluing_equations(manifold)
-    shapes = init_shapes
+    if equations is None:
+        eqns = enough_gluing_equations(manifold)
+    else:
+        eqns = equations
+    if curr_sol is None:
+        shapes = init_shapes
+    else:
+        shapes = pari_column_vector(
+            [z.precision(working_prec) for z in pari_vector_to_list(curr_sol)])
     initial_error = infinity_norm(gluing_equation_errors(eqns, shapes))
     for i in range(100):
         errors = gluing_equation_errors(eqns, shapes)
         error = infinity_norm(errors)
         if error < target_espilon or error > 100 * initial_error:
             break
-        derivative = pari_matrix([[eqn[0][i] / z - eqn[1][i] / (1 - z)
+        derivative = pari_matrix([[_log_derivative(eqn[0][i], eqn[1][i], z)
                                    for i, z in enumerate(pari_vector_to_list(shapes))] for eqn in eqns])
         gauss = derivative.matsolve(pari_column_vector(errors))
         shapes = shapes - gauss
@@ -4,6 +4,7 @@ import snappy
 import snappy.snap.test
 import spherogram.test
 import snappy.matrix
+import snappy.flint_helper
 import snappy.verify.test
 import snappy.ptolemy.test
 import snappy.tiling.floor
@@ -104,9 +105,12 @@ if not _within_sage:
 modules += [snappy.SnapPy,
             snappy.SnapPyHP,
             snappy_database_doctester,
+            snappy.batch,
+            snappy.cache,
             snappy,
             snap_doctester,
             snappy.matrix,
+            snappy.flint_helper,
             snappy.tiling.floor,
             snappy.tiling.real_hash_dict,
             snappy.tiling.canonical_key_dict,
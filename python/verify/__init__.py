@@ -1,5 +1,7 @@
+from .interval_backends import *
 from .interval_newton_shapes_engine import *
 from .krawczyk_shapes_engine import *
+from .precision_ladder import *
 
 from .verifyHyperbolicity import *
 from .verifyCanonical import *
@@ -13,3 +15,5 @@ from .maximal_cusp_area_matrix import *
 # Choice of algorithm for finding intervals
 CertifiedShapesEngine = KrawczykShapesEngine
 # CertifiedShapesEngine = IntervalNewtonShapesEngine
+
+from . import batch
@@ -0,0 +1,215 @@
+"""
+Caches the number field containing the shapes of a triangulation and the
+exact shapes found by snap (which uses the LLL-algorithm).
+
+Finding the shape field is by far the most expensive step of verifying
+the canonical retriangulation exactly and the same triangulation is
+often encountered several times, e.g., when calling
+verified_canonical_retriangulation and isometry_signature(verified=True)
+for the same manifold or for different triangulations of the same
+manifold which canonize to the same proto-canonical triangulation.
+Thus the result of find_field is cached, keyed by the decorated isosig
+of the triangulation. The cache in memory keeps the most recently used
+_max_exact_shapes results. If the persistent cache has been enabled with
+snappy.cache.enable_persistent_cache, the results are also stored on
+disk so that they survive across processes.
+
+The isosig does not determine the numbering of the tetrahedra and their
+vertices. Thus the cache stores the defining polynomial, the embedding
+and the exact shapes in a plain form and the cached shapes are matched
+against the numerical shapes of the given triangulation when looked up,
+using the shape parameters for all three edges of a tetrahedron and the
+complex conjugate embedding for the mirror image. If not all shapes can
+be matched, the field is found again. Note that the result is always
+checked exactly by the callers.
+"""
+
+from ..sage_helper import _within_sage, sage_method
+from .. import cache
+
+import collections
+
+if _within_sage:
+    from sage.all import ZZ, QQ, ComplexField, PolynomialRing
+    from ..snap.find_field import ExactAlgebraicNumber
+
+__all__ = ['find_exact_shapes', 'clear_exact_shapes_cache']
+
+# Maps the decorated isosig of a triangulation to a tuple
+# (coefficients of the defining polynomial, bits of precision of the
+# root, real and imaginary part of the root, coefficients of the shapes
+# as polynomials in the root) where all numbers are strings so that the
+# entries can be pickled without depending on the version of SageMath.
+# The least recently used entries are dropped beyond _max_exact_shapes.
+_exact_shapes = collections.OrderedDict()
+_max_exact_shapes = 1000
+
+
+def clear_exact_shapes_cache():
+    """
+    Forgets the shape fields found in this process. Use
+    snappy.cache.persistent_cache.invalidate('exact_shapes') for those
+    stored on disk.
+    """
+    _exact_shapes.clear()
+
+
+def _key(M):
+    try:
+        isosig = M.triangulation_isosig(decorated=True,
+                                        ignore_cusp_ordering=True,
+                                        ignore_curve_orientations=True)
+    except (ValueError, RuntimeError):
+        return None
+    return ('ExactShapes', isosig, 'exact_shapes', (), ())
+
+
+def _remember(key, entry):
+    """
+    Keeps the entry in memory, dropping the least recently used ones
+    beyond _max_exact_shapes::
+
+        >>> from snappy.verify import exact_shapes
+        >>> saved = exact_shapes._max_exact_shapes
+        >>> exact_shapes._max_exact_shapes = 2
+        >>> clear_exact_shapes_cache()
+        >>> for key in 'abc':
+        ...     _remember(key, key.upper())
+        >>> list(_exact_shapes.items())
+        [('b', 'B'), ('c', 'C')]
+        >>> exact_shapes._max_exact_shapes = saved
+        >>> clear_exact_shapes_cache()
+    """
+    _exact_shapes[key] = entry
+    _exact_shapes.move_to_end(key)
+    while len(_exact_shapes) > _max_exact_shapes:
+        _exact_shapes.popitem(last=False)
+
+
+def _lookup(key):
+    try:
+        entry = _exact_shapes[key]
+    except KeyError:
+        pass
+    else:
+        _exact_shapes.move_to_end(key)
+        return entry
+    if cache.persistent_cache is not None:
+        try:
+            entry = cache.persistent_cache.lookup(key)
+        except KeyError:
+            return None
+        _remember(key, entry)
+        return entry
+    return None
+
+
+def _save(key, entry):
+    _remember(key, entry)
+    if cache.persistent_cache is not None:
+        cache.persistent_cache.save(key, entry)
+
+
+def _entry_from_field_data(field_data):
+    field, root, exact_shapes = field_data
+    approx_root = root._approx_root
+    return ([ str(c) for c in root.min_polynomial().list() ],
+            str(approx_root.prec()),
+            str(approx_root.real()),
+            str(approx_root.imag()),
+            [ [ str(c) for c in shape.polynomial().list() ]
+              for shape in exact_shapes ])
+
+
+def _field_data_from_entry(entry, conjugate):
+    poly_coeffs, root_prec, root_real, root_imag, shapes_coeffs = entry
+    poly = PolynomialRing(ZZ, 'x')([ ZZ(c) for c in poly_coeffs ])
+    approx_root = ComplexField(int(root_prec))(root_real, root_imag)
+    if conjugate:
+        approx_root = approx_root.conjugate()
+    root = ExactAlgebraicNumber(poly, approx_root)
+    field = root.number_field()
+    return field, root, [ field([ QQ(c) for c in coeffs ])
+                          for coeffs in shapes_coeffs ]
+
+
+def _edge_parameters(z):
+    """
+    The shape parameters of a tetrahedron for all three edges and both
+    orientations.
+    """
+    if z == 0 or z == 1:
+        return [ z ]
+    return [ z, 1 / (1 - z), 1 - 1 / z, 1 / z, 1 - z, z / (z - 1) ]
+
+
+def _match_shapes(field_data, approx_shapes, prec):
+    """
+    Given (number field, root, exact shapes) and the numerical shapes of
+    a triangulation, returns the exact shapes in the order of the
+    numerical shapes or None if not every numerical shape is close to an
+    edge parameter of one of the exact shapes.
+    """
+    field, root, exact_shapes = field_data
+    CC = ComplexField(prec)
+    r = CC(root(prec))
+    candidates = [ (CC(p.polynomial()(r)), p)
+                   for z in set(exact_shapes)
+                   for p in _edge_parameters(z) ]
+    epsilon = CC(2) ** (-prec // 2)
+    result = []
+    for approx_shape in approx_shapes:
+        w = CC(approx_shape)
+        for value, p in candidates:
+            if abs(value - w) < epsilon * max(1, abs(w)):
+                result.append(p)
+                break
+        else:
+            return None
+    return field, root, result
+
+
+@sage_method
+def find_exact_shapes(M, prec, degree):
+    """
+    Returns the result of M.tetrahedra_field_gens().find_field(prec, degree),
+    that is the number field containing the shapes, an approximation of
+    its generator and the shapes as elements of the number field, or None
+    on failure. The result is cached, see the module description::
+
+       sage: from snappy import Manifold
+       sage: clear_exact_shapes_cache()
+       sage: M = Manifold("m412")
+       sage: K, z, shapes = find_exact_shapes(M, 200, 10)
+       sage: len(shapes), len(_exact_shapes)
+       (5, 1)
+
+    The shapes of the same triangulation with a different numbering of the
+    tetrahedra or of its mirror image are taken from the cache::
+
+       sage: N = Manifold(M.triangulation_isosig()).mirror_manifold()
+       sage: K, z, shapes = find_exact_shapes(N, 200, 10)
+       sage: len(shapes), len(_exact_shapes)
+       (5, 1)
+       sage: all(abs(s.polynomial()(z(100)) - w) < 1e-20
+       ....:     for s, w in zip(shapes, N.tetrahedra_shapes('rect', bits_prec=100)))
+       True
+    """
+    gens = M.tetrahedra_field_gens()
+
+    key = _key(M)
+    if key is not None:
+        entry = _lookup(key)
+        if entry is not None and len(entry[0]) - 1 <= degree:
+            approx_shapes = gens(prec)
+            for conjugate in [ False, True ]:
+                field_data = _match_shapes(
+                    _field_data_from_entry(entry, conjugate),
+                    approx_shapes, prec)
+                if field_data is not None:
+                    return field_data
+
+    field_data = gens.find_field(prec, degree)
+    if field_data and key is not None:
+        _save(key, _entry_from_field_data(field_data))
+    return field_data
@@ -1,13 +1,13 @@
+import copy
+
 from snappy import snap
-from snappy.sage_helper import _within_sage, sage_method
+from snappy.pari import prec_dec_to_bits
+from .interval_backends import interval_backend, interval_method
 
-if _within_sage:
-    from sage.rings.complex_interval_field import ComplexIntervalField
-    from sage.rings.real_mpfi import RealIntervalField
-    from sage.all import ComplexDoubleField
-    from sage.all import matrix
-    from sage.modules.free_module_element import vector
-    from snappy.pari import prec_dec_to_bits
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 __all__ = ['KrawczykShapesEngine']
 
@@ -57,11 +57,17 @@ class KrawczykShapesEngine:
        and thus no need for automatic differentiation.
 
     3. For speed-up, the approximate inverse is always computed with
-       double's. Some intermediate matrix computations are performed sparsely.
-
-    In contrast to HIKMOT, we use and return Sage's native implementation of
-    (complex) interval arithmetic here, which allows for increased interoperability.
-    Another advantage is that Sage supports arbitrary precision.
+       double's (by LAPACK if numpy is available). Since the derivative is
+       of the form A * diag(1/z) - B * diag(1/(1-z)) for integer matrices
+       A and B, the products of the approximate inverse with A and B are
+       computed once (sparsely) and each Krawczyk iteration only needs three
+       matrix-vector products, see krawczyk_interval.
+
+    In contrast to HIKMOT, we use and return the intervals of the interval
+    backend, see interval_backend: Sage's native implementation of (complex)
+    interval arithmetic inside Sage, which allows for increased
+    interoperability, and python-flint's arb balls otherwise. Both support
+    arbitrary precision.
 
     Here is an example how to explicitly invoke the KrawczykShapesEngine::
 
@@ -146,12 +152,16 @@ class KrawczykShapesEngine:
             # prod keeps the above product
             prod = BaseField(c)
             for a, b, shape in zip(A, B, shapes):
-                prod *= (shape ** a) * (one - shape) ** b
+                # Most exponents are zero
+                if a != 0:
+                    prod *= shape ** a
+                if b != 0:
+                    prod *= (one - shape) ** b
 
             # Take log of the entire product
             gluing_LHSs.append(prod.log())
 
-        return vector(BaseField, gluing_LHSs)
+        return interval_backend().vector(BaseField, gluing_LHSs)
 
     def log_gluing_LHS_derivatives(self, shapes):
         """
@@ -202,7 +212,7 @@ class KrawczykShapesEngine:
 
             gluing_LHS_derivatives.append(row)
 
-        return matrix(BaseField, gluing_LHS_derivatives)
+        return interval_backend().matrix(BaseField, gluing_LHS_derivatives)
 
     def log_gluing_LHS_derivatives_sparse(self, shapes):
         """
@@ -243,18 +253,21 @@ class KrawczykShapesEngine:
         (in the format described in log_gluing_LHS_derivatives_sparse).
         """
 
+        # Column j of the result is the linear combination of the
+        # columns of m with the coefficients in column j of sparse_m.
+        # Using vector operations for this is considerably faster than
+        # computing each entry.
         CIF = m.base_ring()
-        zero = CIF(0)
-        rows = []
-        for row in m.rows():
-            result_row = []
-            for col in sparse_m:
-                v = zero
-                for r, d in col:
-                    v += d * row[r]
-                result_row.append(v)
-            rows.append(result_row)
-        return matrix(CIF, rows)
+        backend = interval_backend()
+        columns = m.columns()
+        zero = backend.vector(CIF, [0] * m.nrows())
+        result_columns = []
+        for col in sparse_m:
+            v = zero
+            for r, d in col:
+                v = v + d * columns[r]
+            result_columns.append(v)
+        return backend.matrix(CIF, result_columns).transpose()
 
     @staticmethod
     def interval_vector_mid_points(vec):
@@ -302,20 +315,42 @@ class KrawczykShapesEngine:
 
         """
 
-        # Compute df([z])
-        derivative = self.log_gluing_LHS_derivatives_sparse(shape_intervals)
-
-        # Compute c * df([z])
-        p = KrawczykShapesEngine.matrix_times_sparse(
-            self.approx_inverse, derivative)
-
-        # Compute Id - c * df([z])
-        diff = self.identity - p
+        # Recall that
+        #
+        #    df([z]) = A * diag(1/[z]) - B * diag(1/(1-[z]))
+        #
+        # where A and B are the exponents of the equations. Thus,
+        #
+        #    (Id - c * df([z])) * ([z] - z0) = (Id - c * df(z0)) * ([z] - z0)
+        #                  - (c * A) * ((1/[z] - 1/z0) * ([z] - z0))
+        #                  + (c * B) * ((1/(1-[z]) - 1/(1-z0)) * ([z] - z0))
+        #
+        # with entry-wise products of vectors on the right hand side.
+        # Id - c * df(z0), c * A and c * B do not depend on [z] and are
+        # computed once in __init__, so this only needs three
+        # matrix-vector products. Since the terms are small, there is no
+        # need for the cancellation of Id - c * df([z]).
+        BaseField = shape_intervals[0].parent()
+        one = BaseField(1)
+        vector = interval_backend().vector
+
+        diff = shape_intervals - self.initial_shapes
+        diff_times_shape_inverses = vector(
+            [ d * (one / z - z0)
+              for d, z, z0 in zip(diff, shape_intervals,
+                                  self.initial_shape_inverses) ])
+        diff_times_one_minus_shape_inverses = vector(
+            [ d * (one / (one - z) - z0)
+              for d, z, z0 in zip(diff, shape_intervals,
+                                  self.initial_one_minus_shape_inverses) ])
 
         # self.first_term is z0 - c * f(z0)
 
         return (self.first_term
-                + diff * (shape_intervals - self.initial_shapes))
+                + self.identity_minus_preconditioned_derivative * diff
+                - self.approx_inverse_times_A * diff_times_shape_inverses
+                + (self.approx_inverse_times_B *
+                   diff_times_one_minus_shape_inverses))
 
     @staticmethod
     def interval_vector_is_contained_in(vecA, vecB):
@@ -352,10 +387,12 @@ class KrawczykShapesEngine:
         i.e., the smallest interval containing both intervals.
         """
 
-        return vector([a.union(b) for a, b in zip(vecA, vecB)])
+        return interval_backend().vector(
+            [a.union(b) for a, b in zip(vecA, vecB)])
 
-    @sage_method
-    def __init__(self, M, initial_shapes, bits_prec=None, dec_prec=None):
+    @interval_method
+    def __init__(self, M, initial_shapes, bits_prec=None, dec_prec=None,
+                 equations=None):
         """
         Initializes the KrawczykShapesEngine given an orientable SnapPy
         Manifold M, approximated solutions initial_shapes to the
@@ -363,13 +400,15 @@ class KrawczykShapesEngine:
         and the precision to be used for the desired computations in either
         bits bits_prec or decimal digits dec_prec.
 
-        This requires Sage since it uses Sage's ComplexIntervalField for its
-        computations.
+        This requires Sage or python-flint for the interval arithmetic,
+        see interval_backends.py.
 
         Note that this will choose an independent set of edge equations and
         one equation per cusp. It is known that a solution to such a subset of
         rectangular gluing equations is also a solution to the full set of
-        rectangular gluing equations::
+        rectangular gluing equations. Such a subset as returned by
+        snap.shapes.enough_gluing_equations(M) can also be given as
+        equations::
 
             sage: from snappy import Manifold
             sage: M = Manifold("m019")
@@ -400,37 +439,90 @@ class KrawczykShapesEngine:
 
         # Convert to precision in bits if necessary
         if dec_prec:
-            self.prec = prec_dec_to_bits(dec_prec)
-        elif bits_prec:
-            self.prec = bits_prec
-        else:
+            bits_prec = prec_dec_to_bits(dec_prec)
+        elif not bits_prec:
             raise Exception("Need dec_prec or bits_prec")
 
-        # Setup interval types of desired precision
-        self.CIF = ComplexIntervalField(self.prec)
-        self.RIF = RealIntervalField(self.prec)
-
         # Verify that manifold is orientable
         if not M.is_orientable():
             raise Exception("Manifold needs to be orientable")
 
-        # Initialize the shape intervals, they have zero length
-        self.initial_shapes = vector(
-            [self.CIF(shape) for shape in initial_shapes])
-
         # Get an independent set of gluing equations from snap
-        self.equations = snap.shapes.enough_gluing_equations(M)
+        if equations is None:
+            equations = snap.shapes.enough_gluing_equations(M)
+        self.equations = equations
         self._make_sparse_equations()
 
-        self.identity = matrix.identity(self.CIF, len(self.initial_shapes))
+        self._initialize(initial_shapes, bits_prec, approx_inverse=None)
+
+    def with_initial_shapes(self, initial_shapes, bits_prec):
+        """
+        Returns a new engine for the given initial shapes and precision
+        which reuses the equations and the approximate inverse of this
+        engine. This is meant for retrying with higher precision after
+        this engine failed to certify the shapes::
+
+            sage: M = Manifold("m019")
+            sage: C = KrawczykShapesEngine(M, M.tetrahedra_shapes('rect'), bits_prec = 53)
+            sage: D = C.with_initial_shapes(M.tetrahedra_shapes('rect', bits_prec = 212), bits_prec = 212)
+            sage: D.expand_until_certified()
+            True
+            sage: D.certified_shapes[2] # doctest: +NUMERIC30
+            0.46002117557372418814169958097...? + 0.63262419360526522669496545004...?*I
 
-        CDF = ComplexDoubleField()
+        """
+        engine = copy.copy(self)
+        engine._initialize(initial_shapes, bits_prec,
+                           approx_inverse=self.approx_inverse_double)
+        return engine
 
-        # Could be sparse
-        approx_deriv = self.log_gluing_LHS_derivatives(
-            [ CDF(shape) for shape in initial_shapes] )
-        approx_inverse_double = approx_deriv.inverse()
-        self.approx_inverse = approx_inverse_double.change_ring(self.CIF)
+    def _initialize(self, initial_shapes, bits_prec, approx_inverse):
+        """
+        Sets up everything depending on the initial shapes and the
+        precision. approx_inverse is an approximate inverse of the
+        derivative at the initial shapes as returned by
+        _approx_inverse_double or None to compute it.
+        """
+
+        self.prec = bits_prec
+
+        # Setup interval types of desired precision
+        backend = interval_backend()
+        self.CIF = backend.ComplexIntervalField(self.prec)
+        self.RIF = backend.RealIntervalField(self.prec)
+
+        # Initialize the shape intervals, they have zero length
+        self.initial_shapes = backend.vector(
+            [self.CIF(shape) for shape in initial_shapes])
+
+        self.identity = backend.matrix.identity(
+            self.CIF, len(self.initial_shapes))
+
+        if approx_inverse is None:
+            approx_inverse = self._approx_inverse_double(initial_shapes)
+        self.approx_inverse_double = approx_inverse
+        # Check the type rather than whether numpy is available: the
+        # approximate inverse may have been computed by an engine that
+        # did not use numpy, see with_initial_shapes.
+        if numpy is not None and isinstance(approx_inverse, numpy.ndarray):
+            self.approx_inverse = backend.matrix(
+                self.CIF, approx_inverse.tolist())
+        else:
+            self.approx_inverse = approx_inverse.change_ring(self.CIF)
+
+        # The terms of the Krawczyk interval not depending on the shape
+        # intervals, see krawczyk_interval.
+        one = self.CIF(1)
+        self.initial_shape_inverses = [
+            one / shape for shape in self.initial_shapes ]
+        self.initial_one_minus_shape_inverses = [
+            one / (one - shape) for shape in self.initial_shapes ]
+        self.identity_minus_preconditioned_derivative = (
+            self.identity - KrawczykShapesEngine.matrix_times_sparse(
+                self.approx_inverse,
+                self.log_gluing_LHS_derivatives_sparse(self.initial_shapes)))
+        self.approx_inverse_times_A = self._approx_inverse_times_exponents(0)
+        self.approx_inverse_times_B = self._approx_inverse_times_exponents(1)
 
         # Compute the term z0 - c * f(z0) in the formula for
         # the Krawczyk interval K(z0, [z], f)
@@ -442,6 +534,7 @@ class KrawczykShapesEngine:
 
         # Shapes have not been certified yet
         self.certified_shapes = None
+        self.expanded_shapes = None
 
     def _make_sparse_equations(self):
         num_eqns = len(self.equations)
@@ -456,6 +549,56 @@ class KrawczykShapesEngine:
                     column.append((r, (a,b)))
             self.sparse_equations.append(column)
 
+    def _approx_inverse_double(self, initial_shapes):
+        """
+        The approximate inverse of the derivative at the initial shapes,
+        computed with doubles by LAPACK if numpy is available (as numpy
+        array) and by the interval backend's ComplexDoubleField otherwise.
+        Both give the same certified shapes::
+
+        >>> from snappy import Manifold                              #doctest: +FLINT
+        >>> from snappy.verify import krawczyk_shapes_engine as engine   #doctest: +FLINT
+        >>> M = Manifold('m019')                                     #doctest: +FLINT
+        >>> shapes = M.tetrahedra_shapes('rect')                     #doctest: +FLINT
+        >>> C = KrawczykShapesEngine(M, shapes, bits_prec=53)        #doctest: +FLINT
+        >>> numpy is None or isinstance(C.approx_inverse_double, numpy.ndarray)   #doctest: +FLINT
+        True
+        >>> saved_numpy, engine.numpy = engine.numpy, None           #doctest: +FLINT
+        >>> D = KrawczykShapesEngine(M, shapes, bits_prec=53)        #doctest: +FLINT
+        >>> engine.numpy = saved_numpy                               #doctest: +FLINT
+        >>> E = D.with_initial_shapes(shapes, bits_prec=53)          #doctest: +FLINT
+        >>> [X.expand_until_certified() for X in (C, D, E)]          #doctest: +FLINT
+        [True, True, True]
+        >>> all(abs(a.center() - b.center()) < 1e-12                 #doctest: +FLINT
+        ...     for a, b in zip(C.certified_shapes, D.certified_shapes))
+        True
+        """
+        if numpy is None:
+            CDF = interval_backend().ComplexDoubleField()
+
+            # Could be sparse
+            approx_deriv = self.log_gluing_LHS_derivatives(
+                [ CDF(shape) for shape in initial_shapes] )
+            return approx_deriv.inverse()
+
+        shapes = numpy.array([ complex(shape) for shape in initial_shapes ])
+        A = numpy.array([ A for A, B, c in self.equations ], dtype=float)
+        B = numpy.array([ B for A, B, c in self.equations ], dtype=float)
+        approx_deriv = A / shapes - B / (1 - shapes)
+        return numpy.linalg.inv(approx_deriv)
+
+    def _approx_inverse_times_exponents(self, index):
+        """
+        The product of the approximate inverse with the matrix A (index 0)
+        or B (index 1) of the equations.
+        """
+        return KrawczykShapesEngine.matrix_times_sparse(
+            self.approx_inverse,
+            [ [ (r, self.CIF(int(exponents[index])))
+                for r, exponents in column
+                if exponents[index] != 0 ]
+              for column in self.sparse_equations ])
+
     @staticmethod
     def _expand_intervals_a_little(shapes):
         """
@@ -513,6 +656,10 @@ class KrawczykShapesEngine:
                     shapes)
 
         # After several iterations, still no certified shapes, give up.
+        # Keep the last shape intervals, their widths indicate how much
+        # the precision needs to be increased.
+        self.expanded_shapes = shapes
+
         if verbose:
             print("Could not certify shapes")
 
@@ -1,4 +1,5 @@
 from . import verifyHyperbolicity
+from .interval_backends import require_sage_intervals
 
 __all__ = ['compute_hyperbolic_shapes']
 
@@ -7,6 +8,11 @@ from typing import Optional
 def compute_hyperbolic_shapes(manifold,
                               verified : bool, bits_prec : Optional[int] = None):
 
+    # The cusp cross sections, fundamental polyhedra, etc. computed from
+    # these shapes only work with Sage's intervals.
+    if verified:
+        require_sage_intervals('this verified computation')
+
     # Get shapes, as intervals if requested
     shapes = manifold.tetrahedra_shapes('rect', intervals=verified,
                                         bits_prec=bits_prec)
@@ -39,6 +39,7 @@ if _within_sage:
 
     from ..snap import find_field
 
+from .exact_shapes import find_exact_shapes
 from .realAlgebra import field_containing_real_and_imaginary_part_of_number_field
 
 
@@ -89,6 +90,8 @@ def find_shapes_as_complex_sqrt_lin_combinations(M, prec, degree):
     real and imaginary part. Return the shapes as list of
     ComplexSqrtLinCombination's. Return None on failure.
 
+    The shape field found by snap is cached by find_exact_shapes.
+
     Example::
 
        sage: from snappy import Manifold
@@ -101,7 +104,7 @@ def find_shapes_as_complex_sqrt_lin_combinations(M, prec, degree):
     # parts of all shapes.
 
     # First we try to find the field containing the complex shapes:
-    complex_data = M.tetrahedra_field_gens().find_field(prec, degree)
+    complex_data = find_exact_shapes(M, prec, degree)
     if not complex_data:
         return None
 
@@ -59,6 +59,9 @@ def run_doctests(verbose=False, print_info=True):
             generate_test_with_shapes_engine(
                 verify.verifyHyperbolicity,
                 verify.IntervalNewtonShapesEngine),
+            verify.interval_backends,
+            verify.precision_ladder,
+            verify.batch,
             verify.verifyCanonical,
             verify.interval_tree,
             volume,
@@ -71,6 +74,7 @@ def run_doctests(verbose=False, print_info=True):
             verify.maximal_cusp_area_matrix.cusp_tiling_engine,
             verify.maximal_cusp_area_matrix.cusp_translate_engine,
             verify.squareExtensions,
+            verify.exact_shapes,
             verify.realAlgebra ],
         extraglobs=globs,
         verbose=verbose, print_info=print_info)
@@ -6,6 +6,7 @@ from ..snap.t3mlite import simplex
 from .squareExtensions import find_shapes_as_complex_sqrt_lin_combinations
 from . import edge_equations
 from . import verifyHyperbolicity
+from .precision_ladder import PrecisionLadder
 from . import exceptions
 from ..exceptions import SnapPeaFatalError
 
@@ -86,6 +87,13 @@ def interval_checked_canonical_triangulation(M, bits_prec=None):
     shapes = M.tetrahedra_shapes('rect', intervals=True,
                                  bits_prec=bits_prec)
 
+    return _interval_checked_canonical_triangulation_with_shapes(M, shapes)
+
+
+def _interval_checked_canonical_triangulation_with_shapes(M, shapes):
+    # Implements interval_checked_canonical_triangulation given
+    # the verified shape intervals.
+
     # Compute cusp cross sections
     c = RealCuspCrossSection.fromManifoldAndShapes(M, shapes)
 
@@ -280,7 +288,8 @@ def verified_canonical_retriangulation(
     M,
     interval_bits_precs=default_interval_bits_precs,
     exact_bits_prec_and_degrees=default_exact_bits_prec_and_degrees,
-    verbose=False):
+    verbose=False,
+    details=None):
     """
     Given some triangulation of a cusped (possibly non-orientable) manifold ``M``,
     return its canonical retriangulation. Return ``None`` if it could not certify
@@ -303,8 +312,10 @@ def verified_canonical_retriangulation(
       a list of precisions used to try to
       certify the canonical triangulation using intervals. By default, it
       first tries to certify using 53 bits precision. If it failed, it tries
-      212 bits precision next. If it failed again, it moves on to trying exact
-      arithmetics.
+      higher precisions up to 212 bits, the largest given precision. The
+      next precision is chosen from the widths of the intervals that made
+      it fail, see :py:class:`PrecisionLadder`. If it failed again, it moves
+      on to trying exact arithmetics.
 
     - ``exact_bits_prec_and_degrees``:
       a list of pairs (precision, maximal degree) used when the LLL-algorithm
@@ -314,6 +325,12 @@ def verified_canonical_retriangulation(
     - ``verbose``:
       If ``True``, print out additional information.
 
+    - ``details``:
+      If a dictionary is given, the method that certified the result is
+      stored in it: ``'method'`` is ``'intervals'`` or ``'exact'`` and
+      ``'bits_prec'`` is the precision used (and ``'degree'`` the maximal
+      degree for ``'exact'``).
+
     The exact arithmetics can take a long time. To circumvent it, use
     ``exact_bits_prec_and_degrees = None``.
 
@@ -385,7 +402,7 @@ def verified_canonical_retriangulation(
 
             return _verified_canonical_retriangulation(
                 M, interval_bits_precs, exact_bits_prec_and_degrees,
-                verbose)
+                verbose, details)
 
         except (ZeroDivisionError,
                 exceptions.TiltProvenPositiveNumericalVerifyError,
@@ -443,7 +460,7 @@ def verified_canonical_retriangulation(
 
 def _verified_canonical_retriangulation(
         M, interval_bits_precs, exact_bits_prec_and_degrees,
-        verbose):
+        verbose, details=None):
 
     # Implements the "inner" retry loop of verified_canonical_retriangulation
 
@@ -482,22 +499,33 @@ def _verified_canonical_retriangulation(
 
     # First try interval arithmetics to verify
     if interval_bits_precs:
-        for interval_bits_prec in interval_bits_precs:
+        # The precisions in between the first and the largest precision
+        # are chosen from the widths of the intervals, reusing the
+        # gluing equations and polished shapes of the previous precision.
+        ladder = PrecisionLadder(
+            Mcopy, interval_bits_precs[0], max(interval_bits_precs),
+            verbose=verbose)
+        if verbose:
+            print(("Method: Intervals with interval_bits_prec = %d "
+                   "up to %d") % (ladder.min_bits_prec, ladder.max_bits_prec))
+        try:
+            result = ladder.run(
+                lambda shapes: (
+                    _interval_checked_canonical_triangulation_with_shapes(
+                        Mcopy, shapes)))
+            if details is not None:
+                details.update(method='intervals',
+                               bits_prec=ladder.rungs[-1].bits_prec)
+            return result
+        except (RuntimeError, exceptions.NumericalVerifyError) as e:
             if verbose:
-                print(("Method: Intervals with "
-                       "interval_bits_prec = %d") % interval_bits_prec)
-            try:
-                return interval_checked_canonical_triangulation(
-                    Mcopy, interval_bits_prec)
-            except (RuntimeError, exceptions.NumericalVerifyError) as e:
-                if verbose:
-                    _print_exception(e)
-                    if isinstance(e, exceptions.NumericalVerifyError):
-                        print("Failure: Could not verify proto-canonical "
-                              "triangulation.")
-                    else:
-                        print("Failure: Could not find verified interval.")
-                    print("Next step: trying different method/precision.")
+                _print_exception(e)
+                if isinstance(e, exceptions.NumericalVerifyError):
+                    print("Failure: Could not verify proto-canonical "
+                          "triangulation.")
+                else:
+                    print("Failure: Could not find verified interval.")
+                print("Next step: trying different method/precision.")
 
     # Then using exact arithmetics
     if exact_bits_prec_and_degrees:
@@ -506,8 +534,12 @@ def _verified_canonical_retriangulation(
                 print(("Method: Exact, using LLL with "
                        "bits_prec = %d, degree = %d") % (bits_prec, degree))
             try:
-                return exactly_checked_canonical_retriangulation(
+                result = exactly_checked_canonical_retriangulation(
                     Mcopy, bits_prec, degree)
+                if details is not None:
+                    details.update(method='exact',
+                                   bits_prec=bits_prec, degree=degree)
+                return result
             except FindExactShapesError as e:
                 if verbose:
                     _print_exception(e)
@@ -1,15 +1,12 @@
-from ..sage_helper import _within_sage, sage_method
 from .. import snap
 from . import exceptions
+from .interval_backends import interval_method, require_sage_intervals
+from .precision_ladder import PrecisionLadder
 
 __all__ = [
     'check_logarithmic_gluing_equations_and_positively_oriented_tets',
     'verify_hyperbolicity' ]
 
-if _within_sage:
-    from sage.all import pi
-    import sage.all
-
 
 class FalseTuple(tuple):
     def __nonzero__(self):
@@ -28,7 +25,7 @@ class NonIntegralFillingsError(RuntimeError):
         return ('Manifold has non-integral Dehn-filings: %s') % self.manifold
 
 
-@sage_method
+@interval_method
 def check_logarithmic_gluing_equations_and_positively_oriented_tets(
         manifold, shape_intervals):
     """
@@ -103,7 +100,7 @@ def check_logarithmic_gluing_equations_and_positively_oriented_tets(
     CIF = shape_intervals[0].parent()
     RIF = CIF.real_field()
     # 2 pi i in that field
-    two_pi_i = CIF(2 * pi * sage.all.I)
+    two_pi_i = CIF(0, 2 * RIF.pi())
 
     # Index of the next gluing equation to check
     LHS_index = 0
@@ -137,9 +134,10 @@ def check_logarithmic_gluing_equations_and_positively_oriented_tets(
             LHS_index += 1
 
 
-@sage_method
+@interval_method
 def verify_hyperbolicity(manifold, verbose=False, bits_prec=None,
-                         holonomy=False, fundamental_group_args=[], lift_to_SL=True):
+                         holonomy=False, fundamental_group_args=[], lift_to_SL=True,
+                         max_bits_prec=None):
     """
     Given an orientable SnapPy Manifold, verifies its hyperbolicity.
 
@@ -192,28 +190,61 @@ def verify_hyperbolicity(manifold, verbose=False, bits_prec=None,
         sage: M.verify_hyperbolicity()
         (False, [])
 
+    If ``max_bits_prec`` is given, a failed verification is retried with
+    increasing precision (starting with ``bits_prec`` or 53 bits) up to
+    ``max_bits_prec``, choosing the next precision from the widths of the
+    intervals that made it fail (see :py:class:`PrecisionLadder`). The
+    timings of each precision are printed if ``verbose`` is set::
+
+        sage: M = Manifold("m004").covers(50, cover_type='cyclic')[0]
+        sage: M.verify_hyperbolicity()
+        (False, [])
+        sage: success, shapes = M.verify_hyperbolicity(max_bits_prec=1000)
+        sage: success
+        True
+
     Under the hood, the function will call the ``CertifiedShapesEngine`` to produce
     intervals certified to contain a solution to the rectangular gluing equations.
     It then calls ``check_logarithmic_gluing_equations_and_positively_oriented_tets``
     to verify that the logarithmic gluing equations are fulfilled and that all
     tetrahedra are positively oriented.
+
+    Outside of Sage, ``holonomy=True`` raises ``SageNotAvailable``.
     """
 
-    try:
-        shape_intervals = manifold.tetrahedra_shapes(
-            'rect', bits_prec=bits_prec, intervals=True)
-    except (ValueError, RuntimeError):
-        if verbose:
-            print("Could not certify solution to rectangular gluing equations")
-        return FalseTuple((False, []))
-
-    try:
-        check_logarithmic_gluing_equations_and_positively_oriented_tets(
-            manifold, shape_intervals)
-    except exceptions.NumericalVerifyError as e:
-        if verbose:
-            print(e)
-        return FalseTuple((False, []))
+    if holonomy:
+        require_sage_intervals('holonomy=True')
+
+    if max_bits_prec is None:
+        try:
+            shape_intervals = manifold.tetrahedra_shapes(
+                'rect', bits_prec=bits_prec, intervals=True)
+        except (ValueError, RuntimeError):
+            if verbose:
+                print("Could not certify solution to rectangular gluing equations")
+            return FalseTuple((False, []))
+
+        try:
+            check_logarithmic_gluing_equations_and_positively_oriented_tets(
+                manifold, shape_intervals)
+        except exceptions.NumericalVerifyError as e:
+            if verbose:
+                print(e)
+            return FalseTuple((False, []))
+    else:
+        def check(shapes):
+            check_logarithmic_gluing_equations_and_positively_oriented_tets(
+                manifold, shapes)
+            return shapes
+
+        ladder = PrecisionLadder(
+            manifold, bits_prec or 53, max_bits_prec, verbose=verbose)
+        try:
+            shape_intervals = ladder.run(check)
+        except (ValueError, RuntimeError) as e:
+            if verbose:
+                print(e)
+            return FalseTuple((False, []))
 
     if holonomy:
         hol_rep = snap.interval_reps.holonomy_from_shape_intervals(
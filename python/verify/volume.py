@@ -1,5 +1,6 @@
 from ..sage_helper import sage_method, _within_sage
 from ..number import Number
+from .. import flint_helper
 
 if _within_sage:
     from sage.rings.complex_interval_field import ComplexIntervalField
@@ -67,6 +68,10 @@ def _volume_from_shape(z):
     tetrahedron of the given shape.
     """
 
+    if flint_helper.is_ComplexIntervalFieldElement(z):
+        # The acb type supports a verified polylog.
+        return _unprotected_volume_from_shape(z)
+
     if _within_sage:
         CIF = z.parent()
         if is_ComplexIntervalField(CIF):